@@ -0,0 +1,43 @@
+import argparse
+import time
+
+import numpy as np
+
+import numgrad as ng
+
+
+def record(n: int):
+    x = ng.Variable(np.full(3, 0.1))
+    w = ng.Variable(np.eye(3) * 0.9)
+    with ng.Graph() as g:
+        h = x
+        for _ in range(n):
+            h = np.tanh(w @ h)
+        y = np.sum(h)
+    return g, y, (x, w)
+
+
+def time_backward(n: int, repeat: int, compile_every_time: bool) -> float:
+    g, y, sources = record(n)
+    g.backward(y, sources)
+    seconds = float('inf')
+    for _ in range(repeat):
+        if compile_every_time:
+            g._plans.clear()
+        start = time.perf_counter()
+        g.backward(y, sources)
+        seconds = min(seconds, time.perf_counter() - start)
+    return seconds / len(g._node_list) * 1e6
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Time per-node overhead of backward on small arrays.')
+    parser.add_argument('-n', '--layers', type=int, default=1_000)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"plan":>10} {"usec/node":>10}')
+    for name, compile_every_time in (('compiled', True), ('cached', False)):
+        usec = time_backward(args.layers, args.repeat, compile_every_time)
+        print(f'{name:>10} {usec:>10.3f}')
@@ -0,0 +1,53 @@
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+import numgrad as ng
+
+
+def block(h, w):
+    return h + np.tanh(h @ w) * 0.1
+
+
+def loss(layers: int, segment: int, checkpoint: bool) -> callable:
+
+    def run(h, w):
+        for _ in range(0, layers, segment):
+            h = run_segment(h, w)
+        return np.mean(h ** 2)
+
+    def run_segment(h, w):
+        for _ in range(segment):
+            h = block(h, w)
+        return h
+
+    if checkpoint:
+        run_segment = ng.checkpoint(run_segment)
+    return run
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare peak memory of a deep residual chain with and '
+        'without checkpointing.')
+    parser.add_argument('-l', '--layers', type=int, default=256)
+    parser.add_argument('-s', '--segment', type=int, default=16)
+    parser.add_argument('-b', '--batch', type=int, default=256)
+    parser.add_argument('--width', type=int, default=256)
+    args = parser.parse_args()
+
+    h = np.random.normal(size=(args.batch, args.width))
+    w = np.random.normal(size=(args.width, args.width)) / args.width ** 0.5
+    print(f'activation: {h.nbytes / 2 ** 20:.1f} MiB, layers: {args.layers}')
+    print(f'{"":>12} {"peak MiB":>10} {"seconds":>10}')
+    for name, checkpoint in (('plain', False), ('checkpoint', True)):
+        grad_func = ng.grad(loss(args.layers, args.segment, checkpoint))
+        tracemalloc.start()
+        start = time.perf_counter()
+        grad_func(h, w)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f'{name:>12} {peak / 2 ** 20:>10.1f} {seconds:>10.3f}')
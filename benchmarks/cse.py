@@ -0,0 +1,48 @@
+import argparse
+import timeit
+
+import numpy as np
+
+import numgrad as ng
+
+
+def gaussian_mixture_nll(x, means, log_scales):
+    # Written as formulas are, with shared terms computed again and again.
+    nll = 0
+    for m, s in zip(means, log_scales):
+        z = (x - m) / np.exp(s)
+        nll = nll + np.sum(0.5 * z ** 2 + s)
+        nll = nll + 0.1 * np.sum(np.abs((x - m) / np.exp(s)))
+        nll = nll + 0.01 * np.sum(np.exp(s) ** 2)
+    return nll
+
+
+def gradient(x, means, log_scales, cse):
+    means = [ng.Variable(m) for m in means]
+    log_scales = [ng.Variable(s) for s in log_scales]
+    with ng.Graph(cse=cse) as g:
+        y = gaussian_mixture_nll(x, means, log_scales)
+    return g.backward(y, means + log_scales)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'Compare recording and backward with and without elimination of '
+            'common subexpressions.'))
+    parser.add_argument('-n', '--size', type=int, default=100000)
+    parser.add_argument('-k', '--components', type=int, default=10)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    x = ng.Variable(np.random.normal(size=args.size))
+    means = list(np.random.normal(size=args.components))
+    log_scales = list(np.random.normal(size=args.components) * 0.1)
+    assert np.allclose(
+        gradient(x, means, log_scales, False),
+        gradient(x, means, log_scales, True))
+    for name, cse in (('default', False), ('cse', True)):
+        seconds = min(timeit.repeat(
+            lambda: gradient(x, means, log_scales, cse),
+            number=1, repeat=args.repeat))
+        print(f'{name:>10} {seconds * 1e3:>10.3f} msec')
@@ -0,0 +1,37 @@
+import argparse
+import timeit
+import tracemalloc
+
+import numpy as np
+
+import numgrad as ng
+
+
+def activation(x):
+    h = np.tanh(x * 0.5 + 1)
+    return np.sum(np.exp(-np.sin(h) * 2 + 1) * h)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'Measure backward computation of a chain of element-wise '
+            'functions of a large activation.'))
+    parser.add_argument('-n', '--size', type=int, default=2048)
+    parser.add_argument('-d', '--dim', type=int, default=1024)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    x = ng.Variable(np.random.normal(size=(args.size, args.dim)))
+    with ng.Graph() as g:
+        y = activation(x)
+    g.backward(y, x)
+    tracemalloc.start()
+    g.backward(y, x)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    seconds = min(timeit.repeat(
+        lambda: g.backward(y, x), number=1, repeat=args.repeat))
+    print(f'backward {seconds * 1e3:>10.3f} msec')
+    print(f'peak memory {peak / 2 ** 20:.1f} MiB')
+    print(f'buffers reused {g._num_reused_buffers}')
@@ -0,0 +1,39 @@
+import argparse
+import timeit
+
+import numpy as np
+
+import numgrad as ng
+
+
+def lookups(table, indices, batch):
+    return sum(
+        np.sum(np.tanh(table[indices[i:i + batch]]))
+        for i in range(0, len(indices), batch)
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'Measure backward computation of lookups of a few rows from a '
+            'large embedding table.'))
+    parser.add_argument('-n', '--rows', type=int, default=100000)
+    parser.add_argument('-d', '--dim', type=int, default=256)
+    parser.add_argument('-l', '--lookups', type=int, default=16)
+    parser.add_argument('-b', '--batch', type=int, default=32)
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    table = ng.Variable(np.random.normal(size=(args.rows, args.dim)))
+    indices = np.random.randint(0, args.rows, args.lookups * args.batch)
+    with ng.Graph() as g:
+        y = lookups(table, indices, args.batch)
+    dx = np.empty(table.shape)
+    for name, func in (
+        ('backward', lambda: g.backward(y, table)),
+        ('out=', lambda: g.backward(y, table, out=dx)),
+    ):
+        seconds = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f'{name:>10} {seconds * 1e3:>10.3f} msec')
+    print(f'peak cotangent memory {g.memory_report().backward_peak} bytes')
@@ -0,0 +1,59 @@
+import argparse
+import timeit
+
+import numpy as np
+
+import numgrad as ng
+
+
+def head_grad(backbone, head, x):
+    with ng.Graph() as g:
+        y = forward(backbone, head, x)
+    return g.backward(y, head)
+
+
+def forward(backbone, head, x):
+    h = x
+    for w in backbone:
+        h = np.tanh(h @ w)
+    return np.sum(np.tanh(h @ head) ** 2)
+
+
+def evaluate(backbone, head, x, record):
+    with ng.Graph():
+        if record:
+            return forward(backbone, head, x)
+        with ng.no_grad():
+            return forward(backbone, head, x)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'Compare gradients of the head of a network with and without '
+            'gradient required by its backbone, and its evaluation with '
+            'and without recording.'))
+    parser.add_argument('-d', '--depth', type=int, default=50)
+    parser.add_argument('-w', '--width', type=int, default=32)
+    parser.add_argument('-b', '--batch', type=int, default=8)
+    parser.add_argument('-r', '--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    weights = [
+        np.random.normal(scale=args.width ** -0.5, size=(args.width,) * 2)
+        for _ in range(args.depth)
+    ]
+    recorded = [ng.Variable(w) for w in weights]
+    frozen = [ng.Variable(w, requires_grad=False) for w in weights]
+    head = ng.Variable(weights[0])
+    x = np.random.normal(size=(args.batch, args.width))
+    assert np.allclose(
+        head_grad(recorded, head, x), head_grad(frozen, head, x))
+    for name, func in (
+        ('recorded', lambda: head_grad(recorded, head, x)),
+        ('frozen', lambda: head_grad(frozen, head, x)),
+        ('eval', lambda: evaluate(recorded, head, x, True)),
+        ('no_grad', lambda: evaluate(recorded, head, x, False)),
+    ):
+        seconds = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f'{name:>10} {seconds * 1e3:>10.3f} msec')
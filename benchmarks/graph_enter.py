@@ -0,0 +1,32 @@
+import argparse
+import timeit
+
+import numpy as np
+
+import numgrad as ng
+
+
+def empty_graph():
+    with ng.Graph():
+        pass
+
+
+def small_grad(df=ng.grad(np.tanh)):
+    df(0.5)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Time entering and exiting graphs.')
+    parser.add_argument('-n', '--number', type=int, default=1_000)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"":>12} {"usec/call":>10}')
+    for name, func in (
+        ('empty graph', empty_graph),
+        ('small grad', small_grad),
+    ):
+        seconds = min(timeit.repeat(
+            func, number=args.number, repeat=args.repeat))
+        print(f'{name:>12} {seconds / args.number * 1e6:>10.3f}')
@@ -0,0 +1,59 @@
+import argparse
+import os
+import tempfile
+import timeit
+
+import numpy as np
+
+import numgrad as ng
+
+
+def record(weights, x):
+    with ng.Graph() as g:
+        h = x
+        for w in weights:
+            h = np.tanh(h @ w)
+        y = np.mean(h ** 2)
+    return g, y
+
+
+def rerun(weights, x):
+    g, y = record(weights, x)
+    return g.backward(y, weights)
+
+
+def load(path, mmap_mode=None):
+    g, (y, *weights) = ng.Graph.load(path, mmap_mode)
+    return g.backward(y, weights)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'Compare backward of a saved graph loaded from a file with that '
+            'of the graph recorded again.'))
+    parser.add_argument('-d', '--depth', type=int, default=100)
+    parser.add_argument('-w', '--width', type=int, default=100)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    weights = [
+        ng.Variable(np.random.normal(
+            scale=args.width ** -0.5, size=(args.width, args.width)))
+        for _ in range(args.depth)
+    ]
+    x = np.random.normal(size=(args.width, args.width))
+    path = os.path.join(tempfile.mkdtemp(), 'graph.npz')
+    g, y = record(weights, x)
+    g.save(path, y, *weights)
+    for a, b in zip(rerun(weights, x), load(path)):
+        assert np.allclose(a, b)
+    for name, func in (
+        ('save', lambda: g.save(path, y, *weights)),
+        ('rerun', lambda: rerun(weights, x)),
+        ('load', lambda: load(path)),
+        ('mmap', lambda: load(path, 'r')),
+    ):
+        seconds = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f'{name:>10} {seconds * 1e3:>10.3f} msec')
+    print(f'{"file":>10} {os.path.getsize(path) / 2 ** 20:>10.3f} MiB')
@@ -0,0 +1,36 @@
+import argparse
+import time
+
+import numpy as np
+
+import numgrad as ng
+
+
+def record(n: int) -> ng.Graph:
+    x = ng.Variable(0.5)
+    with ng.Graph() as g:
+        y = x
+        for _ in range(n):
+            y = np.sin(y)
+    return g
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Time recording of a chain of n nodes into a graph.')
+    parser.add_argument(
+        '-n', '--nodes', type=int, nargs='+',
+        default=[1_000, 10_000, 100_000])
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f'{"nodes":>10} {"seconds":>10} {"usec/node":>10}')
+    for n in args.nodes:
+        seconds = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            g = record(n)
+            seconds = min(seconds, time.perf_counter() - start)
+            assert len(g._node_list) == n
+            del g
+        print(f'{n:>10} {seconds:>10.4f} {seconds / n * 1e6:>10.3f}')
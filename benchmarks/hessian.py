@@ -0,0 +1,41 @@
+import argparse
+import timeit
+
+import numpy as np
+
+import numgrad as ng
+
+
+def loss(x, *, a, b):
+    return np.sum(np.log1p(np.exp(a @ x))) - b @ x + 0.5 * x @ x
+
+
+def finite_difference_hessian(df, x, eps=1e-6):
+    rows = []
+    for e in np.eye(x.size):
+        rows.append((df(x + eps * e) - df(x - eps * e)) / (2 * eps))
+    return np.stack(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare Hessian computations of a logistic loss.')
+    parser.add_argument('-n', '--size', type=int, default=50)
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    kwargs = dict(
+        a=np.random.normal(size=(200, args.size)),
+        b=np.random.normal(size=args.size),
+    )
+    x = np.random.normal(size=args.size) * 0.1
+    v = np.random.normal(size=args.size)
+    df = ng.grad(lambda x: loss(x, **kwargs))
+    for name, func in (
+        ('hvp', lambda: ng.hvp(loss)(x, v, **kwargs)),
+        ('grad x2', lambda: (df(x + 1e-6 * v) - df(x - 1e-6 * v)) / 2e-6),
+        ('hessian', lambda: ng.hessian(loss)(x, **kwargs)),
+        ('grad x2n', lambda: finite_difference_hessian(df, x)),
+    ):
+        seconds = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f'{name:>10} {seconds * 1e3:>10.3f} msec')
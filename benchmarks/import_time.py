@@ -0,0 +1,34 @@
+import argparse
+import subprocess
+import sys
+
+
+def import_time(module: str, preload: str) -> float:
+    stderr = subprocess.run(
+        [
+            sys.executable, '-X', 'importtime', '-c',
+            f'import {preload}; import {module}',
+        ],
+        capture_output=True, text=True, check=True,
+    ).stderr
+    for line in stderr.splitlines():
+        if line.split('|')[-1].strip() == module:
+            return int(line.split('|')[1]) * 1e-6
+    raise ValueError(f'{module} is already imported by {preload}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Time `import numgrad` in fresh interpreters.')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"":>24} {"msec":>8}')
+    for module, preload in (
+        ('numpy', 'sys'),
+        ('numgrad', 'numpy'),
+        ('scipy.special', 'numpy'),
+    ):
+        seconds = min(
+            import_time(module, preload) for _ in range(args.repeat))
+        print(f'{module + " after " + preload:>24} {seconds * 1e3:>8.1f}')
@@ -0,0 +1,46 @@
+import argparse
+import timeit
+
+import numpy as np
+
+import numgrad as ng
+
+
+def mlp(x, *, w1, w2):
+    return np.tanh(np.tanh(x @ w1) @ w2)
+
+
+def jacobian_loop(x, **kwargs):
+    x = ng.Variable(x)
+    with ng.Graph() as g:
+        y = mlp(x, **kwargs)
+    rows = [
+        g.backward(y, x, target_grad=e.reshape(y.shape))
+        for e in np.eye(y.size)
+    ]
+    return np.reshape(rows, y.shape + x.shape)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'Compare Jacobians of a multi-layer perceptron computed by '
+            'batched cotangents and by a loop of backward passes.'))
+    parser.add_argument('-n', '--outputs', type=int, default=1000)
+    parser.add_argument('-d', '--dim', type=int, default=10)
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    kwargs = dict(
+        w1=np.random.normal(size=(args.dim, 32)),
+        w2=np.random.normal(size=(32, args.outputs)) * 0.1,
+    )
+    x = np.random.normal(size=args.dim)
+    assert np.allclose(
+        ng.jacobian(mlp)(x, **kwargs), jacobian_loop(x, **kwargs))
+    for name, func in (
+        ('batched', lambda: ng.jacobian(mlp)(x, **kwargs)),
+        ('loop', lambda: jacobian_loop(x, **kwargs)),
+    ):
+        seconds = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f'{name:>10} {seconds * 1e3:>10.3f} msec')
@@ -0,0 +1,59 @@
+import argparse
+import timeit
+
+import numpy as np
+
+import numgrad as ng
+
+
+def trajectory(p, *, x0, w, steps):
+    # Sensitivities of every state to a few parameters.
+    xs = [x0]
+    for _ in range(steps):
+        xs.append(xs[-1] + 0.01 * np.tanh(w @ xs[-1] * p[0] + p[1]))
+    return np.stack(xs)
+
+
+def jacobian_forward(p, **kwargs):
+    columns = [
+        ng.jvp(lambda p: trajectory(p, **kwargs), (p,), (e,))[1]
+        for e in np.eye(p.size)
+    ]
+    return np.stack(columns, -1)
+
+
+def jacobian_reverse(p, **kwargs):
+    p = ng.Variable(p)
+    with ng.Graph() as g:
+        y = trajectory(p, **kwargs)
+    rows = [
+        g.backward(y, p, target_grad=e.reshape(y.shape))
+        for e in np.eye(y.size)
+    ]
+    return np.reshape(rows, y.shape + p.shape)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'Compare forward and reverse mode for the Jacobian of a '
+            'trajectory with respect to two parameters.'))
+    parser.add_argument('-d', '--dim', type=int, default=10)
+    parser.add_argument('-s', '--steps', type=int, default=50)
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    kwargs = dict(
+        x0=np.random.normal(size=args.dim),
+        w=np.random.normal(size=(args.dim, args.dim)),
+        steps=args.steps,
+    )
+    p = np.array([1., 0.1])
+    assert np.allclose(
+        jacobian_forward(p, **kwargs), jacobian_reverse(p, **kwargs))
+    for name, func in (
+        ('forward', lambda: jacobian_forward(p, **kwargs)),
+        ('reverse', lambda: jacobian_reverse(p, **kwargs)),
+    ):
+        seconds = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f'{name:>10} {seconds * 1e3:>10.3f} msec')
@@ -0,0 +1,48 @@
+import argparse
+import os
+import tempfile
+import timeit
+import tracemalloc
+import warnings
+
+import numpy as np
+
+import numgrad as ng
+
+
+def leading_norm_grad(features):
+    # Gradient of squared norm of leading columns of a large matrix.
+    return ng.grad(lambda x: np.sum(x[:, :8] ** 2))(features)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'Compare gradients with respect to a memory-mapped float32 '
+            'feature matrix copied into float64 and wrapped as it is.'))
+    parser.add_argument('-n', '--size', type=int, default=100000)
+    parser.add_argument('-d', '--dim', type=int, default=256)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'features.dat')
+    features = np.memmap(path, np.float32, 'w+', shape=(args.size, args.dim))
+    features[:] = np.random.normal(size=(args.size, args.dim))
+    features.flush()
+    features = np.memmap(path, np.float32, 'r', shape=(args.size, args.dim))
+    warnings.simplefilter('ignore', RuntimeWarning)
+    for name, func in (
+        ('copied', lambda: leading_norm_grad(features)),
+        (
+            'wrapped',
+            lambda: leading_norm_grad(ng.Variable(features, dtype=np.float32)),
+        ),
+    ):
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        seconds = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(
+            f'{name:>10} {seconds * 1e3:>10.3f} msec '
+            f'{peak / 2 ** 20:>10.1f} MiB')
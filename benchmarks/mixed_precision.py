@@ -0,0 +1,55 @@
+import argparse
+import timeit
+
+import numpy as np
+
+import numgrad as ng
+
+
+def mlp(weights, x):
+    h = x
+    for w in weights[:-1]:
+        h = np.tanh(h @ w)
+    return np.mean(np.square(h @ weights[-1]))
+
+
+def gradient(weights, x, precision):
+    with ng.Graph(precision=precision) as g:
+        y = mlp(weights, x)
+    grads = g.backward(y, weights)
+    return g, grads
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'Compare memory retained by the graph of a multi-layer '
+            'perceptron in float32 and with float16 storage.'))
+    parser.add_argument('-b', '--batch', type=int, default=1024)
+    parser.add_argument('-w', '--width', type=int, default=512)
+    parser.add_argument('-d', '--depth', type=int, default=8)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    ng.config.dtype = np.float32
+    weights = [
+        ng.Variable(np.random.normal(
+            scale=args.width ** -0.5, size=(args.width, args.width)))
+        for _ in range(args.depth)
+    ]
+    x = np.random.normal(size=(args.batch, args.width)).astype(np.float32)
+    policy = ng.MixedPrecision()
+    _, expect = gradient(weights, x, None)
+    _, actual = gradient(weights, x, policy)
+    for a, e in zip(actual, expect):
+        assert np.allclose(a, e, rtol=1e-2, atol=1e-2 * np.abs(e).max())
+    for name, precision in (('float32', None), ('mixed', policy)):
+        g, _ = gradient(weights, x, precision)
+        report = g.memory_report()
+        seconds = min(timeit.repeat(
+            lambda: gradient(weights, x, precision),
+            number=1, repeat=args.repeat))
+        print(
+            f'{name:>10} {seconds * 1e3:>10.3f} msec '
+            f'retained {report.total / 2 ** 20:>7.1f} MiB '
+            f'backward peak {report.backward_peak / 2 ** 20:>7.1f} MiB')
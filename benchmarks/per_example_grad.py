@@ -0,0 +1,55 @@
+import argparse
+import timeit
+
+import numpy as np
+import scipy.special as sp
+
+import numgrad as ng
+
+
+def loss(w1, b1, w2, b2, *, x, y):
+    logits = np.tanh(x @ w1 + b1) @ w2 + b2
+    return -sp.log_softmax(logits)[y]
+
+
+def per_example_grad(theta, x, y):
+    return ng.grad(lambda *theta: loss(*theta, x=x, y=y))(*theta)
+
+
+def per_example_grads_loop(theta, xs, ys):
+    grads = [per_example_grad(theta, x, y) for x, y in zip(xs, ys)]
+    return tuple(np.stack(g) for g in zip(*grads))
+
+
+def per_example_grads_vmap(theta, xs, ys):
+    return ng.vmap(lambda x, y: per_example_grad(theta, x, y))(xs, ys)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'Compare per-example gradients of a multi-layer perceptron '
+            'computed by a loop of ng.grad and by ng.vmap.'))
+    parser.add_argument('-b', '--batch', type=int, default=100)
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    theta = (
+        np.random.normal(scale=0.01, size=(784, 200)),
+        np.random.normal(scale=0.01, size=200),
+        np.random.normal(scale=0.1, size=(200, 10)),
+        np.random.normal(scale=0.1, size=10),
+    )
+    xs = np.random.normal(size=(args.batch, 784))
+    ys = np.random.randint(0, 10, args.batch)
+    for a, b in zip(
+        per_example_grads_loop(theta, xs, ys),
+        per_example_grads_vmap(theta, xs, ys),
+    ):
+        assert np.allclose(a, b)
+    for name, func in (
+        ('loop', lambda: per_example_grads_loop(theta, xs, ys)),
+        ('vmap', lambda: per_example_grads_vmap(theta, xs, ys)),
+    ):
+        seconds = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f'{name:>10} {seconds * 1e3:>10.3f} msec')
@@ -0,0 +1,47 @@
+import argparse
+import time
+
+import numpy as np
+import scipy.special as sp
+
+import numgrad as ng
+
+
+def nll(w1, b1, w2, b2, *, x, y):
+    logits = np.tanh(x @ w1 + b1) @ w2 + b2
+    log_probas = sp.log_softmax(logits, axis=-1)
+    return np.mean(-log_probas[range(len(log_probas)), y])
+
+
+def steps_per_second(grad_func, theta, x, y, steps):
+    grad_func(*theta, x=x[0], y=y[0])
+    start = time.perf_counter()
+    for i in range(steps):
+        grad_func(*theta, x=x[i % len(x)], y=y[i % len(y)])
+    return steps / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare throughput of ng.grad and ng.static_grad.')
+    parser.add_argument('-b', '--batch', type=int, default=50)
+    parser.add_argument('--hidden', type=int, default=200)
+    parser.add_argument('-s', '--steps', type=int, default=500)
+    args = parser.parse_args()
+
+    x = np.random.normal(size=(10, args.batch, 784))
+    y = np.random.randint(0, 10, size=(10, args.batch))
+    theta = (
+        np.random.normal(scale=0.01, size=(784, args.hidden)),
+        np.zeros(args.hidden),
+        np.random.normal(scale=0.1, size=(args.hidden, 10)),
+        np.zeros(10),
+    )
+    out = tuple(np.empty_like(p) for p in theta)
+    for name, grad_func in (
+        ('ng.grad', ng.grad(nll)),
+        ('ng.static_grad', ng.static_grad(nll)),
+        ('with out', ng.static_grad(nll, out=out)),
+    ):
+        throughput = steps_per_second(grad_func, theta, x, y, args.steps)
+        print(f'{name:>15}: {throughput:10.1f} steps/sec')
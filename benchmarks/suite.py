@@ -0,0 +1,175 @@
+import argparse
+import json
+import subprocess
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+import scipy.special as sp
+
+import numgrad as ng
+
+
+def _nll(w1, b1, w2, b2, *, x, y):
+    # Loss of the training step of examples/mlp.py.
+    logits = np.tanh(x @ w1 + b1) @ w2 + b2
+    log_probas = sp.log_softmax(logits, axis=-1)
+    return np.mean(-log_probas[range(len(log_probas)), y])
+
+
+def mlp_step(grad: callable) -> callable:
+    x = np.random.normal(size=(50, 784))
+    y = np.random.randint(0, 10, size=50)
+    theta = (
+        np.random.normal(scale=0.01, size=(784, 200)),
+        np.zeros(200),
+        np.random.normal(scale=0.1, size=(200, 10)),
+        np.zeros(10),
+    )
+    grad_func = grad(_nll)
+    return lambda: grad_func(*theta, x=x, y=y)
+
+
+def elementwise_chain(shape: tuple, depth: int) -> callable:
+
+    def f(x):
+        for _ in range(depth):
+            x = np.tanh(x) * 0.9 + np.sin(x)
+        return np.sum(x)
+
+    x = np.random.normal(size=shape)
+    grad_func = ng.grad(f)
+    return lambda: grad_func(x)
+
+
+def linalg(function: callable, n: int) -> callable:
+    a = np.random.normal(size=(n, n))
+    spd = a @ a.T + n * np.eye(n)
+    b = np.random.normal(size=(n, 3))
+    f = {
+        np.linalg.solve: lambda a, b: np.sum(np.linalg.solve(a, b)),
+        np.linalg.cholesky: lambda a, b: np.sum(np.linalg.cholesky(
+            (a + a.T) / 2)),
+        np.linalg.det: lambda a, b: np.linalg.det(a),
+    }[function]
+    grad_func = ng.grad(f)
+    return lambda: grad_func(spd, b)
+
+
+def correlation(function: callable, n: int, m: int) -> callable:
+    a = np.random.normal(size=n)
+    v = np.random.normal(size=m)
+    grad_func = ng.grad(
+        lambda a, v: np.sum(function(a, v, mode='full') ** 2))
+    return lambda: grad_func(a, v)
+
+
+def indexing(key) -> callable:
+    x = np.random.normal(size=(1000, 100))
+    grad_func = ng.grad(lambda x: np.sum(x[key] ** 2))
+    return lambda: grad_func(x)
+
+
+def recording(n: int) -> callable:
+
+    def record():
+        x = ng.Variable(0.5)
+        with ng.Graph():
+            y = x
+            for _ in range(n):
+                y = np.sin(y) * 0.5
+
+    return record
+
+
+CASES = {
+    'mlp_grad': lambda: mlp_step(ng.grad),
+    'mlp_static_grad': lambda: mlp_step(ng.static_grad),
+    'chain_scalar': lambda: elementwise_chain((), 100),
+    'chain_array': lambda: elementwise_chain((1000, 100), 20),
+    'solve': lambda: linalg(np.linalg.solve, 100),
+    'cholesky': lambda: linalg(np.linalg.cholesky, 100),
+    'det': lambda: linalg(np.linalg.det, 100),
+    'correlate': lambda: correlation(np.correlate, 1000, 100),
+    'convolve': lambda: correlation(np.convolve, 1000, 100),
+    'index_slice': lambda: indexing((slice(100, 900), slice(None, None, 2))),
+    'index_int': lambda: indexing(np.random.randint(0, 1000, 5000)),
+    'index_bool': lambda: indexing(np.random.rand(1000, 100) > 0.5),
+    'record': lambda: recording(1000),
+}
+
+
+def import_time() -> float:
+    # Cumulative time of `import numgrad` after numpy in a fresh interpreter.
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import numpy, numgrad'],
+        capture_output=True, text=True, check=True,
+    ).stderr
+    line = next(
+        line for line in stderr.splitlines()
+        if line.split('|')[-1].strip() == 'numgrad'
+    )
+    return int(line.split('|')[1]) * 1e-6
+
+
+def measure(name: str, repeat: int) -> dict:
+    if name == 'import':
+        seconds = min(import_time() for _ in range(repeat))
+        return {'seconds': seconds, 'peak_bytes': None}
+    func = CASES[name]()
+    func()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+    return {'seconds': seconds, 'peak_bytes': peak}
+
+
+if __name__ == '__main__':
+    names = list(CASES) + ['import']
+    parser = argparse.ArgumentParser(
+        description=(
+            'Time and measure peak memory of recording, backward computation '
+            'and VJPs, optionally saving results as baseline or comparing '
+            'them with a baseline saved on the same machine.'))
+    parser.add_argument(
+        'cases', nargs='*', metavar='case',
+        help=f'Cases to run from {", ".join(names)}, by default all of them.')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument(
+        '--save', metavar='FILE', help='Save results into JSON file.')
+    parser.add_argument(
+        '--compare', metavar='FILE',
+        help='Compare results with those in JSON file saved by --save.')
+    args = parser.parse_args()
+    for name in args.cases:
+        if name not in names:
+            parser.error(f'unknown case {name}')
+
+    baseline = {}
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    results = {}
+    print(
+        f'{"":>15} {"msec":>10} {"MiB":>10} '
+        f'{"msec ratio":>10} {"MiB ratio":>10}')
+    for name in args.cases or names:
+        results[name] = result = measure(name, args.repeat)
+        ratios = [
+            '-' if name not in baseline or not baseline[name][k]
+            else f'{result[k] / baseline[name][k]:.2f}'
+            for k in ('seconds', 'peak_bytes')
+        ]
+        peak = result['peak_bytes']
+        peak = '-' if peak is None else f'{peak / 2 ** 20:.2f}'
+        print(
+            f'{name:>15} {result["seconds"] * 1e3:>10.3f} {peak:>10} '
+            f'{ratios[0]:>10} {ratios[1]:>10}')
+    if args.save is not None:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=4)
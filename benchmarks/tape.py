@@ -0,0 +1,49 @@
+import argparse
+import gc
+import time
+import tracemalloc
+
+import numpy as np
+
+import numgrad as ng
+
+
+def record(n: int):
+    # Scalar graph of binary and unary operations as in simulations.
+    x = ng.Variable(0.5)
+    with ng.Graph() as g:
+        y = x
+        for _ in range(n // 2):
+            y = np.sin(y) * 0.5
+    return g, x, y
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=(
+            'Measure bytes retained per node and time per node to record and '
+            'backprop through a graph of scalar operations.'))
+    parser.add_argument('-n', '--nodes', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    gc.collect()
+    tracemalloc.start()
+    g, x, y = record(args.nodes)
+    nbytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del g, x, y
+    gc.collect()
+
+    start = time.perf_counter()
+    g, x, y = record(args.nodes)
+    record_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    g.backward(y, x)
+    backward_seconds = time.perf_counter() - start
+
+    n = len(g._node_list)
+    print(f'{"nodes":>10} {"bytes/node":>10} {"record":>10} {"backward":>10}')
+    print(
+        f'{n:>10} {nbytes / n:>10.1f} '
+        f'{record_seconds / n * 1e6:>7.3f} us '
+        f'{backward_seconds / n * 1e6:>7.3f} us')
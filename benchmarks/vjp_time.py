@@ -0,0 +1,59 @@
+import argparse
+import collections
+import time
+
+import numpy as np
+
+import numgrad as ng
+
+
+def loss(a, b, v):
+    spd = a @ np.swapaxes(a, -1, -2) + np.eye(a.shape[-1])
+    x = np.linalg.solve(spd, b)
+    y = np.linalg.cholesky(spd)
+    z = np.trace(np.linalg.inv(spd)) + np.linalg.slogdet(spd)[1]
+    w = np.correlate(v, np.ravel(x), mode='full')
+    return (
+        np.sum(np.var(x, axis=0)) + np.std(y) + np.mean(w) + z
+        + np.sum(np.outer(v, v) * np.ptp(v)))
+
+
+def profile(args, repeat: int) -> dict:
+    seconds = collections.defaultdict(float)
+
+    def hook(kind, function, shapes, elapsed):
+        seconds[kind, getattr(function, '__name__', repr(function))] += elapsed
+
+    grad_func = ng.grad(loss)
+    ng.config.register_hook(hook)
+    try:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            grad_func(*args)
+        seconds['total', ''] = (time.perf_counter() - start)
+    finally:
+        ng.config.remove_hook(hook)
+    return {k: v / repeat for k, v in seconds.items()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Show time spent in each forward and VJP function.')
+    parser.add_argument('-n', '--size', type=int, default=100)
+    parser.add_argument('-r', '--repeat', type=int, default=10)
+    parser.add_argument('-t', '--top', type=int, default=15)
+    args = parser.parse_args()
+
+    inputs = (
+        np.random.normal(size=(args.size, args.size)),
+        np.random.normal(size=(args.size, 3)),
+        np.random.normal(size=args.size),
+    )
+    seconds = profile(inputs, args.repeat)
+    total = seconds.pop(('total', ''))
+    print(f'{"kind":>8} {"function":>12} {"msec":>10} {"%":>6}')
+    for (kind, name), s in sorted(
+        seconds.items(), key=lambda kv: kv[1], reverse=True,
+    )[:args.top]:
+        print(f'{kind:>8} {name:>12} {s * 1e3:>10.3f} {s / total:>6.1%}')
+    print(f'{"total":>21} {total * 1e3:>10.3f}')
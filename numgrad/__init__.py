@@ -1,13 +1,21 @@
 """Simple gradient computation library for Python."""
 
+from numgrad._checkpoint import checkpoint
 from numgrad._config import Config, config  # noqa: F401
-from numgrad._grad import elementwise_grad, grad, value_and_grad
+from numgrad._grad import (
+    elementwise_grad, grad, hessian, hvp, jacobian, value_and_grad,
+)
 from numgrad._graph import Graph
+from numgrad._jvp import jvp
+from numgrad._mixed_precision import MixedPrecision
+from numgrad._no_grad import no_grad
+from numgrad._static_grad import static_grad, static_value_and_grad
 from numgrad._utils._has_vjp import has_vjp
 from numgrad._variable import Variable
 from numgrad._vjp import custom_vjp
+from numgrad._vmap import vmap
 
-from numgrad import _numpy, _scipy  # noqa: F401, I100, I202
+from numgrad import _numpy  # noqa: F401, I100, I202
 
 from numgrad._version import __version__  # noqa: F401, I202
 
@@ -15,16 +23,26 @@ from numgrad._version import __version__  # noqa: F401, I202
 _classes = [
     Config,
     Graph,
+    MixedPrecision,
     Variable,
 ]
 
 
 _functions = [
+    checkpoint,
     custom_vjp,
     elementwise_grad,
     grad,
     has_vjp,
+    hessian,
+    hvp,
+    jacobian,
+    jvp,
+    no_grad,
+    static_grad,
+    static_value_and_grad,
     value_and_grad,
+    vmap,
 ]
 
 
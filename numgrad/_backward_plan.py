@@ -0,0 +1,477 @@
+import threading
+import time
+import typing as tp
+
+import numpy as np
+
+from numgrad._batching import _any, _BatchedArray, _call_batched
+from numgrad._config import config
+from numgrad._mixed_precision import _Overflow, _overflows
+from numgrad._utils._buffer import _buffer
+from numgrad._utils._isscalar import _isscalar
+from numgrad._utils._rebuild import _rebuild
+from numgrad._utils._sparse_grad import _densify, _SparseGrad
+from numgrad._utils._unbroadcast import _unbroadcast_to
+from numgrad._variable import (
+    _ndarray, _ndarray_args, _ndarray_kwargs, Variable,
+)
+
+
+# Callbacks to call at the end of each backward computation in progress in
+# the current thread, innermost last.
+_local = threading.local()
+
+
+def _call_at_end_of_backward(callback: callable):
+    """Call function at the end of the backward computation in progress.
+
+    VJPs sharing results between calls for each input of a node free them
+    with this, as VJPs of inputs not depending on sources are skipped.
+    """
+    stack = getattr(_local, 'callbacks', None)
+    if stack:
+        stack[-1].append(callback)
+
+
+def _resolve_vjp(vjp: callable, node) -> callable:
+    specialize = getattr(vjp, '_specialize', None)
+    if specialize is None:
+        return vjp
+    return specialize(node.result, *node.inputs, **node.kwargs)
+
+
+def _unwrap(x):
+    if isinstance(x, Variable):
+        return _ndarray(x)
+    if isinstance(x, (tuple, list)):
+        return _rebuild(x, _ndarray_args(*x))
+    return x
+
+
+def _postprocess_nan_and_type(dx, x):
+    if isinstance(dx, _SparseGrad):
+        # Only elements at the indices are checked.
+        return _SparseGrad(dx.shape, dx.dtype, tuple(
+            (key, _postprocess_nan_and_type(values, x[key]))
+            for key, values in dx._items
+        ))
+    if _any(np.isnan(x)):
+        dx = np.where(np.isnan(x), config.dtype(0), dx)
+    if _isscalar(x) and not _isscalar(dx):
+        dx = np.take(dx, 0)
+    return dx
+
+
+class _BackwardPlan:
+    """Flat sequence of VJP calls to propagate gradients to sources.
+
+    A plan only depends on the structure of a graph, so that it can be run
+    repeatedly with different `target_grad` or against another graph recorded
+    with the same structure.
+    """
+
+    def __init__(self, graph, target: Variable, sources: tp.Tuple[Variable]):
+        """Compile graph into a plan of backward computation.
+
+        Parameters
+        ----------
+        graph : Graph
+            Graph to compile.
+        target : Variable
+            Target to be differentiated.
+        sources : tp.Tuple[Variable]
+            Source variables to differentiated against.
+        """
+        indices, depending_ids = graph._get_nodes_between(sources, target)
+        self.num_nodes = len(graph._node_list)
+        self.num_skipped_nodes = self.num_nodes - len(indices)
+
+        id2slot = {}
+        slot_of = lambda v: id2slot.setdefault(id(v), len(id2slot))
+        self._target_slot = slot_of(target)
+        self._source_slots = tuple(slot_of(s) for s in sources)
+        self._steps = []
+        for index in indices:
+            node = graph._node_list[index]
+            if node.function not in config._func2vjps:
+                raise NotImplementedError(
+                    f'Cannot backprop through {node.function}, '
+                    'VJP of the function is not registered yet.')
+            if isinstance(node.result, tuple):
+                result_slots = tuple(
+                    slot_of(r) if isinstance(r, Variable) else None
+                    for r in node.result
+                )
+            else:
+                result_slots = slot_of(node.result)
+            input_steps = []
+            for position, (x, vjp) in enumerate(
+                zip(node.inputs, config._func2vjps[node.function]),
+            ):
+                if isinstance(x, Variable):
+                    if id(x) not in depending_ids:
+                        continue
+                    slots = slot_of(x)
+                elif isinstance(x, (tuple, list)) and any(
+                    id(a) in depending_ids for a in x
+                ):
+                    slots = tuple(
+                        slot_of(a) if isinstance(a, Variable) else None
+                        for a in x
+                    )
+                else:
+                    continue
+                input_steps.append((position, _resolve_vjp(vjp, node), slots))
+            free_slots = tuple(
+                s for s in (
+                    result_slots if isinstance(result_slots, tuple)
+                    else (result_slots,)
+                ) if s is not None and s not in self._source_slots
+            )
+            elementwise = (
+                isinstance(node.function, np.ufunc)
+                and node.function.signature is None
+            )
+            fused = (
+                elementwise
+                and result_slots in free_slots
+                and self._move_fusable_step_last(input_steps, node)
+            )
+            self._steps.append((
+                index, result_slots, tuple(input_steps), free_slots,
+                elementwise, fused,
+            ))
+        self._num_slots = len(id2slot)
+        self.peak_bytes = 0
+        self.num_reused_buffers = 0
+
+    @staticmethod
+    def _move_fusable_step_last(input_steps: list, node) -> bool:
+        # VJP multiplying the cotangent of the result by a derivative of the
+        # same shape can do it in-place as the last VJP of the node.
+        for i, (position, vjp, _) in enumerate(input_steps):
+            if (
+                hasattr(vjp, '_derivative')
+                and np.shape(node.inputs[position]) == np.shape(node.result)
+            ):
+                input_steps.append(input_steps.pop(i))
+                return True
+        return False
+
+    def run(
+        self,
+        node_list: list,
+        target_grad,
+        out: tp.Optional[tuple] = None,
+        precision=None,
+    ) -> tuple:
+        """Return gradients with respect to the sources.
+
+        Parameters
+        ----------
+        node_list : list
+            List of nodes of a graph with the structure this plan compiled.
+        target_grad
+            Gradient to propagate backward from the target, or a batch of
+            them to propagate at once.
+        out : tp.Optional[tuple]
+            Arrays to store gradients with respect to each source, or None to
+            allocate new ones, by default None.
+        precision : MixedPrecision, optional
+            Precision policy to store cotangents with, by default None.
+
+        Returns
+        -------
+        tuple
+            Gradients with respect to the sources.
+        """
+        callbacks = []
+        _local.__dict__.setdefault('callbacks', []).append(callbacks)
+        try:
+            # Cotangents recorded for higher-order derivatives or batched are
+            # kept in the precision computed.
+            if (
+                precision is None or config._graph is not None
+                or isinstance(target_grad, _BatchedArray)
+            ):
+                return self._run(node_list, target_grad, out)
+            while True:
+                try:
+                    grads = self._run(node_list, target_grad, out, precision)
+                except _Overflow:
+                    precision._update(overflow=True)
+                    continue
+                precision._update(overflow=False)
+                return grads
+        finally:
+            _local.callbacks.pop()
+            for callback in callbacks:
+                callback()
+
+    def _run(
+        self,
+        node_list: list,
+        target_grad,
+        out: tp.Optional[tuple],
+        precision=None,
+    ) -> tuple:
+        # VJPs are computed with arrays unless they need to be recorded for
+        # higher-order derivatives.
+        unwrap = config._graph is None
+        hooks = len(config._hooks) > 0
+        # Batch of cotangents is propagated at once, computed for each of
+        # them only by VJPs that cannot handle the batch axis.
+        batched = isinstance(target_grad, _BatchedArray)
+        cotangents = _Cotangents(self._num_slots, {} if out is None else {
+            s: buffer for s, buffer in zip(self._source_slots, out)
+            if buffer is not None
+        })
+        if precision is not None:
+            scale = precision.loss_scale
+            target_grad = np.multiply(
+                target_grad, scale, dtype=precision.accumulation_dtype)
+            cotangents.set_storage(
+                precision.storage_dtype,
+                (self._target_slot,) + self._source_slots,
+                check_overflow=scale > precision.min_loss_scale,
+            )
+        cotangents.store(self._target_slot, target_grad)
+        grads = cotangents.grads
+        for (
+            index, result_slots, input_steps, free_slots, elementwise, fused,
+        ) in self._steps:
+            node = node_list[index]
+            if unwrap:
+                node = node._replace(
+                    result=_unwrap(node.result),
+                    inputs=tuple(_unwrap(x) for x in node.inputs),
+                    kwargs=_ndarray_kwargs(**node.kwargs),
+                )
+            if isinstance(result_slots, tuple):
+                dy = tuple(
+                    None if s is None else grads[s] for s in result_slots)
+                ready = all(
+                    g is not None for s, g in zip(result_slots, dy)
+                    if s is not None)
+            else:
+                dy = grads[result_slots]
+                ready = dy is not None
+            if ready:
+                dy = _densify(dy)
+                if precision is not None:
+                    dy = _astype(
+                        dy, precision.storage_dtype,
+                        precision.accumulation_dtype,
+                    )
+                aliased = False
+                for i, (position, vjp, slots) in enumerate(input_steps):
+                    x = node.inputs[position]
+                    start = time.perf_counter() if hooks else None
+                    reused = False
+                    if batched:
+                        dx = _call_batched(
+                            vjp, dy, node.result, *node.inputs, **node.kwargs)
+                    elif (
+                        fused and unwrap and not aliased
+                        and i == len(input_steps) - 1
+                        and cotangents.owns(result_slots)
+                    ):
+                        dx = _multiply_inplace(vjp, dy, node, x)
+                        reused = dx is dy
+                        cotangents.num_reused += reused
+                    else:
+                        dx = vjp(dy, node.result, *node.inputs, **node.kwargs)
+                    if start is not None:
+                        config._call_hooks(
+                            'vjp', node.function, node.inputs, start)
+                    if hasattr(x, 'shape'):
+                        dx = _unbroadcast_to(dx, x.shape)
+                    # Results of VJPs of element-wise functions are new arrays
+                    # unless they are the inputs passed to them.
+                    owned = reused or (
+                        unwrap and elementwise
+                        and _is_new_array(dx, dy, node.result, *node.inputs)
+                    )
+                    aliased = aliased or dx is dy
+                    cotangents.accumulate(slots, dx, x, owned)
+                    del dx
+            del dy
+            # Cotangents of the results are fully propagated to the inputs,
+            # free them unless requested.
+            for s in free_slots:
+                cotangents.store(s, None)
+        self.peak_bytes = cotangents.peak_bytes
+        self.num_reused_buffers = cotangents.num_reused
+        if out is None:
+            grads = tuple(_densify(grads[s]) for s in self._source_slots)
+        else:
+            grads = tuple(
+                grads[s] if buffer is None else _write(buffer, grads[s])
+                for s, buffer in zip(self._source_slots, out)
+            )
+        if precision is not None:
+            grads = tuple(
+                None if g is None
+                else np.divide(g, scale, out=g) if out is not None and any(
+                    g is buffer for buffer in out)
+                else np.divide(
+                    _densify(g), scale, dtype=precision.accumulation_dtype)
+                for g in grads
+            )
+        return grads
+
+
+def _astype(x, dtype: np.dtype, new_dtype: np.dtype):
+    # Arrays of the data type in possibly nested tuple converted into new one.
+    if isinstance(x, tuple):
+        return tuple(_astype(a, dtype, new_dtype) for a in x)
+    if getattr(x, 'dtype', None) == dtype:
+        return x.astype(new_dtype)
+    return x
+
+
+def _multiply_inplace(vjp: callable, dy, node, x):
+    # Cotangent of the result is freed after the VJP, so that its buffer is
+    # reused for the cotangent of the input.
+    if type(dy) is np.ndarray and dy.shape == np.shape(x):
+        derivative = vjp._derivative(
+            node.result, *node.inputs, **node.kwargs)
+        if np.result_type(dy, derivative) == dy.dtype:
+            return np.multiply(dy, derivative, out=dy)
+        return dy * derivative
+    return vjp(dy, node.result, *node.inputs, **node.kwargs)
+
+
+def _is_new_array(a, *arrays) -> bool:
+    return (
+        type(a) is np.ndarray
+        and a.base is None
+        and all(a is not b for b in arrays)
+    )
+
+
+def _write(buffer: np.ndarray, grad) -> np.ndarray:
+    if grad is None:
+        buffer.fill(0)
+    elif isinstance(grad, _SparseGrad):
+        buffer.fill(0)
+        grad._add_to(buffer)
+    elif grad is not buffer:
+        np.copyto(buffer, grad)
+    return buffer
+
+
+class _Cotangents:
+    """Cotangents during a run of a backward plan and their memory usage."""
+
+    def __init__(self, num_slots: int, buffers: dict):
+        self.grads = [None] * num_slots
+        # Slots holding arrays that nothing else refers to, which are safe to
+        # accumulate gradients into in-place.
+        self._owned = [False] * num_slots
+        self._buffers = buffers
+        self._buffer_counts: tp.Dict[int, int] = {}
+        self._bytes = 0
+        self.peak_bytes = 0
+        # Number of arrays updated in-place instead of allocating new ones.
+        self.num_reused = 0
+        self._storage_dtype: tp.Optional[np.dtype] = None
+        self._exact_slots: tp.Tuple[int, ...] = ()
+        self._check_overflow = False
+
+    def set_storage(
+        self,
+        dtype: np.dtype,
+        exact_slots: tp.Tuple[int, ...],
+        check_overflow: bool,
+    ):
+        # Cotangents except those in the exact slots are stored in the data
+        # type, raising `_Overflow` if they do not fit into it.
+        self._storage_dtype = dtype
+        self._exact_slots = exact_slots
+        self._check_overflow = check_overflow
+
+    def owns(self, slot: int) -> bool:
+        return self._owned[slot]
+
+    def store(self, slot: int, grad, owned: bool = False):
+        old = self.grads[slot]
+        if old is grad:
+            return
+        self.grads[slot] = grad
+        self._owned[slot] = owned
+        if (buffer := _buffer(grad)) is not None:
+            key, nbytes = buffer
+            count = self._buffer_counts.get(key, 0)
+            self._buffer_counts[key] = count + 1
+            if count == 0:
+                self._bytes += nbytes
+                self.peak_bytes = max(self.peak_bytes, self._bytes)
+        if (buffer := _buffer(old)) is not None:
+            key, nbytes = buffer
+            self._buffer_counts[key] -= 1
+            if self._buffer_counts[key] == 0:
+                del self._buffer_counts[key]
+                self._bytes -= nbytes
+
+    def accumulate(self, slots, dx, x, owned: bool = False):
+        if isinstance(slots, tuple):
+            if isinstance(dx, (tuple, list)):
+                for s, x_, dx_ in zip(slots, x, dx):
+                    if s is not None:
+                        self.accumulate(s, dx_, x_)
+            return
+        dx_ = dx
+        dx = _postprocess_nan_and_type(dx, x)
+        if (
+            self._storage_dtype is not None
+            and slots not in self._exact_slots
+        ):
+            self._accumulate_in_storage(slots, dx)
+            return
+        # Arrays made by the postprocess are new as well.
+        owned = (owned or dx is not dx_) and type(dx) is np.ndarray
+        g = self.grads[slots]
+        if g is None:
+            if slots in self._buffers:
+                self.store(slots, _write(self._buffers[slots], dx), owned=True)
+            else:
+                self.store(slots, dx, owned=owned)
+        elif (
+            self._owned[slots]
+            and isinstance(dx, (np.ndarray, np.number, _SparseGrad))
+            and np.shape(dx) == g.shape
+            and np.can_cast(np.result_type(g.dtype, dx.dtype), g.dtype)
+        ):
+            if isinstance(dx, _SparseGrad):
+                dx._add_to(g)
+            else:
+                np.add(g, dx, out=g)
+            self.num_reused += 1
+        elif (
+            owned
+            and isinstance(g, (np.ndarray, np.number))
+            and np.shape(g) == dx.shape
+            and np.can_cast(np.result_type(g.dtype, dx.dtype), dx.dtype)
+        ):
+            self.store(slots, np.add(dx, g, out=dx), owned=True)
+            self.num_reused += 1
+        else:
+            g = g + dx
+            self.store(slots, g, owned=type(g) is np.ndarray)
+
+    def _accumulate_in_storage(self, slot: int, dx):
+        # Cotangents are summed in the precision computed, and stored in that
+        # of storage unless they overflow it.
+        dx = _densify(dx)
+        if self.grads[slot] is not None:
+            dx = self.grads[slot] + dx
+        if not hasattr(dx, 'astype') or dx.dtype == self._storage_dtype:
+            self.store(slot, dx)
+            return
+        if _overflows(dx, self._storage_dtype):
+            if self._check_overflow:
+                raise _Overflow
+            self.store(slot, dx)
+        else:
+            self.store(slot, dx.astype(self._storage_dtype))
@@ -0,0 +1,346 @@
+import functools
+import operator
+import typing as tp
+
+import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+from numgrad._config import config
+from numgrad._utils._rebuild import _rebuild
+
+
+# Methods of np.ndarray computed by numpy functions of the same names.
+_NUMPY_METHODS = (
+    'all', 'any', 'argmax', 'argmin', 'clip', 'conj', 'cumprod', 'cumsum',
+    'diagonal', 'dot', 'max', 'mean', 'min', 'nonzero', 'prod', 'ravel',
+    'repeat', 'round', 'squeeze', 'std', 'sum', 'swapaxes', 'take', 'trace',
+    'var',
+)
+
+
+class _Unbatchable(TypeError):
+    """Raised when a batched array is used per example, e.g. in Python."""
+
+
+class _BatchedArray(NDArrayOperatorsMixin):
+    """Stack of arrays along a leading batch axis hidden from numpy functions.
+
+    Numpy functions applied to a batched array behave as if applied to each
+    of the stacked arrays, and return a batched array of the results. They
+    are computed at once by batching rules registered in
+    `config._func2batch_rules`, or computed for each stacked array otherwise.
+    """
+
+    def __init__(self, data: np.ndarray):
+        """Construct batched array.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            Stacked arrays whose first axis is the batch axis.
+        """
+        self._data = data
+
+    def __repr__(self) -> str:  # noqa: D105
+        return f'_BatchedArray({self._data!r})'
+
+    @property
+    def shape(self) -> tuple:  # noqa: D102
+        return self._data.shape[1:]
+
+    @property
+    def ndim(self) -> int:  # noqa: D102
+        return self._data.ndim - 1
+
+    @property
+    def size(self) -> int:  # noqa: D102
+        return int(np.prod(self.shape))
+
+    @property
+    def dtype(self) -> np.dtype:  # noqa: D102
+        return self._data.dtype
+
+    @property
+    def T(self) -> '_BatchedArray':  # noqa: D102, N802
+        return np.transpose(self)
+
+    def __len__(self) -> int:  # noqa: D105
+        if self.ndim == 0:
+            raise TypeError('len() of unsized object')
+        return self.shape[0]
+
+    def _raise_unbatchable(self, *args, **kwargs):
+        raise _Unbatchable(
+            'Batched array cannot be converted into a single value')
+
+    __array__ = _raise_unbatchable
+    __bool__ = __float__ = __int__ = __index__ = _raise_unbatchable
+    __iter__ = _raise_unbatchable
+
+    def _batched_key(self, key) -> tp.Optional[tuple]:
+        # Key to index the stacked arrays at once, or None if their indices
+        # would be reordered by the batch axis.
+        key = key if isinstance(key, tuple) else (key,)
+        advanced = [
+            i for i, k in enumerate(key)
+            if not isinstance(k, (slice, type(Ellipsis), type(None)))
+        ]
+        if not any(isinstance(k, _BatchedArray) for k in key):
+            if advanced and advanced[-1] - advanced[0] + 1 != len(advanced):
+                return None
+            return (slice(None),) + key
+        # Batched indices are broadcast with indices of the batch axis, which
+        # keeps the order of axes only if they lead the key.
+        indices = _align(key[:len(advanced)])
+        if advanced != list(range(len(advanced))) or any(
+            np.asarray(i).dtype.kind not in 'iu' for i in indices
+        ):
+            return None
+        batch = np.arange(len(self._data)).reshape(
+            (-1,) + (1,) * (max(np.ndim(i) for i in indices) - 1))
+        return (batch,) + indices + key[len(advanced):]
+
+    def __getitem__(self, key) -> '_BatchedArray':  # noqa: D105
+        batched_key = self._batched_key(key)
+        if batched_key is None:
+            return _loop(operator.getitem, (self, key), {})
+        return _BatchedArray(self._data[batched_key])
+
+    def __setitem__(self, key, value):  # noqa: D105
+        batched_key = self._batched_key(key)
+        if batched_key is None:
+            self._raise_unbatchable()
+        self._data[batched_key] = _align(
+            (value,), self._data[batched_key].ndim - 1)[0]
+
+    def astype(self, dtype, *args, **kwargs) -> '_BatchedArray':  # noqa: D102
+        return _BatchedArray(self._data.astype(dtype, *args, **kwargs))
+
+    def copy(self) -> '_BatchedArray':  # noqa: D102
+        return _BatchedArray(self._data.copy())
+
+    def reshape(self, *shape, order='C') -> '_BatchedArray':  # noqa: D102
+        if len(shape) == 1:
+            shape = shape[0]
+        return np.reshape(self, shape, order=order)
+
+    def flatten(self) -> '_BatchedArray':  # noqa: D102
+        return np.reshape(self, -1)
+
+    def transpose(self, *axes) -> '_BatchedArray':  # noqa: D102
+        if len(axes) == 1 and not isinstance(axes[0], int):
+            axes = axes[0]
+        return np.transpose(self, axes if axes else None)
+
+    def __getattr__(self, name: str):  # noqa: D105
+        if name in _NUMPY_METHODS:
+            return functools.partial(getattr(np, name), self)
+        if hasattr(np.ndarray, name):
+            self._raise_unbatchable()
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):  # noqa: D105
+        if any(
+            hasattr(type(x), '__array_ufunc__')
+            and not isinstance(x, (np.ndarray, np.generic, _BatchedArray))
+            for x in inputs
+        ):
+            # Let variables wrapping batched arrays record the computation.
+            return NotImplemented
+        if 'out' in kwargs:
+            self._raise_unbatchable()
+        if method == 'at' and self is inputs[0]:
+            key = self._batched_key(inputs[1])
+            if key is not None:
+                return ufunc.at(self._data, key, *_align(
+                    inputs[2:], self._data[key].ndim - 1))
+        if method == '__call__' and ufunc.signature is None:
+            return _BatchedArray(ufunc(*_align(inputs), **kwargs))
+        if method == '__call__':
+            return _apply_batch_rule(ufunc, inputs, kwargs)
+        return _loop(getattr(ufunc, method), inputs, kwargs)
+
+    def __array_function__(self, func, types, args, kwargs):  # noqa: D105
+        if not all(issubclass(t, (np.ndarray, _BatchedArray)) for t in types):
+            return NotImplemented
+        return _apply_batch_rule(func, args, kwargs)
+
+
+def _bind_batch_rule(forward: callable, rule: callable):
+    config._func2batch_rules[forward] = rule
+
+
+def _apply_batch_rule(func: callable, args: tuple, kwargs: dict):
+    rule = config._func2batch_rules.get(func)
+    if rule is not None:
+        result = rule(*args, **kwargs)
+        if result is not NotImplemented:
+            return result
+    return _loop(func, args, kwargs)
+
+
+def _batch_size(x) -> tp.Optional[int]:
+    if isinstance(x, _BatchedArray):
+        return len(x._data)
+    if isinstance(x, (tuple, list)):
+        x = tuple(x)
+    elif isinstance(x, dict):
+        x = tuple(x.values())
+    else:
+        return None
+    for a in x:
+        if (size := _batch_size(a)) is not None:
+            return size
+    return None
+
+
+def _example(x, index: int):
+    if isinstance(x, _BatchedArray):
+        return x._data[index]
+    if isinstance(x, (tuple, list)):
+        return _rebuild(x, (_example(a, index) for a in x))
+    if isinstance(x, dict):
+        return {k: _example(v, index) for k, v in x.items()}
+    return x
+
+
+def _stack(results: list):
+    first = results[0]
+    if first is None:
+        return None
+    if isinstance(first, (tuple, list)):
+        return tuple(
+            _stack([r[i] for r in results]) for i in range(len(first)))
+    return _BatchedArray(np.stack([np.asarray(r) for r in results]))
+
+
+def _loop(func: callable, args: tuple, kwargs: dict):
+    size = _batch_size((args, kwargs))
+    return _stack([
+        func(*_example(args, i), **_example(kwargs, i)) for i in range(size)
+    ])
+
+
+def _call_batched(func: callable, *args, **kwargs):
+    """Call function at once for batched arguments if possible.
+
+    Parameters
+    ----------
+    func : callable
+        Function to call.
+
+    Returns
+    -------
+    Any
+        Result of the function batched in the same way as the arguments,
+        computed for each example if the function uses batched arrays in ways
+        only computation for each example supports.
+    """
+    try:
+        return func(*args, **kwargs)
+    except _Unbatchable:
+        return _loop(func, args, kwargs)
+
+
+def _any(a) -> bool:
+    # Whether any element is true in any of stacked arrays.
+    return bool(np.any(a._data if isinstance(a, _BatchedArray) else a))
+
+
+def _align(arrays: tp.Iterable, ndim: int = None) -> tuple:
+    # Data of batched arrays with their per-example axes aligned to the
+    # trailing axes of unbatched ones in broadcasting.
+    arrays = tuple(arrays)
+    if ndim is None:
+        ndim = max(np.ndim(a) for a in arrays)
+    return tuple(
+        a._data.reshape(
+            a._data.shape[:1] + (1,) * (ndim - a.ndim) + a.shape)
+        if isinstance(a, _BatchedArray) else a
+        for a in arrays
+    )
+
+
+def _shift_axis(axis, ndim: int):
+    # Axis of batched data, where axes `None` refers to all but batch axis.
+    if axis is None:
+        return tuple(range(1, ndim + 1))
+    if isinstance(axis, (tuple, list)):
+        return tuple(_shift_axis(ax, ndim) for ax in axis)
+    return axis + 1 if axis >= 0 else axis
+
+
+def _reduction_rule(func: callable) -> callable:
+
+    def rule(a, axis=None, *args, **kwargs):
+        if (
+            not isinstance(a, _BatchedArray)
+            or _batch_size((args, kwargs)) is not None
+        ):
+            return NotImplemented
+        return _BatchedArray(
+            func(a._data, _shift_axis(axis, a.ndim), *args, **kwargs))
+
+    return rule
+
+
+def _like_rule(func: callable) -> callable:
+
+    def rule(a, *args, **kwargs):
+        if (
+            not isinstance(a, _BatchedArray)
+            or _batch_size((args, kwargs)) is not None
+        ):
+            return NotImplemented
+        if kwargs.get('shape') is not None:
+            shape = kwargs['shape']
+            shape = (shape,) if np.ndim(shape) == 0 else tuple(shape)
+            kwargs['shape'] = a._data.shape[:1] + shape
+        return _BatchedArray(func(a._data, *args, **kwargs))
+
+    return rule
+
+
+# Properties of each example rather than the stack of them.
+_bind_batch_rule(np.shape, lambda a: a.shape)
+_bind_batch_rule(np.ndim, lambda a: a.ndim)
+_bind_batch_rule(
+    np.size,
+    lambda a, axis=None: a.size if axis is None else a.shape[axis],
+)
+_bind_batch_rule(
+    np.result_type,
+    lambda *arrays_and_dtypes: np.result_type(*(
+        a.dtype if isinstance(a, _BatchedArray) else a
+        for a in arrays_and_dtypes
+    )),
+)
+for _f in (np.zeros_like, np.ones_like, np.empty_like, np.full_like):
+    _bind_batch_rule(_f, _like_rule(_f))
+_bind_batch_rule(
+    np.where,
+    lambda condition, *args: _BatchedArray(
+        np.where(*_align((condition,) + args))) if len(args) == 2 else (
+            NotImplemented),
+)
+_bind_batch_rule(
+    np.take,
+    lambda a, indices, axis=None: NotImplemented if not isinstance(
+        a, _BatchedArray) or isinstance(indices, _BatchedArray)
+    else _BatchedArray(
+        np.take(a._data.reshape(len(a._data), -1), indices, 1)
+        if axis is None else np.take(
+            a._data, indices, _shift_axis(axis, a.ndim))),
+)
+_bind_batch_rule(
+    np.pad,
+    lambda array, pad_width, mode='constant', **kwargs: NotImplemented
+    if mode != 'constant' or _batch_size((pad_width, kwargs)) is not None
+    else _BatchedArray(np.pad(
+        array._data,
+        ((0, 0),) + tuple(map(tuple, np.broadcast_to(
+            np.asarray(pad_width, dtype=int), (array.ndim, 2)))),
+        **kwargs,
+    )),
+)
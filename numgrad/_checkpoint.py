@@ -0,0 +1,110 @@
+import functools
+import inspect
+import threading
+import time
+
+import numpy as np
+
+from numgrad._backward_plan import _call_at_end_of_backward
+from numgrad._config import config
+from numgrad._graph import Graph
+from numgrad._variable import _ndarray_args, _ndarray_kwargs, Variable
+from numgrad._vjp import _VJPIterator
+
+
+def checkpoint(forward_func: callable) -> callable:
+    """Return function recorded as a single node and recomputed in backward.
+
+    Operations inside the returned function are not recorded into the graph
+    under construction, so that their intermediate results are freed as soon
+    as the function returns. Only its inputs and its result are kept, and the
+    function is computed again on the inputs when gradients are propagated
+    through it. This trades computation for memory of deep graphs.
+
+    Parameters
+    ----------
+    forward_func : callable
+        Function to checkpoint, which must return an array of floating point
+        numbers. Gradients are propagated only to variables passed as its
+        positional arguments, variables used in other ways inside the
+        function are treated as constants.
+
+    Returns
+    -------
+    callable
+        Function that computes the same as the input function.
+
+    Examples
+    --------
+    >>> @ng.checkpoint
+    ... def block(h, w):
+    ...     return np.tanh(h @ w)
+    ...
+    >>> w = ng.Variable([[1., 0.], [0., 2.]])
+    >>> with ng.Graph() as g:
+    ...     y = np.sum(block(block(np.ones(2), w), w))
+    ...
+    >>> len(g._node_list)
+    3
+    >>> g.backward(y, w)
+    array([[0.69454575, 0.07325395],
+           [0.81353951, 0.08967782]])
+    """
+    # Gradients of the latest recomputation in each thread, which are
+    # returned one by one as the VJP is called for each of the inputs.
+    local = threading.local()
+
+    def forward(*args, _differentiable: tuple = (), **kwargs):
+        return forward_func(*args, **kwargs)
+
+    def vjp(g, r, *args, _nth: int, _differentiable: tuple, **kwargs):
+        cache = vars(local)
+        if cache.get('g') is not g or cache.get('r') is not r:
+            sources = tuple(args[i] for i in _differentiable)
+            if config._graph is None:
+                sources = tuple(Variable(a) for a in sources)
+            inputs = list(args)
+            for i, s in zip(_differentiable, sources):
+                inputs[i] = s
+            with Graph(_allow_multiple_graphs=True) as graph:
+                # Differentiable with respect to `g` for higher-order
+                # derivatives unlike `target_grad` of `Graph.backward`.
+                target = np.sum(forward_func(*inputs, **kwargs) * g)
+            grads = graph.backward(target, sources)
+            cache.clear()
+            cache.update(g=g, r=r, grads=dict(zip(_differentiable, grads)))
+            # VJPs of inputs not depending on sources are never called to pop
+            # their gradients.
+            _call_at_end_of_backward(cache.clear)
+        dx = cache['grads'].pop(_nth)
+        if len(cache['grads']) == 0:
+            cache.clear()
+        return dx
+
+    config._func2vjps[forward] = _VJPIterator(vjp)
+
+    @functools.wraps(forward_func)
+    def wrapped_forward(*args, **kwargs):
+        graph = config._graph
+        differentiable = tuple(
+            i for i, a in enumerate(args)
+            if isinstance(a, Variable) and a._requires_grad
+        )
+        if graph is None or len(differentiable) == 0:
+            return forward_func(*args, **kwargs)
+        start = time.perf_counter() if config._hooks else None
+        config._graph = None
+        try:
+            result = forward_func(
+                *_ndarray_args(*args), **_ndarray_kwargs(**kwargs))
+        finally:
+            config._graph = graph
+        if start is not None:
+            config._call_hooks('forward', forward, args, start)
+        result = Variable(result)
+        graph._add_node(
+            result, forward, *args, _differentiable=differentiable, **kwargs)
+        return result
+
+    wrapped_forward.__signature__ = inspect.signature(forward_func)
+    return wrapped_forward
@@ -1,3 +1,5 @@
+import contextvars
+import time
 import typing as tp
 
 import numpy as np
@@ -11,17 +13,33 @@ class _Singleton:
         return cls._instance
 
 
+# Graph under construction in the current thread or asynchronous task.
+_current_graph: contextvars.ContextVar = contextvars.ContextVar(
+    'graph', default=None)
+
+
 class Config(_Singleton):
     """Configuration of numgrad module."""
 
     def __init__(self):
         """Initialize configuration."""
         self._dtype = np.float64
-        self._graph = None
-        self._verbosity: int = 0
+        self._hooks: tp.List[tp.Callable] = []
         self._patched_function: tp.Dict[
             callable, tp.Tuple[str, str, callable]] = {}
         self._func2vjps: tp.Dict[tp.Callable, tp.Tuple[tp.Callable, ...]] = {}
+        self._func2jvps: tp.Dict[tp.Callable, tp.Tuple[tp.Callable, ...]] = {}
+        self._func2batch_rules: tp.Dict[tp.Callable, tp.Callable] = {}
+        # Functions whose results differ between calls with the same args.
+        self._random_functions: tp.Set[tp.Callable] = set()
+
+    @property
+    def _graph(self):
+        return _current_graph.get()
+
+    @_graph.setter
+    def _graph(self, value):
+        _current_graph.set(value)
 
     @property
     def dtype(self) -> type:
@@ -49,5 +67,69 @@ class Config(_Singleton):
                 f'`np.float32` or `np.float64`, not {value}')
         self._dtype = value
 
+    def register_hook(self, hook: tp.Callable) -> tp.Callable:
+        """Register function to be called on each forward and VJP call.
+
+        The hook is called after each forward function recorded into a graph
+        and after each VJP function called during backward computation, with
+        the following four arguments in order: `'forward'` or `'vjp'`,
+        the forward function, shapes of the inputs of the forward function,
+        and wall time of the call in seconds.
+
+        Parameters
+        ----------
+        hook : tp.Callable
+            Function to register.
+
+        Returns
+        -------
+        tp.Callable
+            The registered function as is, so that this method can be used as
+            a decorator.
+
+        Examples
+        --------
+        >>> @ng.config.register_hook
+        ... def print_shapes(kind, function, shapes, seconds):
+        ...     print(kind, function.__name__, shapes)
+        ...
+        >>> x = ng.Variable([1, 2])
+        >>> with ng.Graph() as g:
+        ...     y = np.sum(np.square(x))
+        ...
+        forward square ((2,),)
+        forward sum ((2,),)
+        >>> _ = g.backward(y, x)
+        vjp sum ((2,),)
+        vjp square ((2,),)
+        >>> ng.config.remove_hook(print_shapes)
+        """
+        self._hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook: tp.Callable):
+        """Remove function registered by `register_hook`.
+
+        Parameters
+        ----------
+        hook : tp.Callable
+            Function to remove.
+        """
+        self._hooks.remove(hook)
+
+    def _call_hooks(self, kind: str, function, args: tuple, start: float):
+        seconds = time.perf_counter() - start
+        shapes = tuple(_shape(a) for a in args)
+        for hook in tuple(self._hooks):
+            hook(kind, function, shapes, seconds)
+
+
+def _shape(a) -> tuple:
+    if hasattr(a, 'shape'):
+        return a.shape
+    if isinstance(a, (tuple, list)) and any(hasattr(x, 'shape') for x in a):
+        return tuple(_shape(x) for x in a)
+    return np.shape(a)
+
 
 config = Config()
@@ -1,25 +1,67 @@
+import mmap
+import typing as tp
+import warnings
+
+import numpy as np
+
+from numgrad._batching import _BatchedArray
 from numgrad._config import config
 from numgrad._graph import Graph
+from numgrad._mixed_precision import MixedPrecision
 from numgrad._utils._isscalar import _isscalar
 from numgrad._variable import Variable
 
 
+def _is_memory_mapped(a) -> bool:
+    while isinstance(a, np.ndarray):
+        if isinstance(a, np.memmap):
+            return True
+        a = a.base
+    return isinstance(a, mmap.mmap)
+
+
+def _as_variable(a) -> Variable:
+    # Variables are differentiated without converting or copying their data,
+    # each as an argument of its own even if passed more than once.
+    if isinstance(a, Variable):
+        return Variable(
+            a._data, a._data.dtype.type, copy=False,
+            requires_grad=a._requires_grad)
+    if (
+        isinstance(a, np.ndarray) and a.dtype != config.dtype
+        and _is_memory_mapped(a)
+    ):
+        warnings.warn(
+            f'Memory-mapped array of {a.dtype} is copied into memory to '
+            f'convert it into {np.dtype(config.dtype)}, pass '
+            f'`ng.Variable(array, dtype=np.{a.dtype})` instead to '
+            'differentiate it without copying',
+            RuntimeWarning,
+            stacklevel=4,
+        )
+    return Variable(a)
+
+
 def _func_to_grad(
     func,
     return_value: bool,
     force_scalar_output: bool,
+    out=None,
+    precision: tp.Optional[MixedPrecision] = None,
 ) -> callable:
+    if isinstance(out, np.ndarray):
+        out = (out,)
 
     def _grad_func(*args, **kwargs):
         if len(args) == 0:
             raise ValueError('Please pass at least one positional argument.')
         if config._graph is None:
-            args = tuple(Variable(a) for a in args)
-        with Graph(_allow_multiple_graphs=True) as g:
+            args = tuple(_as_variable(a) for a in args)
+        with Graph(_allow_multiple_graphs=True, precision=precision) as g:
             value: Variable = func(*args, **kwargs)
         if force_scalar_output and (not _isscalar(value)):
             raise ValueError('Cannot compute gradient of non-scalar value.')
-        grads = g.backward(value, args)
+        grads = g.backward(value, args, out=out)
         if len(grads) == 1:
             grads = grads[0]
         if return_value:
@@ -29,7 +71,13 @@ def _func_to_grad(
     return _grad_func
 
 
-def grad(forward_func: callable) -> callable:
+def grad(
+    forward_func: callable,
+    *,
+    out: tp.Union[
+        None, np.ndarray, tp.Sequence[tp.Optional[np.ndarray]]] = None,
+    precision: tp.Optional[MixedPrecision] = None,
+) -> callable:
     """Return a function that returns gradients of forward function.
 
     Parameters
@@ -37,6 +85,12 @@ def grad(forward_func: callable) -> callable:
     forward_func : callable
         Input forward function. Note that the forward function must return
         scalar value.
+    out : tp.Union[None, np.ndarray, tp.Sequence[tp.Optional[np.ndarray]]]
+        Preallocated array(s) to write gradients into on every call, by
+        default None. See `numgrad.Graph.backward` for the details.
+    precision : tp.Optional[MixedPrecision]
+        Precision policy of the graph on every call, by default None. See
+        `numgrad.MixedPrecision` for the details.
 
     Returns
     -------
@@ -53,6 +107,11 @@ def grad(forward_func: callable) -> callable:
     >>> grad(np.hypot)(-3, 4)
     (np.float64(-0.6), np.float64(0.8))
     >>>
+    >>> # writes gradients into the given arrays
+    >>> dx = np.empty(2)
+    >>> grad(lambda x: np.sum(x * x), out=dx)([1., 2.]) is dx
+    True
+    >>>
     >>> # raises an error because `np.tanh([0, 1])` is not scalar.
     >>> grad(np.tanh)([0, 1])
     Traceback (most recent call last):
@@ -60,10 +119,21 @@ def grad(forward_func: callable) -> callable:
     ValueError: Cannot compute gradient of non-scalar value.
     """
     return _func_to_grad(
-        forward_func, return_value=False, force_scalar_output=True)
+        forward_func,
+        return_value=False,
+        force_scalar_output=True,
+        out=out,
+        precision=precision,
+    )
 
 
-def value_and_grad(forward_func: callable) -> callable:
+def value_and_grad(
+    forward_func: callable,
+    *,
+    out: tp.Union[
+        None, np.ndarray, tp.Sequence[tp.Optional[np.ndarray]]] = None,
+    precision: tp.Optional[MixedPrecision] = None,
+) -> callable:
     """Return a function that returns value and gradients of forward function.
 
     Parameters
@@ -71,6 +141,12 @@ def value_and_grad(forward_func: callable) -> callable:
     forward_func : callable
         Input forward function. Note that the forward function must return
         scalar value.
+    out : tp.Union[None, np.ndarray, tp.Sequence[tp.Optional[np.ndarray]]]
+        Preallocated array(s) to write gradients into on every call, by
+        default None. See `numgrad.Graph.backward` for the details.
+    precision : tp.Optional[MixedPrecision]
+        Precision policy of the graph on every call, by default None. See
+        `numgrad.MixedPrecision` for the details.
 
     Returns
     -------
@@ -94,10 +170,20 @@ def value_and_grad(forward_func: callable) -> callable:
     ValueError: Cannot compute gradient of non-scalar value.
     """
     return _func_to_grad(
-        forward_func, return_value=True, force_scalar_output=True)
+        forward_func,
+        return_value=True,
+        force_scalar_output=True,
+        out=out,
+        precision=precision,
+    )
 
 
-def elementwise_grad(forward_func: callable) -> callable:
+def elementwise_grad(
+    forward_func: callable,
+    *,
+    out: tp.Union[
+        None, np.ndarray, tp.Sequence[tp.Optional[np.ndarray]]] = None,
+) -> callable:
     """Return function that returns element-wise gradients of forward function.
 
     Parameters
@@ -105,6 +191,9 @@ def elementwise_grad(forward_func: callable) -> callable:
     forward_func : callable
         Input forward function. The return value does not have to be scalar
         unlike `grad`.
+    out : tp.Union[None, np.ndarray, tp.Sequence[tp.Optional[np.ndarray]]]
+        Preallocated array(s) to write gradients into on every call, by
+        default None. See `numgrad.Graph.backward` for the details.
 
     Returns
     -------
@@ -122,4 +211,234 @@ def elementwise_grad(forward_func: callable) -> callable:
     (array([-0.6,  0.6]), np.float64(1.6))
     """
     return _func_to_grad(
-        forward_func, return_value=False, force_scalar_output=False)
+        forward_func,
+        return_value=False,
+        force_scalar_output=False,
+        out=out,
+    )
+
+
+def _grad_in_graph(forward_func: callable, args: tuple, kwargs: dict):
+    # Gradients whose computations are recorded into the graph under
+    # construction, with zeros for those independent of the arguments.
+    grads = _func_to_grad(
+        forward_func, return_value=False, force_scalar_output=True,
+    )(*args, **kwargs)
+    if len(args) == 1:
+        grads = (grads,)
+    return tuple(
+        np.zeros_like(a) if g is None else g for g, a in zip(grads, args))
+
+
+def _reshape_block(block, shape: tuple):
+    block = np.reshape(block, shape)
+    return block[()] if shape == () else block
+
+
+def _unbatch(j, size: int):
+    # Gradients independent of the cotangents are not batched.
+    if j is None or isinstance(j, _BatchedArray):
+        return None if j is None else j._data
+    return np.broadcast_to(j, (size,) + np.shape(j))
+
+
+def hvp(forward_func: callable) -> callable:
+    """Return a function that returns Hessian-vector product.
+
+    The product is computed by differentiating the backward computation of
+    the gradient, without computing the Hessian itself.
+
+    Parameters
+    ----------
+    forward_func : callable
+        Input forward function. Note that the forward function must return
+        scalar value.
+
+    Returns
+    -------
+    callable
+        Function that returns the product of the Hessian of the forward
+        function with respect to the positional args other than the last one,
+        and the last positional arg, which is a vector or a tuple of vectors
+        if there are multiple positional args to differentiate against.
+
+    Examples
+    --------
+    >>> hvp(lambda x: np.sum(x ** 3))([1., 2.], [1., 1.])
+    array([ 6., 12.])
+    >>>
+    >>> # vectors for each positional arg
+    >>> hvp(lambda x, y: x * y ** 2)(3., 2., (1., 0.))
+    (np.float64(0.0), np.float64(4.0))
+    """
+
+    def _hvp_func(*args, **kwargs):
+        if len(args) < 2:
+            raise ValueError(
+                'Please pass at least one positional argument and a vector.')
+        *args, v = args
+        vs = (v,) if len(args) == 1 else tuple(v)
+        if len(vs) != len(args):
+            raise ValueError(
+                f'Number of vectors {len(vs)} must be the same as the number '
+                f'of positional arguments {len(args)}')
+        if config._graph is None:
+            args = tuple(_as_variable(a) for a in args)
+        with Graph(_allow_multiple_graphs=True) as g:
+            grads = _grad_in_graph(forward_func, args, kwargs)
+            gv = sum(
+                np.sum(g_ * np.asarray(v_, dtype=config.dtype))
+                for g_, v_ in zip(grads, vs)
+            )
+        if isinstance(gv, Variable):
+            hv = g.backward(gv, args)
+        else:
+            hv = (None,) * len(args)
+        hv = tuple(
+            np.zeros_like(a) if h is None else h for h, a in zip(hv, args))
+        return hv[0] if len(hv) == 1 else hv
+
+    return _hvp_func
+
+
+def hessian(forward_func: callable) -> callable:
+    """Return a function that returns Hessian of forward function.
+
+    Rows of the Hessian are computed at once as Hessian-vector products with
+    a batch of unit vectors, propagated backward through a recorded gradient
+    in a single sweep.
+
+    Parameters
+    ----------
+    forward_func : callable
+        Input forward function. Note that the forward function must return
+        scalar value.
+
+    Returns
+    -------
+    callable
+        Function that returns Hessian with respect to the positional arg,
+        whose shape is `x.shape + x.shape` for the arg `x`. It returns tuple
+        of tuples of the blocks `H[i][j]` with the shape
+        `args[i].shape + args[j].shape` if you pass multiple positional args.
+
+    Examples
+    --------
+    >>> hessian(lambda x: np.sum(x ** 3))([1., 2.])
+    array([[ 6.,  0.],
+           [ 0., 12.]])
+    >>>
+    >>> hessian(lambda x, y: x * y ** 2)(3., 2.)
+    ((np.float64(0.0), np.float64(4.0)), (np.float64(4.0), np.float64(6.0)))
+    """
+
+    def _hessian_func(*args, **kwargs):
+        if len(args) == 0:
+            raise ValueError('Please pass at least one positional argument.')
+        if config._graph is None:
+            args = tuple(_as_variable(a) for a in args)
+        with Graph(_allow_multiple_graphs=True) as g:
+            grads = _grad_in_graph(forward_func, args, kwargs)
+        blocks = []
+        for g_, a in zip(grads, args):
+            basis = np.eye(np.size(a), dtype=config.dtype)
+            if not isinstance(g_, Variable) or len(basis) == 0:
+                block = (None,) * len(args)
+            elif config._graph is None:
+                block = tuple(
+                    _unbatch(h, len(basis)) for h in g._get_plan(
+                        g_, args,
+                    ).run(g._node_list, _BatchedArray(
+                        basis.reshape(-1, *np.shape(a)))))
+            else:
+                # Rows are recorded into the graph under construction.
+                rows = [
+                    g.backward(g_, args, target_grad=e.reshape(a.shape))
+                    for e in basis
+                ]
+                block = tuple(
+                    None if any(r[j] is None for r in rows)
+                    else np.stack([r[j] for r in rows])
+                    for j in range(len(args))
+                )
+            blocks.append(tuple(
+                _reshape_block(
+                    np.zeros(np.size(a) * np.size(b), dtype=config.dtype)
+                    if h is None else h,
+                    np.shape(a) + np.shape(b),
+                )
+                for h, b in zip(block, args)
+            ))
+        if len(blocks) == 1:
+            return blocks[0][0]
+        return tuple(blocks)
+
+    return _hessian_func
+
+
+def jacobian(forward_func: callable) -> callable:
+    """Return a function that returns Jacobian of forward function.
+
+    Rows of the Jacobian are computed at once by propagating a batch of unit
+    cotangents backward in a single sweep, where VJPs not supporting the batch
+    are computed for each of the cotangents.
+
+    Parameters
+    ----------
+    forward_func : callable
+        Input forward function.
+
+    Returns
+    -------
+    callable
+        Function that returns Jacobian with respect to the positional arg,
+        whose shape is `y.shape + x.shape` for the output `y` and the arg `x`.
+        It returns tuple of Jacobians with respect to each of the positional
+        args if you pass multiple positional args.
+
+    Examples
+    --------
+    >>> jacobian(lambda x: x ** 2)([1., 2.])
+    array([[2., 0.],
+           [0., 4.]])
+    >>>
+    >>> jacobian(lambda x, y: np.stack([x * y, x + y]))(3., 2.)
+    (array([2., 1.]), array([3., 1.]))
+    """
+
+    def _jacobian_func(*args, **kwargs):
+        if len(args) == 0:
+            raise ValueError('Please pass at least one positional argument.')
+        if config._graph is None:
+            args = tuple(_as_variable(a) for a in args)
+        with Graph(_allow_multiple_graphs=True) as g:
+            y = forward_func(*args, **kwargs)
+        g._check_type_of_target_and_sources(y, args)
+        shape = np.shape(y)
+        basis = np.eye(int(np.prod(shape)), dtype=config.dtype)
+        if len(basis) == 0:
+            jacobians = (None,) * len(args)
+        elif config._graph is None:
+            jacobians = tuple(
+                _unbatch(j, len(basis)) for j in g._get_plan(y, args).run(
+                    g._node_list, _BatchedArray(basis.reshape(-1, *shape)))
+            )
+        else:
+            # Rows are recorded into the graph under construction.
+            rows = [
+                g.backward(y, args, target_grad=e.reshape(shape))
+                for e in basis
+            ]
+            jacobians = tuple(
+                None if any(r[i] is None for r in rows)
+                else np.stack([r[i] for r in rows])
+                for i in range(len(args))
+            )
+        jacobians = tuple(
+            np.zeros(shape + np.shape(a), dtype=config.dtype) if j is None
+            else _reshape_block(j, shape + np.shape(a))
+            for j, a in zip(jacobians, args)
+        )
+        return jacobians[0] if len(jacobians) == 1 else jacobians
+
+    return _jacobian_func
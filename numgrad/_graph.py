@@ -1,18 +1,76 @@
 from collections import namedtuple
+import json
+import math
+import os
 import typing as tp
 from typing import List, Tuple, Union
 
 import numpy as np
-import numpy
-import scipy.special  # noqa: F401
 
+from numgrad._backward_plan import _BackwardPlan
 from numgrad._config import config
-from numgrad._utils._isscalar import _isscalar
-from numgrad._utils._unbroadcast import _unbroadcast_to
-from numgrad._variable import Variable
+from numgrad._mixed_precision import MixedPrecision
+from numgrad._tape import _Tape, _variables_in, Node
+from numgrad._utils._buffer import _buffer
+from numgrad._utils._graph_file import (
+    _Decoder, _Encoder, _function_name, _import_function, _memmap_npz,
+)
+from numgrad._utils._rebuild import _rebuild
+from numgrad._variable import _ndarray_args, _ndarray_kwargs, Variable
+from numgrad._vjp import (
+    _patch_functions, _register_vjps, _restore_functions,
+)
 
 
-Node = namedtuple('Node', ('result', 'function', 'inputs', 'kwargs'))
+MemoryReport = namedtuple(
+    'MemoryReport', ('total', 'nodes', 'functions', 'backward_peak'))
+
+
+def _substitute(x, id2value: dict):
+    if id(x) in id2value:
+        return id2value[id(x)]
+    if isinstance(x, (tuple, list)):
+        return _rebuild(x, (_substitute(a, id2value) for a in x))
+    return x
+
+
+def _arrays_in(x) -> tp.Iterator:
+    if isinstance(x, (tuple, list)):
+        for a in x:
+            yield from _arrays_in(a)
+    elif isinstance(x, dict):
+        for a in x.values():
+            yield from _arrays_in(a)
+    else:
+        yield x
+
+
+def _call_key(x):
+    # Key of a call equal to those of calls with the same variables and
+    # values, or None if the call involves arrays which could be mutated.
+    if isinstance(x, Variable):
+        return Variable, id(x)
+    if isinstance(x, (tuple, list)):
+        keys = tuple(_call_key(a) for a in x)
+        return None if None in keys else (tuple, keys)
+    if isinstance(x, slice):
+        return _call_key((slice, x.start, x.stop, x.step))
+    if isinstance(x, (bool, np.bool_)):
+        return bool, bool(x)
+    # Numbers are compared by value but not type, as they are recorded after
+    # converted into the data type, and signs tell zeros apart.
+    if isinstance(x, (int, np.integer)):
+        return x, 1.
+    if isinstance(x, (float, np.floating)):
+        return x, math.copysign(1., x)
+    if isinstance(x, (complex, np.complexfloating)):
+        return x, math.copysign(1., x.real), math.copysign(1., x.imag)
+    if (
+        x is None or x is Ellipsis or callable(x)
+        or isinstance(x, (str, np.dtype))
+    ):
+        return x
+    return None
 
 
 class Graph(object):
@@ -41,13 +99,51 @@ class Graph(object):
     TypeError: `target` of `numgrad.Graph.gradient()` must ...
     """
 
-    def __init__(self, **kwargs):
-        """Construct computational graph."""
+    def __init__(
+        self,
+        *,
+        cse: bool = False,
+        precision: tp.Optional[MixedPrecision] = None,
+        **kwargs,
+    ):
+        """Construct computational graph.
+
+        Parameters
+        ----------
+        cse : bool, optional
+            Eliminate common subexpressions while recording, by default
+            False. A call of the same function with the same variables and
+            values as a recorded one returns the recorded result, so that
+            forward and backward computation of the call are done only once.
+            Random functions are always called anew, while the other
+            functions are assumed to be deterministic.
+        precision : tp.Optional[MixedPrecision], optional
+            Precision policy to store results and cotangents with, by default
+            None to keep them in the precision computed.
+
+        Examples
+        --------
+        >>> x = ng.Variable([1., 2.])
+        >>> with ng.Graph(cse=True) as g:
+        ...     a = np.exp(x)
+        ...     b = np.exp(x)
+        ...
+        >>> a is b
+        True
+        """
         super().__init__()
-        self._node_list: tp.List[Node] = []
+        self._node_list = _Tape()
         self._parent_graph: tp.Optional[Graph] = None
+        self._num_skipped_nodes: int = 0
+        self._num_reused_buffers: int = 0
+        self._plans: tp.Dict[tuple, tuple] = {}
+        self._backward_peak_bytes: int = 0
         self._allow_multiple_graphs: bool = kwargs.get(
             '_allow_multiple_graphs', False)
+        self._cse: bool = cse
+        self._precision: tp.Optional[MixedPrecision] = precision
+        self._key2result: tp.Dict[tuple, tp.Any] = {}
+        self._num_eliminated_calls: int = 0
 
     def __enter__(self) -> 'Graph':
         """Return new computation graph to construct.
@@ -62,6 +158,7 @@ class Graph(object):
         ValueError
             Another graph is under construction.
         """
+        _register_vjps()
         if config._graph is not None:
             if (
                 not self._allow_multiple_graphs
@@ -69,10 +166,8 @@ class Graph(object):
             ):
                 raise ValueError('There is already a graph under construction')
             self._parent_graph = config._graph
-            # should be no need to patch functions here.
         else:
-            for module, func, patched in config._patched_function.values():
-                setattr(eval(module), func, patched)
+            _patch_functions()
         config._graph = self
         return self
 
@@ -80,37 +175,93 @@ class Graph(object):
         """Exit from the graph under construction."""
         config._graph = self._parent_graph
         if config._graph is None:
-            for (
-                original,
-                (module, func, _),
-            ) in config._patched_function.items():
-                setattr(eval(module), func, original)
+            _restore_functions()
 
     def _add_node(self, result, function, *inputs, **kwargs):
         if function not in config._func2vjps:
             raise NotImplementedError(
                 f'Cannot backprop through {function}, '
                 'VJP of the function is not registered yet.')
-        if any(result is node.result for node in self._node_list):
+        if self._node_list.producer(id(result)) is not None:
             raise ValueError('The result already exists in the graph')
 
+        if self._precision is not None:
+            self._precision._store(result)
         node = Node(result, function, inputs, kwargs)
-        if config._verbosity > 0:
-            print('Graph:', self, ', Node:', node)
-        self._node_list.append(node)
+        self._register_node(node)
         self._add_node_to_parents(node)
+        if self._cse and function not in config._random_functions:
+            key = _call_key((function, inputs, sorted(kwargs.items())))
+            if key is not None:
+                self._key2result.setdefault(key, result)
+
+    def _find_result(self, function, args: tuple, kwargs: dict):
+        # Recorded result of the same call, or None if there is no such one.
+        if not self._key2result:
+            return None
+        key = _call_key((function, args, sorted(kwargs.items())))
+        result = self._key2result.get(key) if key is not None else None
+        if result is not None:
+            self._num_eliminated_calls += 1
+        return result
+
+    def _register_node(self, node: Node):
+        self._node_list.append(node)
 
     def _add_node_to_parents(self, node: Node):
         if self._parent_graph is None:
             return
-        if config._verbosity > 0:
-            print('Graph:', self._parent_graph, ', Node:', node)
-        self._parent_graph._node_list.append(node)
+        self._parent_graph._register_node(node)
         self._parent_graph._add_node_to_parents(node)
 
-    @staticmethod
-    def _get_vjps(node):
-        return config._func2vjps[node.function]
+    def _replay(self, id2value: dict) -> 'Graph':
+        """Return new graph recomputed from recorded nodes with new values.
+
+        Parameters
+        ----------
+        id2value : dict
+            Mapping from id of variables or arrays used in this graph to their
+            new values. Every recorded result is mapped to its recomputed
+            variable in place.
+
+        Returns
+        -------
+        Graph
+            New graph with the same structure as this graph.
+        """
+        graph = Graph()
+        for node in self._node_list:
+            inputs = tuple(_substitute(x, id2value) for x in node.inputs)
+            kwargs = {
+                k: _substitute(v, id2value) for k, v in node.kwargs.items()
+            }
+            result = node.function(
+                *(
+                    _rebuild(x, _ndarray_args(*x))
+                    if isinstance(x, (tuple, list)) else x
+                    for x in _ndarray_args(*inputs)
+                ),
+                **_ndarray_kwargs(**kwargs),
+            )
+            if isinstance(node.result, tuple):
+                result = tuple(
+                    Variable(r) if isinstance(r_old, Variable) else r
+                    for r, r_old in zip(result, node.result)
+                )
+                for r, r_old in zip(result, node.result):
+                    id2value[id(r_old)] = r
+                result = _rebuild(node.result, result)
+            else:
+                result = Variable(result)
+            id2value[id(node.result)] = result
+            graph._register_node(Node(result, node.function, inputs, kwargs))
+        return graph
+
+    def _get_producer(self, x) -> tp.Optional[int]:
+        return self._node_list.producer(id(x))
+
+    def _get_consumers(self, x) -> tp.List[int]:
+        return self._node_list.consumers(id(x))
 
     def backward(
         self,
@@ -118,6 +269,8 @@ class Graph(object):
         sources: Union[Variable, List[Variable], Tuple[Variable, ...]],
         *,
         target_grad: tp.Optional[tp.Union[np.number, np.ndarray]] = None,
+        out: tp.Union[
+            None, np.ndarray, tp.Sequence[tp.Optional[np.ndarray]]] = None,
     ) -> tp.Union[np.ndarray, tp.Tuple[np.ndarray, ...]]:
         """Return gradients propagated backward from target to each source.
 
@@ -129,32 +282,246 @@ class Graph(object):
             Source variable(s) to differentiated against.
         target_grad : tp.Optional[tp.Union[np.number, np.ndarray]]
             Gradient to propagate backward from target, by default None.
+        out : tp.Union[None, np.ndarray, tp.Sequence[tp.Optional[np.ndarray]]]
+            Preallocated array(s) to write gradient(s) into, by default None.
+            Pass a sequence of the same length as `sources` when `sources` is
+            a sequence, where None in the sequence allocates new array for
+            the corresponding source. Sources without gradients get zeros.
 
         Returns
         -------
         tp.Union[np.ndarray, tp.Tuple[np.ndarray, ...]]
             Gradient(s) propagated backward from target to each source.
+
+        Examples
+        --------
+        >>> w = ng.Variable([1., 2.])
+        >>> with ng.Graph() as g:
+        ...     y = np.sum(w * w) + np.sum(w)
+        ...
+        >>> dw = np.empty(2)
+        >>> g.backward(y, w, out=dw) is dw
+        True
+        >>> dw
+        array([3., 5.])
         """
         if return_single := isinstance(sources, Variable):
             sources = (sources,)
+            if out is not None:
+                out = (out,)
         self._check_type_of_target_and_sources(target, sources)
+        self._check_out(out, sources)
         target_grad = self._preprocess_target_grad(target_grad, target)
-        id2grad = {id(target): target_grad}
-        for node in reversed(self._node_list):
-            if not self._can_backprop_node(node, id2grad):
-                continue
-            for x, vjp in zip(node.inputs, self._get_vjps(node)):
-                if not self._is_variable_or_tuple_of_variable(x):
-                    continue
-                dx = self._get_grads(vjp, node, id2grad)
-                if hasattr(x, 'shape'):
-                    dx = _unbroadcast_to(dx, x.shape)
-                self._accumulate_grad(id2grad, dx, x)
-        grads = tuple(id2grad.get(id(s), None) for s in sources)
+        plan = self._get_plan(target, tuple(sources))
+        self._num_skipped_nodes = plan.num_skipped_nodes
+        grads = plan.run(self._node_list, target_grad, out, self._precision)
+        self._num_reused_buffers = plan.num_reused_buffers
+        self._backward_peak_bytes = max(
+            self._backward_peak_bytes, plan.peak_bytes)
         if return_single:
             return grads[0]
         return grads
 
+    def memory_report(self) -> MemoryReport:
+        """Return bytes of arrays retained by this graph.
+
+        Memory buffers shared by multiple arrays, such as views and the arrays
+        owning their memory, are counted only once. Each buffer is attributed
+        to the first node referring to it in order of recording, namely the
+        node producing it or the first node consuming it if not produced.
+
+        Returns
+        -------
+        MemoryReport
+            Named tuple of `total` bytes retained by the graph, tuple of bytes
+            attributed to each of the `nodes`, dict of bytes attributed to each
+            forward function in `functions` in descending order, and
+            `backward_peak` bytes of cotangents alive at the same time during
+            backward computations of this graph so far.
+
+        Examples
+        --------
+        >>> x = ng.Variable(np.ones(1000))
+        >>> with ng.Graph() as g:
+        ...     y = np.exp(x[:500])
+        ...     z = np.sum(y)
+        ...
+        >>> report = g.memory_report()
+        >>> report.total
+        12008
+        >>> report.nodes
+        (8000, 4000, 8)
+        >>> _ = g.backward(z, x)
+        >>> g.memory_report().backward_peak
+        12000
+        """
+        seen = set()
+        nodes = []
+        functions = {}
+        for node in self._node_list:
+            nbytes = 0
+            for a in _arrays_in((node.result, node.inputs, node.kwargs)):
+                buffer = _buffer(a)
+                if buffer is not None and buffer[0] not in seen:
+                    seen.add(buffer[0])
+                    nbytes += buffer[1]
+            nodes.append(nbytes)
+            functions[node.function] = functions.get(node.function, 0) + nbytes
+        return MemoryReport(
+            total=sum(nodes),
+            nodes=tuple(nodes),
+            functions=dict(
+                sorted(functions.items(), key=lambda kv: kv[1], reverse=True)),
+            backward_peak=self._backward_peak_bytes,
+        )
+
+    def save(self, file: tp.Union[str, os.PathLike], *variables: Variable):
+        """Save this graph into a file to load in other processes.
+
+        The file in `.npz` format has the topology of nodes, names of their
+        forward functions and arguments in JSON, and arrays retained by the
+        graph, so that backward computation can run without the code having
+        constructed the graph. Arrays stored in lower precision and the
+        precision policy of the graph are saved as they are.
+
+        Parameters
+        ----------
+        file : tp.Union[str, os.PathLike]
+            Path of the file to save into.
+        variables : Variable
+            Variables to return on loading the graph, e.g. target and sources
+            of backward computation.
+
+        Raises
+        ------
+        ValueError
+            Forward function of a node cannot be imported by its name, such
+            as lambda functions.
+        TypeError
+            Argument of a node cannot be saved.
+
+        Examples
+        --------
+        >>> import tempfile, os
+        >>> w = ng.Variable([1., 2.])
+        >>> with ng.Graph() as g:
+        ...     y = np.sum(np.exp(w) * [3., 4.])
+        ...
+        >>> path = os.path.join(tempfile.mkdtemp(), 'graph.npz')
+        >>> g.save(path, y, w)
+        >>> loaded, (y_, w_) = ng.Graph.load(path)
+        >>> np.allclose(loaded.backward(y_, w_), g.backward(y, w))
+        True
+        """
+        encode = _Encoder()
+        nodes = [
+            {
+                'function': _function_name(node.function),
+                'result': encode(node.result),
+                'inputs': [encode(x) for x in node.inputs],
+                'kwargs': {k: encode(v) for k, v in node.kwargs.items()},
+            }
+            for node in self._node_list
+        ]
+        variables = [encode(v) for v in variables]
+        precision = self._precision
+        graph = json.dumps({
+            'nodes': nodes,
+            'variables': variables,
+            'variable_info': encode.variables,
+            'precision': None if precision is None else {
+                'storage_dtype': precision.storage_dtype.str,
+                'accumulation_dtype': precision.accumulation_dtype.str,
+                'loss_scale': precision.loss_scale,
+                'growth_interval': precision.growth_interval,
+                'min_loss_scale': precision.min_loss_scale,
+            },
+        })
+        np.savez(file, graph=np.array(graph), **encode.arrays)
+
+    @classmethod
+    def load(
+        cls,
+        file: tp.Union[str, os.PathLike],
+        mmap_mode: str = None,
+    ) -> tp.Tuple['Graph', tp.Tuple[Variable, ...]]:
+        """Load graph saved by `Graph.save()`.
+
+        Forward functions are imported by their names, and are not called
+        again.
+
+        Parameters
+        ----------
+        file : tp.Union[str, os.PathLike]
+            Path of the saved file.
+        mmap_mode : str, optional
+            Mode to map arrays in the file to memory instead of reading them,
+            such as 'r' and 'c' of `np.memmap`, by default None.
+
+        Returns
+        -------
+        tp.Tuple[Graph, tp.Tuple[Variable, ...]]
+            Loaded graph and the variables passed on saving it.
+
+        Raises
+        ------
+        ValueError
+            Forward function of a node is not found in this process.
+        """
+        if mmap_mode is None:
+            with np.load(file, allow_pickle=False) as npz:
+                arrays = dict(npz)
+        else:
+            arrays = _memmap_npz(file, mmap_mode)
+        graph = json.loads(arrays.pop('graph').item())
+        decode = _Decoder(arrays, graph['variable_info'])
+        precision = graph.get('precision')
+        loaded = cls(precision=None if precision is None else MixedPrecision(
+            precision.pop('storage_dtype'),
+            precision.pop('accumulation_dtype'),
+            **precision,
+        ))
+        for node in graph['nodes']:
+            function = _import_function(node['function'])
+            if function not in config._func2vjps:
+                raise ValueError(
+                    f'Cannot load graph with {node["function"]}, VJP of the '
+                    'function is not registered in this process')
+            loaded._register_node(Node(
+                decode(node['result']),
+                function,
+                tuple(decode(x) for x in node['inputs']),
+                {k: decode(v) for k, v in node['kwargs'].items()},
+            ))
+        return loaded, tuple(decode(v) for v in graph['variables'])
+
+    def _get_plan(
+        self,
+        target: Variable,
+        sources: tp.Tuple[Variable, ...],
+    ) -> _BackwardPlan:
+        key = (id(target),) + tuple(id(s) for s in sources)
+        if key in self._plans:
+            target_, sources_, plan = self._plans[key]
+            if (
+                target_ is target
+                and all(a is b for a, b in zip(sources_, sources))
+                and plan.num_nodes == len(self._node_list)
+            ):
+                return plan
+        plan = _BackwardPlan(self, target, sources)
+        self._set_plan(target, sources, plan)
+        return plan
+
+    def _set_plan(
+        self,
+        target: Variable,
+        sources: tp.Tuple[Variable, ...],
+        plan: _BackwardPlan,
+    ):
+        key = (id(target),) + tuple(id(s) for s in sources)
+        self._plans[key] = (target, sources, plan)
+
     @staticmethod
     def _check_type_of_target_and_sources(target, sources):
         if not isinstance(target, Variable):
@@ -175,6 +542,30 @@ class Graph(object):
                     'tuple of numgrad.Variable, '
                     f'but contained an instance of {type(s)}')
 
+    @staticmethod
+    def _check_out(out, sources):
+        if out is None:
+            return
+        if config._graph is not None:
+            raise ValueError(
+                '`out` of `numgrad.Graph.backward()` is not supported while '
+                'another graph is under construction')
+        if len(out) != len(sources):
+            raise ValueError(
+                f'Length of `out` {len(out)} must be the same as the number '
+                f'of `sources` {len(sources)}')
+        for buffer, s in zip(out, sources):
+            if buffer is None:
+                continue
+            if not isinstance(buffer, np.ndarray):
+                raise TypeError(
+                    'Elements of `out` must be None or an instance of '
+                    f'np.ndarray, not {type(buffer)}')
+            if buffer.shape != s.shape:
+                raise ValueError(
+                    f'Incompatible shape of out {buffer.shape} with the '
+                    f'shape of its source {s.shape}')
+
     @staticmethod
     def _preprocess_target_grad(target_grad, target):
         if target_grad is None:
@@ -186,53 +577,48 @@ class Graph(object):
                 f'with target.shape {target.shape}')
         return g
 
-    @staticmethod
-    def _can_backprop_node(node: Node, id2grad: dict):
-        if node.function not in config._func2vjps:
-            raise NotImplementedError(
-                f'Cannot backprop through {node.function}, '
-                'VJP of the function is not registered yet.')
-        if isinstance(node.result, (list, tuple)):
-            return all(
-                id(r) in id2grad for r in node.result
-                if isinstance(r, Variable))
-        return id(node.result) in id2grad
-
-    @staticmethod
-    def _is_variable_or_tuple_of_variable(x):
-        if isinstance(x, Variable):
-            return True
-        if isinstance(x, (tuple, list)) and any(
-                isinstance(a, Variable) for a in x):
-            return True
-        return False
+    def _get_nodes_between(
+        self,
+        sources: tp.Iterable[Variable],
+        target: Variable,
+    ) -> tp.Tuple[tp.List[int], tp.Set[int]]:
+        """Return nodes on paths from sources to target in reverse order.
 
-    @staticmethod
-    def _get_grads(vjp: callable, node: Node, id2grad: dict):
-        if isinstance(node.result, tuple):
-            dy = tuple(id2grad.get(id(r), None) for r in node.result)
-        else:
-            dy = id2grad[id(node.result)]
-        dx = vjp(dy, node.result, *node.inputs, **node.kwargs)
-        return dx
+        Parameters
+        ----------
+        sources : tp.Iterable[Variable]
+            Source variables.
+        target : Variable
+            Target variable.
 
-    @staticmethod
-    def _postprocess_nan_and_type(dx, x):
-        if np.any(np.isnan(x)):
-            dx = np.where(np.isnan(x), config.dtype(0), dx)
-        if _isscalar(x) and not _isscalar(dx):
-            dx = np.take(dx, 0)
-        return dx
+        Returns
+        -------
+        tp.Tuple[tp.List[int], tp.Set[int]]
+            Indices of nodes that depend on any of the sources and that the
+            target depends on, in reverse order of recording, and ids of
+            variables that depend on any of the sources.
+        """
+        depending_ids = set(id(s) for s in sources)
+        descendants = set()
+        stack = list(depending_ids)
+        while stack:
+            for i in self._node_list.consumers(stack.pop()):
+                if i in descendants:
+                    continue
+                descendants.add(i)
+                for r in _variables_in(self._node_list.result(i)):
+                    depending_ids.add(id(r))
+                    stack.append(id(r))
 
-    @classmethod
-    def _accumulate_grad(cls, id2grad: dict, dx, x):
-        if isinstance(dx, (tuple, list)) and isinstance(x, (tuple, list)):
-            for x_, dx_ in zip(x, dx):
-                if isinstance(x_, Variable):
-                    cls._accumulate_grad(id2grad, dx_, x_)
-        else:
-            dx = cls._postprocess_nan_and_type(dx, x)
-            if id(x) in id2grad:
-                id2grad[id(x)] = id2grad[id(x)] + dx
-            else:
-                id2grad[id(x)] = dx
+        indices = set()
+        stack = [id(target)]
+        while stack:
+            i = self._node_list.producer(stack.pop())
+            if i is None or i in indices or i not in descendants:
+                continue
+            indices.add(i)
+            for x in self._node_list[i].inputs:
+                stack.extend(
+                    id(v) for v in _variables_in(x)
+                    if id(v) in depending_ids)
+        return sorted(indices, reverse=True), depending_ids
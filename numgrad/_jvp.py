@@ -0,0 +1,191 @@
+from collections.abc import Iterable
+import typing as tp
+import weakref
+
+import numpy as np
+
+from numgrad._backward_plan import _unwrap
+from numgrad._config import config
+from numgrad._graph import Graph, Node
+from numgrad._variable import _ndarray_kwargs, Variable
+
+
+def _bind_jvp(forward: callable, *jvps: callable):
+    if len(jvps) == 1 and isinstance(jvps[0], Iterable):
+        config._func2jvps[forward] = jvps[0]
+    else:
+        config._func2jvps[forward] = jvps
+
+
+def _linear_jvp(forward: callable) -> callable:
+    # Functions linear in their first argument push tangents forward as is.
+    return lambda t, r, x, *args, **kwargs: forward(t, *args, **kwargs)
+
+
+def _add_tangents(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if isinstance(a, (tuple, list)):
+        return tuple(_add_tangents(a_, b_) for a_, b_ in zip(a, b))
+    return a + b
+
+
+def _broadcast_tangent(t, r):
+    if np.shape(t) == np.shape(r):
+        return t
+    return t + np.zeros(np.shape(r), dtype=r.dtype)
+
+
+def _check_type_of_value(value):
+    # Arrays are returned by functions not recorded, e.g. without JVPs.
+    if isinstance(value, tuple):
+        for v in value:
+            _check_type_of_value(v)
+    elif not isinstance(value, Variable):
+        raise TypeError(
+            'Value of forward function of `numgrad.jvp()` must be an '
+            f'instance of `ng.Variable` or tuple of them, not {type(value)}')
+
+
+class _JVPTrace(Graph):
+    """Graph that pushes tangents forward instead of recording nodes.
+
+    Tangents are kept only as long as the variables they belong to, so that
+    nothing is retained for backward computation.
+    """
+
+    def __init__(self):
+        """Construct trace of tangents."""
+        super().__init__(_allow_multiple_graphs=True)
+        self._tangents: tp.Dict[int, tuple] = {}
+
+    def _set_tangent(self, v: Variable, tangent):
+        key = id(v)
+        self._tangents[key] = (
+            weakref.ref(v, lambda _: self._tangents.pop(key, None)),
+            tangent,
+        )
+
+    def _get_tangent(self, x):
+        if isinstance(x, Variable):
+            return self._tangents.get(id(x), (None, None))[1]
+        if isinstance(x, (tuple, list)):
+            tangents = tuple(self._get_tangent(a) for a in x)
+            if all(t is None for t in tangents):
+                return None
+            return tuple(
+                np.zeros(np.shape(a), dtype=config.dtype) if t is None else t
+                for t, a in zip(tangents, x)
+            )
+        return None
+
+    def _register_node(self, node: Node):
+        tangents = tuple(self._get_tangent(x) for x in node.inputs)
+        if all(t is None for t in tangents):
+            if any(
+                self._get_tangent(v) is not None for v in node.kwargs.values()
+            ):
+                raise NotImplementedError(
+                    f'Cannot push tangents forward through {node.function} '
+                    'from its keyword arguments.')
+            return
+        if node.function not in config._func2jvps:
+            raise NotImplementedError(
+                f'Cannot push tangents forward through {node.function}, '
+                'JVP of the function is not registered yet.')
+        result = node.result
+        # JVPs are computed with arrays unless they need to be recorded for
+        # higher-order derivatives.
+        if self._parent_graph is None:
+            node = node._replace(
+                result=_unwrap(node.result),
+                inputs=tuple(_unwrap(x) for x in node.inputs),
+                kwargs=_ndarray_kwargs(**node.kwargs),
+            )
+        graph = config._graph
+        config._graph = self._parent_graph
+        try:
+            dy = None
+            num_jvps = 0
+            for t, jvp in zip(tangents, config._func2jvps[node.function]):
+                num_jvps += 1
+                if t is not None:
+                    dy = _add_tangents(
+                        dy, jvp(t, node.result, *node.inputs, **node.kwargs))
+            if any(t is not None for t in tangents[num_jvps:]):
+                raise NotImplementedError(
+                    f'Cannot push tangents forward through {node.function} '
+                    f'from its argument at position {num_jvps} or later.')
+            if isinstance(result, tuple):
+                for r, t in zip(result, dy):
+                    if isinstance(r, Variable) and t is not None:
+                        self._set_tangent(r, _broadcast_tangent(t, r))
+            elif dy is not None:
+                self._set_tangent(result, _broadcast_tangent(dy, result))
+        finally:
+            config._graph = graph
+
+
+def jvp(
+    forward_func: callable,
+    primals: tp.Sequence,
+    tangents: tp.Sequence,
+) -> tuple:
+    """Return value of a function and its derivative along given tangents.
+
+    Tangents are pushed forward along with the computation of the function,
+    which is not recorded into a graph. A single call gives the derivative
+    of all the outputs along the tangents, which is cheaper than reverse mode
+    for functions with fewer inputs than outputs.
+
+    Parameters
+    ----------
+    forward_func : callable
+        Input forward function.
+    primals : tp.Sequence
+        Positional arguments to pass to the forward function.
+    tangents : tp.Sequence
+        Tangent vectors of each positional argument with the same shapes.
+
+    Returns
+    -------
+    tuple
+        Resulting value of the forward function and its derivative along the
+        tangents, namely Jacobian-vector product.
+
+    Examples
+    --------
+    >>> jvp(np.sin, (0.,), (2.,))
+    (np.float64(0.0), np.float64(2.0))
+    >>> jvp(lambda a, b: a * b, ([1., 2.], [3., 4.]), ([1., 0.], [0., 1.]))
+    (array([3., 8.]), array([3., 2.]))
+    """
+    if len(primals) != len(tangents):
+        raise ValueError(
+            f'Number of tangents {len(tangents)} must be the same as the '
+            f'number of primals {len(primals)}')
+    primals = tuple(
+        p if isinstance(p, Variable) else Variable(p) for p in primals)
+    tangents = tuple(
+        t if isinstance(t, Variable) else np.asarray(t, dtype=config.dtype)
+        for t in tangents
+    )
+    for p, t in zip(primals, tangents):
+        if p.shape != t.shape:
+            raise ValueError(
+                f'Incompatible shape of tangent {t.shape} with the shape of '
+                f'its primal {p.shape}')
+    with _JVPTrace() as trace:
+        for p, t in zip(primals, tangents):
+            trace._set_tangent(p, t)
+        value = forward_func(*primals)
+    _check_type_of_value(value)
+    tangent = trace._get_tangent(value)
+    if tangent is None:
+        # Computed only from variables other than the primals.
+        tangent = np.zeros(np.shape(value), dtype=config.dtype)
+    if config._graph is None:
+        value = _unwrap(value)
+    return value, tangent
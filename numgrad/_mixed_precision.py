@@ -0,0 +1,123 @@
+import numpy as np
+import numpy.typing as npt
+
+from numgrad._variable import Variable
+
+
+class _Overflow(FloatingPointError):
+    """Raised when a cotangent overflows its storage type."""
+
+
+def _overflows(a, dtype: np.dtype) -> bool:
+    # Whether finite values of array are out of range of the data type,
+    # checked in its own precision faster than in the lower one.
+    if np.size(a) == 0:
+        return False
+    low, high = np.min(a), np.max(a)
+    limit = np.finfo(dtype).max
+    return bool(
+        np.isfinite(low) and np.isfinite(high)
+        and (low < -limit or high > limit))
+
+
+class MixedPrecision(object):
+    """Precision policy to store arrays retained by graphs in half precision.
+
+    Results recorded into a graph with this policy are stored in
+    `storage_dtype` unless they would overflow and computed with in
+    `accumulation_dtype`. So are cotangents in its backward computation,
+    while gradients with respect to the sources are kept in the latter.
+    Cotangents are multiplied by a loss scale not to underflow the storage
+    type. The scale is halved and backward computation is done again when a
+    cotangent overflows, and doubled after `growth_interval` backward
+    computations without overflow.
+
+    Examples
+    --------
+    >>> policy = ng.MixedPrecision()
+    >>> x = ng.Variable([1., 2.])
+    >>> with ng.Graph(precision=policy) as g:
+    ...     h = np.exp(x)
+    ...     y = np.sum(h * h)
+    ...
+    >>> h.dtype
+    dtype('float16')
+    >>> dx = g.backward(y, x)
+    >>> dx.dtype
+    dtype('float32')
+    >>> np.allclose(dx, 2 * np.exp(2 * x), rtol=1e-2)
+    True
+    """
+
+    def __init__(
+        self,
+        storage_dtype: npt.DTypeLike = np.float16,
+        accumulation_dtype: npt.DTypeLike = np.float32,
+        *,
+        loss_scale: float = 2. ** 15,
+        growth_interval: int = 2000,
+        min_loss_scale: float = 1.,
+    ):
+        """Construct precision policy.
+
+        Parameters
+        ----------
+        storage_dtype : npt.DTypeLike, optional
+            Floating point type to store results and cotangents in, by
+            default np.float16.
+        accumulation_dtype : npt.DTypeLike, optional
+            Floating point type to compute and sum cotangents in, by default
+            np.float32.
+        loss_scale : float, optional
+            Initial scale of cotangents, by default 2 ** 15.
+        growth_interval : int, optional
+            Number of backward computations without overflow to double the
+            scale after, by default 2000.
+        min_loss_scale : float, optional
+            Scale not to be halved below, by default 1. Cotangents
+            overflowing with this scale are kept in the accumulation type.
+        """
+        self.storage_dtype = np.dtype(storage_dtype)
+        self.accumulation_dtype = np.dtype(accumulation_dtype)
+        for dtype in (self.storage_dtype, self.accumulation_dtype):
+            if dtype.kind != 'f':
+                raise ValueError(
+                    'Data type of precision policy must be floating point '
+                    f'type, not {dtype}')
+        if self.storage_dtype.itemsize > self.accumulation_dtype.itemsize:
+            raise ValueError(
+                f'Storage type {self.storage_dtype} must not be more precise '
+                f'than accumulation type {self.accumulation_dtype}')
+        self.loss_scale = float(loss_scale)
+        self.growth_interval = growth_interval
+        self.min_loss_scale = float(min_loss_scale)
+        self._num_steps_without_overflow = 0
+
+    def _update(self, overflow: bool):
+        if overflow:
+            self.loss_scale = max(self.loss_scale / 2, self.min_loss_scale)
+            self._num_steps_without_overflow = 0
+            return
+        self._num_steps_without_overflow += 1
+        if self._num_steps_without_overflow >= self.growth_interval:
+            self.loss_scale *= 2
+            self._num_steps_without_overflow = 0
+
+    def _store(self, result):
+        # Results are converted in-place, which are new variables yet to be
+        # returned to the caller.
+        if isinstance(result, tuple):
+            for r in result:
+                self._store(r)
+            return
+        if not isinstance(result, Variable):
+            return
+        data = result._data
+        if (
+            not isinstance(data, (np.ndarray, np.generic))
+            or data.dtype.itemsize <= self.storage_dtype.itemsize
+        ):
+            return
+        if not _overflows(data, self.storage_dtype):
+            result._data = data.astype(self.storage_dtype)
+            result._compute_dtype = self.accumulation_dtype
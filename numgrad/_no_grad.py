@@ -0,0 +1,33 @@
+import contextlib
+
+from numgrad._config import config
+
+
+@contextlib.contextmanager
+def no_grad():
+    """Return context in which computation is not recorded into graphs.
+
+    Operations with variables in the context return arrays as they do out of
+    graphs, without paying for recording, e.g. to evaluate a model while
+    its graph is under construction. Graphs constructed inside the context
+    record computation as usual. It can also decorate functions.
+
+    Examples
+    --------
+    >>> x = ng.Variable([1., 2.])
+    >>> with ng.Graph() as g:
+    ...     with ng.no_grad():
+    ...         y = np.exp(x)
+    ...     z = np.exp(x)
+    ...
+    >>> type(y), type(z)
+    (<class 'numpy.ndarray'>, <class 'numgrad.Variable'>)
+    >>> len(g._node_list)
+    1
+    """
+    graph = config._graph
+    config._graph = None
+    try:
+        yield
+    finally:
+        config._graph = graph
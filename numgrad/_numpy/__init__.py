@@ -1,27 +1,31 @@
 from numgrad._numpy import (  # noqa: F401, I101
     # https://numpy.org/doc/stable/reference/arrays.ndarray.html
     _ndarray,
+)
+
 
+# Modules registering VJPs, which are imported on first use of graphs.
+_vjp_modules = (
     # https://numpy.org/doc/stable/reference/routines.array-creation.html
-    _array_creation,
+    'numgrad._numpy._array_creation',
 
     # https://numpy.org/doc/stable/reference/routines.array-manipulation.html
-    _array_manipulation,
+    'numgrad._numpy._array_manipulation',
 
     # https://numpy.org/doc/stable/reference/routines.linalg.html
-    _linalg,
+    'numgrad._numpy._linalg',
 
     # https://numpy.org/doc/stable/reference/routines.math.html
-    _mathematical,
+    'numgrad._numpy._mathematical',
 
     # https://numpy.org/doc/stable/reference/random/index.html
-    _random,
+    'numgrad._numpy._random',
 
     # https://numpy.org/doc/stable/reference/routines.sort.html
-    _sorting_searching_counting,
+    'numgrad._numpy._sorting_searching_counting',
 
     # https://numpy.org/doc/stable/reference/routines.statistics.html
-    _statistics,
+    'numgrad._numpy._statistics',
 )
 
 
@@ -2,6 +2,8 @@
 
 import numpy as np
 
+from numgrad._batching import _BatchedArray, _bind_batch_rule
+from numgrad._jvp import _bind_jvp, _linear_jvp
 from numgrad._vjp import _bind_vjp
 
 
@@ -47,3 +49,12 @@ _bind_vjp(
         else np.sum(g[:, :-1] * r[:, 1:] * range(1, n)[::-1], -1),
     )[1],
 )
+
+for _f in (np.diag, np.diagflat, np.tril, np.triu):
+    _bind_jvp(_f, _linear_jvp(_f))
+for _f in (np.tril, np.triu):
+    _bind_batch_rule(
+        _f,
+        lambda m, k=0, *, _f=_f: _BatchedArray(_f(m._data, k))
+        if m.ndim >= 2 else NotImplemented,
+    )
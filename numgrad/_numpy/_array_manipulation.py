@@ -2,6 +2,10 @@
 
 import numpy as np
 
+from numgrad._batching import (
+    _align, _batch_size, _BatchedArray, _bind_batch_rule, _shift_axis,
+)
+from numgrad._jvp import _bind_jvp, _linear_jvp
 from numgrad._utils._to_array import _to_array
 from numgrad._utils._unbroadcast import _unbroadcast_to
 from numgrad._variable import Variable
@@ -16,6 +20,47 @@ _atleast_nd_vjp_iterator = _VJPIterator(
 )
 
 
+def _atleast_nd_jvp_iterator(atleast_nd: callable) -> _VJPIterator:
+    return _VJPIterator(
+        lambda t, r, *arys, _nth: atleast_nd(t) if len(arys) == 1 else tuple(
+            atleast_nd(t) if i == _nth else None for i in range(len(arys))),
+    )
+
+
+def _reshape_batch_rule(a, shape=None, order=None, *, newshape=None):
+    shape = shape if newshape is None else newshape
+    if order not in (None, 'C'):
+        return NotImplemented
+    shape = (shape,) if np.ndim(shape) == 0 else tuple(shape)
+    return _BatchedArray(np.reshape(a._data, a._data.shape[:1] + shape))
+
+
+def _atleast_nd_batch_rule(forward: callable, ndim: int) -> callable:
+
+    def expand(a):
+        if not isinstance(a, _BatchedArray):
+            return forward(a)
+        if a.ndim >= ndim:
+            return a
+        return _reshape_batch_rule(a, (1,) * (ndim - a.ndim) + a.shape)
+
+    def rule(*arys):
+        if len(arys) == 1:
+            return expand(arys[0])
+        return tuple(expand(a) for a in arys)
+
+    return rule
+
+
+def _stack_batch(arrays) -> list:
+    size = _batch_size(arrays)
+    return [
+        a._data if isinstance(a, _BatchedArray)
+        else np.broadcast_to(a, (size,) + np.shape(a))
+        for a in arrays
+    ]
+
+
 # https://numpy.org/doc/stable/reference/routines.array-manipulation.html#changing-array-shape
 _bind_vjp(
     np.reshape,
@@ -25,8 +70,13 @@ _bind_vjp(
     np.ravel,
     lambda g, r, x, order=None: g.reshape(*x.shape, order=order),
 )
-Variable.flatten = custom_vjp(
-    lambda g, r, x: g.reshape(x.shape))(lambda a: a.flatten())
+
+
+def _flatten(a):
+    return a.flatten()
+
+
+Variable.flatten = custom_vjp(lambda g, r, x: g.reshape(x.shape))(_flatten)
 Variable.flatten.__doc__ = np.ndarray.flatten.__doc__
 
 
@@ -145,3 +195,97 @@ _bind_vjp(np.flipud, lambda g, r, m: np.flipud(g))
 _bind_vjp(np.roll, lambda g, r, a, shift, axis=None: np.roll(
     g, -shift if isinstance(shift, int) else [-s for s in shift], axis))
 _bind_vjp(np.rot90, lambda g, r, m, k=1, axes=(0, 1): np.rot90(g, -k, axes))
+
+# Functions linear in their first argument, including sequences of arrays.
+for _f in (
+    np.reshape, np.ravel, _flatten,
+    np.moveaxis, np.swapaxes, np.transpose,
+    np.broadcast_to, np.expand_dims, np.squeeze, np.asarray, np.asanyarray,
+    np.concatenate, np.stack, np.vstack, np.hstack, np.dstack,
+    np.column_stack,
+    np.split, np.array_split, np.dsplit, np.hsplit, np.vsplit,
+    np.flip, np.fliplr, np.flipud, np.roll, np.rot90,
+):
+    _bind_jvp(_f, _linear_jvp(_f))
+for _f in (np.atleast_1d, np.atleast_2d, np.atleast_3d):
+    _bind_jvp(_f, _atleast_nd_jvp_iterator(_f))
+_bind_jvp(
+    np.broadcast_arrays,
+    _VJPIterator(
+        lambda t, r, *args, _nth: tuple(
+            np.broadcast_to(t, np.shape(r_)) if i == _nth else None
+            for i, r_ in enumerate(r)
+        ),
+    ),
+)
+
+_bind_batch_rule(np.reshape, _reshape_batch_rule)
+_bind_batch_rule(np.atleast_1d, _atleast_nd_batch_rule(np.atleast_1d, 1))
+_bind_batch_rule(np.atleast_2d, _atleast_nd_batch_rule(np.atleast_2d, 2))
+for _f in (np.asarray, np.asanyarray):
+    _bind_batch_rule(
+        _f,
+        lambda a, dtype=None, *args, **kwargs: a if dtype is None else (
+            a.astype(dtype)),
+    )
+_bind_batch_rule(
+    np.ravel,
+    lambda a, order='C': _reshape_batch_rule(a, -1, order),
+)
+_bind_batch_rule(
+    np.transpose,
+    lambda a, axes=None: _BatchedArray(np.transpose(a._data, (0,) + (
+        tuple(range(a.ndim, 0, -1)) if axes is None
+        else tuple(ax % a.ndim + 1 for ax in axes)
+    ))),
+)
+_bind_batch_rule(
+    np.swapaxes,
+    lambda a, axis1, axis2: _BatchedArray(np.swapaxes(
+        a._data, _shift_axis(axis1, a.ndim), _shift_axis(axis2, a.ndim))),
+)
+_bind_batch_rule(
+    np.moveaxis,
+    lambda a, source, destination: _BatchedArray(np.moveaxis(
+        a._data,
+        _shift_axis(source, a.ndim),
+        _shift_axis(destination, a.ndim),
+    )),
+)
+_bind_batch_rule(
+    np.expand_dims,
+    lambda a, axis: _BatchedArray(
+        np.expand_dims(a._data, _shift_axis(axis, a.ndim))),
+)
+_bind_batch_rule(
+    np.squeeze,
+    lambda a, axis=None: _BatchedArray(np.squeeze(
+        a._data,
+        tuple(i + 1 for i, n in enumerate(a.shape) if n == 1)
+        if axis is None else _shift_axis(axis, a.ndim),
+    )),
+)
+_bind_batch_rule(
+    np.broadcast_to,
+    lambda array, shape: (
+        shape := (shape,) if np.ndim(shape) == 0 else tuple(shape),
+        _BatchedArray(np.broadcast_to(
+            _align((array,), len(shape))[0], (_batch_size(array),) + shape)),
+    )[-1],
+)
+_bind_batch_rule(
+    np.concatenate,
+    lambda arrays, axis=0: NotImplemented if axis is None else _BatchedArray(
+        np.concatenate(
+            _stack_batch(arrays), _shift_axis(axis, np.ndim(arrays[0])))),
+)
+_bind_batch_rule(
+    np.stack,
+    lambda arrays, axis=0: _BatchedArray(np.stack(
+        _stack_batch(arrays), _shift_axis(axis, np.ndim(arrays[0]) + 1))),
+)
+_bind_batch_rule(
+    np.flip,
+    lambda m, axis=None: _BatchedArray(
+        np.flip(m._data, _shift_axis(axis, m.ndim))),
+)
@@ -2,6 +2,8 @@
 
 import numpy as np
 
+from numgrad._batching import _align, _BatchedArray, _bind_batch_rule
+from numgrad._jvp import _bind_jvp, _linear_jvp
 from numgrad._vjp import _bind_vjp
 
 
@@ -18,7 +20,7 @@ def _dot_1d_1d_vjp_b(g, r, a, b):
 
 
 def _dot_1d_nd_vjp_a(g, r, a, b):
-    return (g[..., None, :] * b).sum(-1)
+    return (b @ g[..., None])[..., 0]
 
 
 def _dot_1d_nd_vjp_b(g, r, a, b):
@@ -48,18 +50,6 @@ def _dot_nd_nd_vjp_b(g, r, a, b):
     )
 
 
-def _dot_vjp_a(g, r, a, b):
-    adim = 'n' if (a.ndim > 1) else '1'
-    bdim = 'n' if (b.ndim > 1) else '1'
-    return eval(f'_dot_{adim}d_{bdim}d_vjp_a')(g, r, a, b)
-
-
-def _dot_vjp_b(g, r, a, b):
-    adim = 'n' if (a.ndim > 1) else '1'
-    bdim = 'n' if (b.ndim > 1) else '1'
-    return eval(f'_dot_{adim}d_{bdim}d_vjp_b')(g, r, a, b)
-
-
 def _inner_1d_nd_vjp_a(g, r, a, b):
     return g[..., None] * b
 
@@ -77,22 +67,6 @@ def _inner_nd_nd_vjp_b(g, r, a, b):
         g, a, [range(-a.ndim - b.ndim + 2, -b.ndim + 1), range(a.ndim - 1)])
 
 
-def _inner_vjp_a(g, r, a, b):
-    _inner_1d_1d_vjp_a = _dot_1d_1d_vjp_a  # noqa: F841
-    _inner_nd_1d_vjp_a = _dot_nd_1d_vjp_a  # noqa: F841
-    adim = 'n' if (a.ndim > 1) else '1'
-    bdim = 'n' if (b.ndim > 1) else '1'
-    return eval(f'_inner_{adim}d_{bdim}d_vjp_a')(g, r, a, b)
-
-
-def _inner_vjp_b(g, r, a, b):
-    _inner_1d_1d_vjp_b = _dot_1d_1d_vjp_b  # noqa: F841
-    _inner_nd_1d_vjp_b = _dot_nd_1d_vjp_b  # noqa: F841
-    adim = 'n' if (a.ndim > 1) else '1'
-    bdim = 'n' if (b.ndim > 1) else '1'
-    return eval(f'_inner_{adim}d_{bdim}d_vjp_b')(g, r, a, b)
-
-
 def _matmul_nd_nd_vjp_a(g, r, a, b):
     return g @ _t(b)
 
@@ -101,22 +75,92 @@ def _matmul_nd_nd_vjp_b(g, r, a, b):
     return _t(a) @ g
 
 
-def _matmul_vjp_a(g, r, a, b):
-    _matmul_1d_1d_vjp_a = _dot_1d_1d_vjp_a  # noqa: F841
-    _matmul_1d_nd_vjp_a = _dot_1d_nd_vjp_a  # noqa: F841
-    _matmul_nd_1d_vjp_a = _dot_nd_1d_vjp_a  # noqa: F841
-    adim = 'n' if (a.ndim > 1) else '1'
-    bdim = 'n' if (b.ndim > 1) else '1'
-    return eval(f'_matmul_{adim}d_{bdim}d_vjp_a')(g, r, a, b)
+def _bilinear_jvps(forward: callable) -> tuple:
+    return (
+        lambda t, r, a, b: forward(t, b),
+        lambda t, r, a, b: forward(a, t),
+    )
 
 
-def _matmul_vjp_b(g, r, a, b):
-    _matmul_1d_1d_vjp_b = _dot_1d_1d_vjp_b  # noqa: F841
-    _matmul_1d_nd_vjp_b = _dot_1d_nd_vjp_b  # noqa: F841
-    _matmul_nd_1d_vjp_b = _dot_nd_1d_vjp_b  # noqa: F841
-    adim = 'n' if (a.ndim > 1) else '1'
-    bdim = 'n' if (b.ndim > 1) else '1'
-    return eval(f'_matmul_{adim}d_{bdim}d_vjp_b')(g, r, a, b)
+def _cholesky_jvp(t, r, a):
+    # dL = L phi(L^-1 dA L^-T) where phi takes the lower triangle with the
+    # diagonal halved, with dA symmetrized as in the VJP.
+    s = np.linalg.solve(r, _t(np.linalg.solve(r, 0.5 * (t + _t(t)))))
+    return r @ (np.tril(s, -1) + 0.5 * s * np.eye(s.shape[-1]))
+
+
+def _solve_jvp_a(t, r, a, b):
+    # dx = -A^-1 dA x, where x of vector b is regarded as a column.
+    if b.ndim == 1:
+        return -np.linalg.solve(a, t @ r[..., None])[..., 0]
+    return -np.linalg.solve(a, t @ r)
+
+
+def _matmul_batch_rule(a, b):
+    # Vectors are regarded as matrices so that batch axes are broadcast.
+    a_vector, b_vector = np.ndim(a) == 1, np.ndim(b) == 1
+    a = np.expand_dims(a, 0) if a_vector else a
+    b = np.expand_dims(b, -1) if b_vector else b
+    r = np.matmul(*_align((a, b), max(np.ndim(a), np.ndim(b))))
+    return _BatchedArray(np.squeeze(
+        r, (-2,) * a_vector + (-1,) * b_vector) if a_vector or b_vector else r)
+
+
+def _solve_batch_rule(a, b):
+    vector = np.ndim(b) == 1
+    b = np.expand_dims(b, -1) if vector else b
+    x = np.linalg.solve(*_align((a, b)))
+    return _BatchedArray(x[..., 0] if vector else x)
+
+
+def _dispatch_by_rank(vjps: dict) -> callable:
+
+    def specialize(r, a, b):
+        return vjps[(a.ndim > 1, b.ndim > 1)]
+
+    def vjp(g, r, a, b):
+        return specialize(r, a, b)(g, r, a, b)
+
+    vjp._specialize = specialize
+    return vjp
+
+
+_dot_vjp_a = _dispatch_by_rank({
+    (False, False): _dot_1d_1d_vjp_a,
+    (False, True): _dot_1d_nd_vjp_a,
+    (True, False): _dot_nd_1d_vjp_a,
+    (True, True): _dot_nd_nd_vjp_a,
+})
+_dot_vjp_b = _dispatch_by_rank({
+    (False, False): _dot_1d_1d_vjp_b,
+    (False, True): _dot_1d_nd_vjp_b,
+    (True, False): _dot_nd_1d_vjp_b,
+    (True, True): _dot_nd_nd_vjp_b,
+})
+_inner_vjp_a = _dispatch_by_rank({
+    (False, False): _dot_1d_1d_vjp_a,
+    (False, True): _inner_1d_nd_vjp_a,
+    (True, False): _dot_nd_1d_vjp_a,
+    (True, True): _inner_nd_nd_vjp_a,
+})
+_inner_vjp_b = _dispatch_by_rank({
+    (False, False): _dot_1d_1d_vjp_b,
+    (False, True): _inner_1d_nd_vjp_b,
+    (True, False): _dot_nd_1d_vjp_b,
+    (True, True): _inner_nd_nd_vjp_b,
+})
+_matmul_vjp_a = _dispatch_by_rank({
+    (False, False): _dot_1d_1d_vjp_a,
+    (False, True): _dot_1d_nd_vjp_a,
+    (True, False): _dot_nd_1d_vjp_a,
+    (True, True): _matmul_nd_nd_vjp_a,
+})
+_matmul_vjp_b = _dispatch_by_rank({
+    (False, False): _dot_1d_1d_vjp_b,
+    (False, True): _dot_1d_nd_vjp_b,
+    (True, False): _dot_nd_1d_vjp_b,
+    (True, True): _matmul_nd_nd_vjp_b,
+})
 
 
 # https://numpy.org/doc/stable/reference/routines.linalg.html#matrix-and-vector-products
@@ -184,3 +228,34 @@ _bind_vjp(
     np.linalg.inv,
     lambda g, r, a: -_t(np.linalg.solve(a, _t(np.linalg.solve(_t(a), g)))),
 )
+
+
+for _f in (np.dot, np.vdot, np.inner, np.outer, np.matmul):
+    _bind_jvp(_f, *_bilinear_jvps(_f))
+_bind_jvp(np.linalg.cholesky, _cholesky_jvp)
+_bind_jvp(
+    np.linalg.det,
+    lambda t, r, a: r * np.trace(np.linalg.solve(a, t), axis1=-2, axis2=-1),
+)
+_bind_jvp(
+    np.linalg.slogdet,
+    lambda t, r, a: (
+        None, np.trace(np.linalg.solve(a, t), axis1=-2, axis2=-1)),
+)
+_bind_jvp(np.trace, _linear_jvp(np.trace))
+_bind_jvp(
+    np.linalg.solve,
+    _solve_jvp_a,
+    lambda t, r, a, b: np.linalg.solve(a, t),
+)
+_bind_jvp(np.linalg.inv, lambda t, r, a: -r @ t @ r)
+
+_bind_batch_rule(np.matmul, _matmul_batch_rule)
+_bind_batch_rule(
+    np.dot,
+    lambda a, b: _matmul_batch_rule(a, b)
+    if 1 <= np.ndim(a) <= 2 and 1 <= np.ndim(b) <= 2 else NotImplemented,
+)
+_bind_batch_rule(np.linalg.solve, _solve_batch_rule)
+for _f in (np.linalg.inv, np.linalg.det, np.linalg.cholesky):
+    _bind_batch_rule(_f, lambda a, *, _f=_f: _BatchedArray(_f(a._data)))
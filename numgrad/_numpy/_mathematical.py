@@ -5,6 +5,11 @@ from functools import partial
 import numpy as np
 from numpy.lib.stride_tricks import as_strided
 
+from numgrad._batching import (
+    _BatchedArray, _bind_batch_rule, _reduction_rule, _shift_axis,
+)
+from numgrad._config import config
+from numgrad._jvp import _bind_jvp, _linear_jvp
 from numgrad._utils._expand_to import _expand_to
 from numgrad._utils._unbroadcast import _unbroadcast_to
 from numgrad._vjp import _bind_vjp
@@ -15,6 +20,13 @@ def _prod_vjp(g, r, a, axis=None, *, keepdims=False, _prod=np.prod):
         r if keepdims else _prod(a, axis, keepdims=True)) / a
 
 
+def _prod_jvp(
+    t, r, a, axis=None, *, keepdims=False, _prod=np.prod, _sum=np.sum,
+):
+    return _sum(
+        t * _prod(a, axis, keepdims=True) / a, axis, keepdims=keepdims)
+
+
 def _sum_vjp(g, a, axis=None, *, keepdims=False):
     return _expand_to(g, a.shape, axis, keepdims)
 
@@ -31,6 +43,10 @@ def _cumprod_vjp(g, r, a, axis=None):
     return _cumulate_inversely(np.cumsum, g * r, axis) / a
 
 
+def _cumprod_jvp(t, r, a, axis=None):
+    return r * np.cumsum(np.where(np.isnan(a), 0, t / a), axis)
+
+
 def _cumsum_vjp(g, r, a, axis=None):
     if a.ndim == 0:
         return g
@@ -63,6 +79,14 @@ def _diff_vjp_append(g, r, a, n=1, axis=-1, prepend=None, append=None):
         range(g.shape[axis] - prepend.shape[axis], g.shape[axis]), axis)
 
 
+def _diff_jvp(t, r, a, n=1, axis=-1, prepend=None, append=None):
+    # Positional `n` and `axis` are recorded as floating point numbers.
+    return np.diff(t, int(n), int(axis), **{
+        k: np.zeros(np.shape(v)) for k, v in (
+            ('prepend', prepend), ('append', append)) if v is not None
+    })
+
+
 def _ediff1d_vjp(g, r, ary, to_end=None, to_begin=None):
     if to_end is None and to_begin is None:
         return -np.diff(g, append=0, prepend=0)
@@ -73,6 +97,13 @@ def _ediff1d_vjp(g, r, ary, to_end=None, to_begin=None):
     return -np.diff(g[s], append=0, prepend=0)
 
 
+def _reduce_finding_jvp(t, r, a, axis=None, *, keepdims=False):
+    return np.sum(
+        np.where(a == _expand_to(r, a.ndim, axis, keepdims), t, 0),
+        axis, keepdims=keepdims,
+    )
+
+
 def _reduce_finding_vjp(g, r, a, axis=None, *, keepdims=False):
     return np.where(
         a == _expand_to(r, a.ndim, axis, keepdims),
@@ -181,10 +212,10 @@ _bind_vjp(
 )
 
 # https://numpy.org/doc/stable/reference/routines.math.html#arithmetic-operations
-_bind_vjp(np.add, lambda g, *_: +g, lambda g, *_: +g)
+_bind_vjp(np.add, lambda *_: 1, lambda *_: 1)
 _bind_vjp(np.reciprocal, lambda r, _: -(r ** 2))
-_bind_vjp(np.positive, lambda g, _: +g)
-_bind_vjp(np.negative, lambda g, _: -g)
+_bind_vjp(np.positive, lambda _: 1)
+_bind_vjp(np.negative, lambda _: -1)
 _bind_vjp(np.multiply, lambda x1, x2: x2, lambda x1, x2: x1)
 _bind_vjp(np.divide, lambda g, x1, x2: g / x2, lambda x1, x2: x1 / -(x2 ** 2))
 _bind_vjp(
@@ -192,14 +223,14 @@ _bind_vjp(
     lambda x1, x2: x2 * x1 ** (x2 - 1),
     lambda r, x1, x2: None if np.any(x1 < 0) else r * np.log(x1),
 )
-_bind_vjp(np.subtract, lambda g, *_: +g, lambda g, *_: -g)
+_bind_vjp(np.subtract, lambda *_: 1, lambda *_: -1)
 _bind_vjp(
     np.float_power,
     lambda x1, x2: x2 * x1 ** (x2 - 1),
     lambda r, x1, x2: None if np.any(x1 < 0) else r * np.log(x1),
 )
-_bind_vjp(np.fmod, lambda g, *_: +g, lambda r, x1, x2: (r - x1) / x2)
-_bind_vjp(np.mod, lambda g, *_: +g, lambda r, x1, x2: (r - x1) / x2)
+_bind_vjp(np.fmod, lambda *_: 1, lambda r, x1, x2: (r - x1) / x2)
+_bind_vjp(np.mod, lambda *_: 1, lambda r, x1, x2: (r - x1) / x2)
 
 # https://numpy.org/doc/stable/reference/routines.math.html#extrema-finding
 _finding_vjp_x1 = lambda g, r, x1, x2: np.where(x1 == r, g, 0)
@@ -229,3 +260,50 @@ _bind_vjp(np.square, lambda x: 2 * x)
 _bind_vjp(np.absolute, lambda x: np.sign(x))
 _bind_vjp(np.fabs, lambda x: np.sign(x))
 _bind_vjp(np.nan_to_num, lambda g, x, *_, **k: np.where(np.isfinite(x), g, 0))
+
+# Element-wise functions other than ufuncs, whose VJPs push tangents forward.
+_bind_jvp(np.clip, *config._func2vjps[np.clip])
+_bind_jvp(np.nan_to_num, *config._func2vjps[np.nan_to_num])
+
+_bind_jvp(np.prod, _prod_jvp)
+_bind_jvp(np.nanprod, partial(_prod_jvp, _prod=np.nanprod, _sum=np.nansum))
+_bind_jvp(np.sum, _linear_jvp(np.sum))
+_bind_jvp(
+    np.nansum,
+    lambda t, r, a, *args, **kwargs: np.sum(
+        np.where(np.isnan(a), 0, t), *args, **kwargs),
+)
+_bind_jvp(np.cumprod, _cumprod_jvp)
+_bind_jvp(np.nancumprod, _cumprod_jvp)
+_bind_jvp(np.cumsum, _linear_jvp(np.cumsum))
+_bind_jvp(
+    np.nancumsum,
+    lambda t, r, a, *args, **kwargs: np.cumsum(
+        np.where(np.isnan(a), 0, t), *args, **kwargs),
+)
+_bind_jvp(np.diff, _diff_jvp)
+_bind_jvp(
+    np.ediff1d,
+    lambda t, r, ary, to_end=None, to_begin=None: np.ediff1d(
+        t,
+        to_end=None if to_end is None else np.zeros(np.shape(to_end)),
+        to_begin=None if to_begin is None else np.zeros(np.shape(to_begin)),
+    ),
+)
+for _f in (np.amax, np.max, np.nanmax, np.amin, np.min, np.nanmin):
+    _bind_jvp(_f, _reduce_finding_jvp)
+_bind_jvp(
+    np.convolve,
+    lambda t, r, a, v, mode='full': np.convolve(t, v, mode),
+    lambda t, r, a, v, mode='full': np.convolve(a, t, mode),
+)
+
+for _f in (
+    np.prod, np.sum, np.nanprod, np.nansum,
+    np.amax, np.max, np.nanmax, np.amin, np.min, np.nanmin,
+):
+    _bind_batch_rule(_f, _reduction_rule(_f))
+for _f in (np.cumsum, np.cumprod, np.nancumsum, np.nancumprod):
+    _bind_batch_rule(_f, lambda a, axis=None, *, _f=_f: _BatchedArray(
+        _f(a._data.reshape(len(a._data), -1), 1) if axis is None
+        else _f(a._data, _shift_axis(axis, a.ndim))))
@@ -2,16 +2,36 @@
 
 import numpy as np
 
+from numgrad._batching import _BatchedArray
+from numgrad._config import config
+from numgrad._jvp import _bind_jvp
+from numgrad._utils._sparse_grad import _scatter_add, _SparseGrad
 from numgrad._variable import Variable
 from numgrad._vjp import custom_vjp
 
 
+# Differentiable with respect to `g` for higher-order derivatives.
+@custom_vjp(lambda g, r, y, shape, dtype, key: g[key])
+def _scatter(y, shape, dtype, key):
+    return _scatter_add(np.zeros_like(y, dtype=dtype, shape=shape), key, y)
+
+
 def _getitem_vjp(g, r, x, key):
-    dx = np.zeros_like(x)
-    dx[key] = g
-    return dx
+    if config._graph is None and not isinstance(g, _BatchedArray):
+        # Gradients of a few elements of large arrays are kept sparse.
+        return _SparseGrad(np.shape(x), x.dtype, ((key, g),))
+    return _scatter(g, np.shape(x), x.dtype, key)
+
 
+def _getitem(a, key):
+    return a[key]
 
-Variable.__getitem__ = custom_vjp(_getitem_vjp)(
-    lambda self, key: self[key])
+
+Variable.__getitem__ = custom_vjp(_getitem_vjp)(_getitem)
 Variable.__getitem__.__doc__ = np.ndarray.__getitem__.__doc__
+
+_bind_jvp(_getitem, lambda t, r, a, key: t[key])
+_bind_jvp(
+    _scatter.__wrapped__,
+    lambda t, r, y, shape, dtype, key: _scatter(t, shape, dtype, key),
+)
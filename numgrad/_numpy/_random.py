@@ -2,6 +2,8 @@
 
 import numpy as np
 
+from numgrad._config import config
+from numgrad._jvp import _bind_jvp
 from numgrad._utils._unbroadcast import _unbroadcast_to
 from numgrad._vjp import _bind_vjp
 
@@ -27,3 +29,11 @@ _bind_vjp(
     lambda g, r, low, high, size=None: g * (r - low) / (high - low),
     module_name='numpy.random', func_name='uniform',
 )
+config._random_functions.update(
+    (np.random.exponential, np.random.normal, np.random.uniform))
+
+_bind_jvp(
+    np.random.exponential, lambda t, r, scale, size=None: t * r / scale)
+# Element-wise with respect to the parameters.
+_bind_jvp(np.random.normal, *config._func2vjps[np.random.normal])
+_bind_jvp(np.random.uniform, *config._func2vjps[np.random.uniform])
@@ -3,6 +3,8 @@
 import numpy as np
 from numpy.lib.stride_tricks import as_strided
 
+from numgrad._batching import _bind_batch_rule, _reduction_rule
+from numgrad._jvp import _bind_jvp, _linear_jvp
 from numgrad._numpy._linalg import _dot_nd_1d_vjp_a, _dot_nd_1d_vjp_b
 from numgrad._utils._expand_to import _expand_to
 from numgrad._vjp import _bind_vjp
@@ -98,3 +100,27 @@ _bind_vjp(
 
 # https://numpy.org/doc/stable/reference/routines.statistics.html#correlating
 _bind_vjp(np.correlate, _correlate_vjp_a, _correlate_vjp_v)
+
+
+_bind_jvp(np.mean, _linear_jvp(np.mean))
+_bind_jvp(
+    np.var,
+    lambda t, r, a, axis=None, *, ddof=0, keepdims=False: np.sum(
+        2 * (a - a.mean(axis, keepdims=True)) * t, axis, keepdims=keepdims,
+    ) / (a.size / np.size(r) - ddof),
+)
+_bind_jvp(
+    np.std,
+    lambda t, r, a, axis=None, *, ddof=0, keepdims=False: (
+        np.zeros(np.shape(r)) if a.size <= 1 else np.sum(
+            (a - a.mean(axis, keepdims=True)) * t, axis, keepdims=keepdims,
+        ) / ((a.size / np.size(r) - ddof) * r)
+    ),
+)
+_bind_jvp(
+    np.correlate,
+    lambda t, r, a, v, mode='valid': np.correlate(t, v, mode),
+    lambda t, r, a, v, mode='valid': np.correlate(a, t, mode),
+)
+
+_bind_batch_rule(np.mean, _reduction_rule(np.mean))
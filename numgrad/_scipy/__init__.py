@@ -1 +1,5 @@
-import numgrad._scipy._special  # noqa: F401
+# Modules registering VJPs, which are imported on first use of graphs after
+# scipy is imported.
+_vjp_modules = (
+    'numgrad._scipy._special',
+)
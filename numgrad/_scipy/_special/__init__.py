@@ -1,6 +1,7 @@
 import numpy as np
 import scipy.special as sp
 
+from numgrad._batching import _BatchedArray, _bind_batch_rule, _shift_axis
 from numgrad._utils._expand_to import _expand_to_if_array
 from numgrad._vjp import _bind_vjp
 
@@ -34,3 +35,19 @@ _bind_vjp(
             a - _expand_to_if_array(r, a.ndim, axis, keepdims)),
     )[-1],
 )
+
+for _f in (sp.softmax, sp.log_softmax):
+    _bind_batch_rule(
+        _f,
+        lambda x, axis=None, *, _f=_f: _BatchedArray(
+            _f(x._data, _shift_axis(axis, x.ndim))),
+    )
+_bind_batch_rule(
+    sp.logsumexp,
+    lambda a, axis=None, b=None, keepdims=False, return_sign=False: (
+        _BatchedArray(sp.logsumexp(
+            a._data, _shift_axis(axis, a.ndim), keepdims=keepdims))
+        if isinstance(a, _BatchedArray) and b is None and not return_sign
+        else NotImplemented
+    ),
+)
@@ -0,0 +1,186 @@
+import typing as tp
+
+import numpy as np
+
+from numgrad._config import config
+from numgrad._grad import _func_to_grad
+from numgrad._graph import Graph
+from numgrad._utils._isscalar import _isscalar
+from numgrad._variable import Variable
+
+
+def _signature(a) -> tp.Hashable:
+    if isinstance(a, (Variable, np.ndarray)):
+        return (type(a), a.shape, a.dtype)
+    if isinstance(a, (tuple, list)):
+        return (type(a),) + tuple(_signature(x) for x in a)
+    if isinstance(a, dict):
+        return (dict,) + tuple((k, _signature(v)) for k, v in a.items())
+    try:
+        hash(a)
+    except TypeError:
+        raise TypeError(
+            'Keyword arguments of a static gradient function must be arrays '
+            f'or hashable objects, not {type(a)}') from None
+    return (type(a), a)
+
+
+def _map_arrays(old, new, id2value: dict):
+    if isinstance(old, np.ndarray):
+        id2value[id(old)] = new
+    elif isinstance(old, (tuple, list)):
+        for o, n in zip(old, new):
+            _map_arrays(o, n, id2value)
+    elif isinstance(old, dict):
+        for k in old:
+            _map_arrays(old[k], new[k], id2value)
+
+
+class _Trace:
+
+    def __init__(self, forward_func: callable, args: tuple, kwargs: dict):
+        self.sources = tuple(Variable(a) for a in args)
+        self.kwargs = kwargs
+        with Graph() as self.graph:
+            self.target = forward_func(*self.sources, **kwargs)
+        if not _isscalar(self.target):
+            raise ValueError('Cannot compute gradient of non-scalar value.')
+
+    def replay(
+        self,
+        args: tuple,
+        kwargs: dict,
+    ) -> tp.Tuple[Graph, Variable, tuple]:
+        id2value = {id(s): Variable(a) for s, a in zip(self.sources, args)}
+        _map_arrays(self.kwargs, kwargs, id2value)
+        graph = self.graph._replay(id2value)
+        target = id2value.get(id(self.target), self.target)
+        sources = tuple(id2value[id(s)] for s in self.sources)
+        # The structure is the same, so is the backward plan.
+        graph._set_plan(
+            target, sources, self.graph._get_plan(self.target, self.sources))
+        return graph, target, sources
+
+
+class _StaticGradFunction:
+
+    def __init__(
+        self,
+        forward_func: callable,
+        return_value: bool,
+        out=None,
+    ):
+        self._forward_func = forward_func
+        self._return_value = return_value
+        self._out = (out,) if isinstance(out, np.ndarray) else out
+        self._traces: tp.Dict[tp.Hashable, _Trace] = {}
+
+    def __call__(self, *args, **kwargs):
+        if len(args) == 0:
+            raise ValueError('Please pass at least one positional argument.')
+        if config._graph is not None:
+            return _func_to_grad(
+                self._forward_func,
+                return_value=self._return_value,
+                force_scalar_output=True,
+                out=self._out,
+            )(*args, **kwargs)
+
+        key = (
+            config.dtype,
+            tuple(np.shape(a) for a in args),
+            _signature(kwargs),
+        )
+        if key in self._traces:
+            graph, value, sources = self._traces[key].replay(args, kwargs)
+        else:
+            trace = _Trace(self._forward_func, args, kwargs)
+            self._traces[key] = trace
+            graph, value, sources = trace.graph, trace.target, trace.sources
+        grads = graph.backward(value, sources, out=self._out)
+        if len(grads) == 1:
+            grads = grads[0]
+        if self._return_value:
+            return (value._data, grads)
+        return grads
+
+
+def static_grad(
+    forward_func: callable,
+    *,
+    out: tp.Union[
+        None, np.ndarray, tp.Sequence[tp.Optional[np.ndarray]]] = None,
+) -> callable:
+    """Return a gradient function that records the forward path only once.
+
+    The forward path is recorded on the first call for each combination of
+    shapes of positional arguments and signatures of keyword arguments. Later
+    calls with the same combination recompute the recorded operations on the
+    new arguments directly, without numpy dispatch or graph construction.
+    Positional arguments are differentiated against, and arrays in keyword
+    arguments are treated as non-differentiable data. Values computed outside
+    of differentiable operations (e.g. `np.argmax` of a variable, or arrays
+    derived from keyword arguments before being passed to differentiable
+    operations) are treated as constants of the recording.
+
+    Parameters
+    ----------
+    forward_func : callable
+        Input forward function. Note that the forward function must return
+        scalar value.
+    out : tp.Union[None, np.ndarray, tp.Sequence[tp.Optional[np.ndarray]]]
+        Preallocated array(s) to write gradients into on every call, by
+        default None. See `numgrad.Graph.backward` for the details.
+
+    Returns
+    -------
+    callable
+        Gradient function that returns gradients of the forward function with
+        respect to given positional arguments.
+
+    Examples
+    --------
+    >>> df = static_grad(lambda a, *, b: np.sum(np.tanh(a) * b))
+    >>> df(np.zeros(2), b=np.array([1., 2.]))
+    array([1., 2.])
+    >>> # replays the recording with the new arrays
+    >>> df(np.ones(2), b=np.array([3., 4.]))  # doctest: +ELLIPSIS
+    array([1.2599..., 1.6798...])
+    """
+    return _StaticGradFunction(forward_func, return_value=False, out=out)
+
+
+def static_value_and_grad(
+    forward_func: callable,
+    *,
+    out: tp.Union[
+        None, np.ndarray, tp.Sequence[tp.Optional[np.ndarray]]] = None,
+) -> callable:
+    """Return a function that returns value and gradients using a recording.
+
+    See `static_grad` on how the forward path is recorded and replayed.
+
+    Parameters
+    ----------
+    forward_func : callable
+        Input forward function. Note that the forward function must return
+        scalar value.
+    out : tp.Union[None, np.ndarray, tp.Sequence[tp.Optional[np.ndarray]]]
+        Preallocated array(s) to write gradients into on every call, by
+        default None. See `numgrad.Graph.backward` for the details.
+
+    Returns
+    -------
+    callable
+        Function that returns the resulting value of the forward function and
+        its gradients with respect to given positional arguments.
+
+    Examples
+    --------
+    >>> f = static_value_and_grad(lambda a, b: np.sum(a * b))
+    >>> f([1, 2], [3, 4])
+    (np.float64(11.0), (array([3., 4.]), array([1., 2.])))
+    >>> f([5, 6], [7, 8])
+    (np.float64(83.0), (array([7., 8.]), array([5., 6.])))
+    """
+    return _StaticGradFunction(forward_func, return_value=True, out=out)
@@ -0,0 +1,168 @@
+from array import array
+from collections import namedtuple
+import struct
+import typing as tp
+
+import numpy as np
+
+from numgrad._variable import Variable
+
+
+Node = namedtuple('Node', ('result', 'function', 'inputs', 'kwargs'))
+
+
+def _value_key(x):
+    # Key of a keyword argument equal only to those of the same type and
+    # value, or None if the argument could be mutated or is not hashable.
+    if isinstance(x, (tuple, list)):
+        keys = tuple(_value_key(a) for a in x)
+        return None if None in keys else (type(x), keys)
+    # Exact bits, which tell zeros of different signs apart.
+    if isinstance(x, np.inexact):
+        return type(x), x.tobytes()
+    if isinstance(x, (float, complex)):
+        return type(x), struct.pack('dd', x.real, x.imag)
+    if (
+        x is None or x is Ellipsis
+        or isinstance(x, (bool, int, str, type, np.dtype))
+        or isinstance(x, (np.number, np.bool_))
+    ):
+        return type(x), x
+    return None
+
+
+def _variables_in(x) -> tp.Tuple[Variable, ...]:
+    if isinstance(x, Variable):
+        return (x,)
+    if isinstance(x, (tuple, list)):
+        return tuple(a for a in x if isinstance(a, Variable))
+    return tuple()
+
+
+class _Tape:
+    """Sequence of nodes stored in columns rather than objects per node.
+
+    Each node is stored as its result, the index of its forward function,
+    the range of its inputs in a flat list, and the index of its keyword
+    arguments, which are shared by nodes with the same ones. Nodes are
+    rebuilt on indexing, whose keyword arguments must not be modified.
+
+    Consumers of variables are linked from the latest one backward through
+    arrays of edges. The latest edge is kept per node for its results, and
+    per variable only for those not produced by the nodes.
+    """
+
+    def __init__(self):
+        self._results: tp.List[tp.Any] = []
+        self._function_ids = array('I')
+        self._functions: tp.List[callable] = []
+        self._function2id: tp.Dict[callable, int] = {}
+        self._inputs: tp.List[tp.Any] = []
+        self._input_offsets = array('Q', [0])
+        self._kwargs_ids = array('I')
+        self._kwargs: tp.List[dict] = [{}]
+        self._key2kwargs_id: tp.Dict[tuple, int] = {}
+        self._id2producer: tp.Dict[int, int] = {}
+        self._last_edges = array('q')
+        self._id2last_edge: tp.Dict[int, int] = {}
+        self._edge_nodes = array('Q')
+        self._edge_previous = array('q')
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __getitem__(self, index: int) -> Node:
+        if index < 0:
+            index += len(self._results)
+        return Node(
+            self._results[index],
+            self._functions[self._function_ids[index]],
+            self.inputs(index),
+            self._kwargs[self._kwargs_ids[index]],
+        )
+
+    def __iter__(self) -> tp.Iterator[Node]:
+        for index in range(len(self._results)):
+            yield self[index]
+
+    def result(self, index: int):
+        return self._results[index]
+
+    def inputs(self, index: int) -> tuple:
+        return tuple(self._inputs[
+            self._input_offsets[index]:self._input_offsets[index + 1]
+        ])
+
+    def producer(self, variable_id: int) -> tp.Optional[int]:
+        return self._id2producer.get(variable_id)
+
+    def consumers(self, variable_id: int) -> tp.List[int]:
+        producer = self._id2producer.get(variable_id)
+        edge = self._last_edge(variable_id)
+        indices = []
+        while edge >= 0:
+            indices.append(self._edge_nodes[edge])
+            edge = self._edge_previous[edge]
+        if producer is not None and isinstance(
+            self._results[producer], tuple,
+        ):
+            # Consumers of any of the results are linked together.
+            indices = [
+                i for i in indices if any(
+                    id(v) == variable_id for x in self.inputs(i)
+                    for v in _variables_in(x))
+            ]
+        return indices[::-1]
+
+    def _last_edge(self, variable_id: int) -> int:
+        producer = self._id2producer.get(variable_id)
+        if producer is None:
+            return self._id2last_edge.get(variable_id, -1)
+        return self._last_edges[producer]
+
+    def _link(self, variable_id: int, edge: int):
+        producer = self._id2producer.get(variable_id)
+        if producer is None:
+            self._id2last_edge[variable_id] = edge
+        else:
+            self._last_edges[producer] = edge
+
+    def append(self, node: Node):
+        function_id = self._function2id.get(node.function)
+        if function_id is None:
+            function_id = self._function2id[node.function] = len(
+                self._functions)
+            self._functions.append(node.function)
+        self._results.append(node.result)
+        self._function_ids.append(function_id)
+        self._inputs.extend(node.inputs)
+        self._input_offsets.append(len(self._inputs))
+        self._kwargs_ids.append(self._intern(node.kwargs))
+        index = len(self._results) - 1
+        for x in node.inputs:
+            for v in _variables_in(x):
+                edge = self._last_edge(id(v))
+                if edge >= 0 and self._edge_nodes[edge] == index:
+                    continue
+                self._link(id(v), len(self._edge_nodes))
+                self._edge_nodes.append(index)
+                self._edge_previous.append(edge)
+        self._last_edges.append(-1)
+        self._id2producer[id(node.result)] = index
+        if isinstance(node.result, tuple):
+            for r in node.result:
+                if isinstance(r, Variable):
+                    self._id2producer[id(r)] = index
+
+    def _intern(self, kwargs: dict) -> int:
+        if not kwargs:
+            return 0
+        key = tuple((k, _value_key(v)) for k, v in kwargs.items())
+        if any(k is None for _, k in key):
+            self._kwargs.append(kwargs)
+            return len(self._kwargs) - 1
+        kwargs_id = self._key2kwargs_id.get(key)
+        if kwargs_id is None:
+            kwargs_id = self._key2kwargs_id[key] = len(self._kwargs)
+            self._kwargs.append(kwargs)
+        return kwargs_id
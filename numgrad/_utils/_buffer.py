@@ -0,0 +1,18 @@
+import typing as tp
+
+import numpy as np
+
+from numgrad._variable import Variable
+
+
+def _buffer(a) -> tp.Optional[tp.Tuple[int, int]]:
+    """Return id and size in bytes of memory buffer an array refers to."""
+    if isinstance(a, Variable):
+        a = a._data
+    if isinstance(a, np.generic):
+        return id(a), a.nbytes
+    if not isinstance(a, np.ndarray):
+        return None
+    while isinstance(a.base, np.ndarray):
+        a = a.base
+    return id(a), a.nbytes
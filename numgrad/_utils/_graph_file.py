@@ -0,0 +1,185 @@
+import importlib
+import struct
+import typing as tp
+import zipfile
+
+import numpy as np
+
+from numgrad._config import config
+from numgrad._variable import Variable
+from numgrad._vjp import _register_vjps
+
+
+def _import_function(name: str) -> tp.Optional[callable]:
+    """Return forward function of a name in form of `module:qualname`."""
+    module_name, qualname = name.split(':')
+    try:
+        function = importlib.import_module(module_name)
+        for attr in qualname.split('.'):
+            function = getattr(function, attr)
+    except (ImportError, AttributeError):
+        return None
+    _register_vjps()
+    # Functions may be replaced by patched or decorated ones in modules.
+    while function not in config._func2vjps and hasattr(
+        function, '__wrapped__',
+    ):
+        function = function.__wrapped__
+    return function
+
+
+def _function_name(function: callable) -> str:
+    """Return name to import a forward function by in other processes."""
+    if function in config._patched_function:
+        name = ':'.join(config._patched_function[function][:2])
+    else:
+        name = ':'.join((
+            str(getattr(function, '__module__', None)),
+            getattr(function, '__qualname__', getattr(
+                function, '__name__', '')),
+        ))
+    if _import_function(name) != function:
+        raise ValueError(
+            f'Cannot save graph with {function}, which cannot be imported '
+            'by its name')
+    return name
+
+
+def _memmap_npz(file, mode: str) -> tp.Dict[str, np.ndarray]:
+    """Return arrays in uncompressed `.npz` file mapped to memory."""
+    arrays = {}
+    blob = np.memmap(file, np.uint8, mode)
+    with zipfile.ZipFile(file) as archive, open(file, 'rb') as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(
+                    f'Cannot map compressed {info.filename} to memory')
+            # Data of each member follows its local header of 30 bytes, name
+            # and extra field.
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<2H', f.read(4))
+            f.seek(name_length + extra_length, 1)
+            if np.lib.format.read_magic(f) == (1, 0):
+                header = np.lib.format.read_array_header_1_0(f)
+            else:
+                header = np.lib.format.read_array_header_2_0(f)
+            shape, fortran_order, dtype = header
+            arrays[info.filename[:-len('.npy')]] = np.ndarray(
+                shape, dtype, blob, f.tell(),
+                order='F' if fortran_order else 'C',
+            )
+    return arrays
+
+
+class _Encoder:
+    """Convert nodes into JSON-compatible values and arrays to save."""
+
+    def __init__(self):
+        self.arrays: tp.Dict[str, np.ndarray] = {}
+        self.variables: tp.List[dict] = []
+        self._id2index: tp.Dict[int, int] = {}
+
+    def _add(self, x, prefix: str) -> int:
+        # Arrays and variables retained by the graph are saved once however
+        # many nodes refer to them.
+        if id(x) in self._id2index:
+            return self._id2index[id(x)]
+        index = len(self.arrays)
+        data = x._data if isinstance(x, Variable) else x
+        self.arrays[f'{prefix}{index}'] = np.asarray(data)
+        if isinstance(x, np.generic):
+            return index
+        self._id2index[id(x)] = index
+        if isinstance(x, Variable):
+            self.variables.append({
+                'index': index,
+                'scalar': isinstance(x._data, np.generic),
+                'requires_grad': x._requires_grad,
+                # Data stored in lower precision by a precision policy.
+                'dtype': x._data.dtype.str,
+                'compute_dtype': None if x._compute_dtype is None
+                else np.dtype(x._compute_dtype).str,
+            })
+        return index
+
+    def __call__(self, x):
+        if isinstance(x, Variable):
+            return {'variable': self._add(x, 'v')}
+        if isinstance(x, np.ndarray):
+            return {'array': self._add(x, 'a')}
+        if isinstance(x, (np.generic, complex)):
+            return {'scalar': self._add(np.asarray(x)[()], 'a')}
+        if isinstance(x, tuple):
+            return {'tuple': [self(a) for a in x]}
+        if isinstance(x, list):
+            return [self(a) for a in x]
+        if isinstance(x, slice):
+            return {'slice': [self(x.start), self(x.stop), self(x.step)]}
+        if isinstance(x, range):
+            return {'range': [x.start, x.stop, x.step]}
+        if x is Ellipsis:
+            return {'ellipsis': None}
+        if isinstance(x, np.dtype) or (
+            isinstance(x, type) and issubclass(x, (np.generic, float, int))
+        ):
+            return {'dtype': np.dtype(x).str}
+        if x is None or isinstance(x, (bool, int, float, str)):
+            return x
+        raise TypeError(f'Cannot save graph with {type(x)}')
+
+
+class _Decoder:
+    """Convert saved values and arrays back into those of nodes."""
+
+    def __init__(self, arrays, variables: tp.List[dict]):
+        self._arrays = arrays
+        self._variables = {v['index']: v for v in variables}
+        self._index2value: tp.Dict[str, tp.Any] = {}
+
+    def _get(self, key: str):
+        if key not in self._index2value:
+            value = np.asarray(self._arrays[key])
+            if key.startswith('v'):
+                value = self._variable(
+                    value, self._variables[int(key[1:])])
+            self._index2value[key] = value
+        return self._index2value[key]
+
+    @staticmethod
+    def _variable(value: np.ndarray, info: dict) -> Variable:
+        data = value[()] if info['scalar'] else value
+        dtype = np.dtype(info.get('dtype', value.dtype))
+        if dtype in (np.float32, np.float64):
+            return Variable(
+                data, dtype=dtype.type, requires_grad=info['requires_grad'])
+        # Data stored in lower precision is wrapped as it is, as results
+        # recorded with a precision policy are.
+        variable = Variable.__new__(Variable)
+        variable._data = data.astype(dtype, copy=False)
+        variable._requires_grad = info['requires_grad']
+        compute_dtype = info.get('compute_dtype')
+        variable._compute_dtype = (
+            None if compute_dtype is None else np.dtype(compute_dtype))
+        return variable
+
+    def __call__(self, x):
+        if isinstance(x, list):
+            return [self(a) for a in x]
+        if not isinstance(x, dict):
+            return x
+        (kind, value), = x.items()
+        if kind == 'variable':
+            return self._get(f'v{value}')
+        if kind == 'array':
+            return self._get(f'a{value}')
+        if kind == 'scalar':
+            return self._get(f'a{value}')[()]
+        if kind == 'tuple':
+            return tuple(self(a) for a in value)
+        if kind == 'slice':
+            return slice(*(self(a) for a in value))
+        if kind == 'range':
+            return range(*value)
+        if kind == 'ellipsis':
+            return Ellipsis
+        return np.dtype(value)
@@ -1,4 +1,5 @@
 from numgrad._config import config
+from numgrad._vjp import _register_vjps
 
 
 def has_vjp(forward_func: callable) -> bool:
@@ -21,4 +22,9 @@ def has_vjp(forward_func: callable) -> bool:
     >>> has_vjp(np.argsort)
     False
     """
+    _register_vjps()
+    # Functions are replaced by patched ones in their modules.
+    wrapped = getattr(forward_func, '__wrapped__', None)
+    if config._patched_function.get(wrapped, (None,) * 3)[2] is forward_func:
+        forward_func = wrapped
     return forward_func in config._func2vjps
@@ -1,9 +1,12 @@
 import numpy as np
 
+from numgrad._batching import _BatchedArray
 from numgrad._variable import Variable
 
 
 def _isscalar(a):
     if isinstance(a, Variable):
         a = a._data
+    if isinstance(a, _BatchedArray):
+        return a.ndim == 0
     return np.isscalar(a)
@@ -0,0 +1,7 @@
+import typing as tp
+
+
+def _rebuild(x: tp.Union[tuple, list], items: tp.Iterable):
+    if hasattr(x, '_fields'):
+        return type(x)(*items)
+    return type(x)(items)
@@ -0,0 +1,83 @@
+import typing as tp
+
+import numpy as np
+
+
+def _is_basic_index(key) -> bool:
+    key = key if isinstance(key, tuple) else (key,)
+    return all(
+        isinstance(k, (int, np.integer, slice, type(Ellipsis), type(None)))
+        and not isinstance(k, (bool, np.bool_))
+        for k in key
+    )
+
+
+def _scatter_add(out, key, values):
+    """Add values into array at indices, accumulating repeated indices."""
+    if _is_basic_index(key):
+        out[key] += values
+    else:
+        np.add.at(out, key, values)
+    return out
+
+
+class _SparseGrad:
+    """Gradient of an array which is zero except at indexed elements.
+
+    Gradients are kept as pairs of indexing keys and values added at them,
+    which are summed into a dense array only when it is needed. Values at
+    repeated indices are accumulated.
+    """
+
+    # Binary operations with arrays are left to the methods below.
+    __array_ufunc__ = None
+
+    def __init__(self, shape: tuple, dtype, items: tp.Tuple[tuple, ...]):
+        """Construct sparse gradient.
+
+        Parameters
+        ----------
+        shape : tuple
+            Shape of the dense gradient.
+        dtype
+            Data type of the dense gradient.
+        items : tp.Tuple[tuple, ...]
+            Pairs of indexing key and values added at the key.
+        """
+        self.shape = shape
+        self.dtype = np.dtype(dtype)
+        self._items = items
+
+    @property
+    def ndim(self) -> int:  # noqa: D102
+        return len(self.shape)
+
+    def _add_to(self, out: np.ndarray) -> np.ndarray:
+        for key, values in self._items:
+            _scatter_add(out, key, values)
+        return out
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:  # noqa: D105
+        return self._add_to(np.zeros(self.shape, dtype or self.dtype))
+
+    def __add__(self, other):  # noqa: D105
+        if isinstance(other, _SparseGrad):
+            return _SparseGrad(
+                self.shape,
+                np.result_type(self.dtype, other.dtype),
+                self._items + other._items,
+            )
+        return self._add_to(np.array(
+            np.broadcast_to(other, self.shape),
+            dtype=np.result_type(self.dtype, other),
+        ))
+
+    __radd__ = __add__
+
+
+def _densify(grad):
+    if isinstance(grad, _SparseGrad):
+        return np.asarray(grad)
+    if isinstance(grad, tuple):
+        return tuple(_densify(g) for g in grad)
+    return grad
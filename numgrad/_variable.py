@@ -1,9 +1,12 @@
 from collections import namedtuple
 import functools
+import time
+import typing as tp
 
 import numpy as np
 import numpy.typing as npt
 
+from numgrad._batching import _BatchedArray
 from numgrad._config import config
 
 
@@ -13,14 +16,21 @@ _JOIN_FUNCS = (
 )
 
 
+def _ndarray(v: 'Variable'):
+    # Data stored in lower precision is computed in that of its graph.
+    if v._compute_dtype is None:
+        return v._data
+    return v._data.astype(v._compute_dtype)
+
+
 def _ndarray_args(*args):
     return tuple(
-        a._data if isinstance(a, Variable) else a for a in args)
+        _ndarray(a) if isinstance(a, Variable) else a for a in args)
 
 
 def _ndarray_kwargs(**kwargs):
     return {
-        k: (v._data if isinstance(v, Variable) else v)
+        k: (_ndarray(v) if isinstance(v, Variable) else v)
         for k, v in kwargs.items()
     }
 
@@ -46,9 +56,27 @@ class Variable(object):
     <class 'numpy.ndarray'>
     >>> b
     array([1., 2.])
+    >>>
+    >>> # computation only with variables not requiring gradient
+    >>> c = ng.Variable([2, 3], requires_grad=False)
+    >>> with ng.Graph() as g:
+    ...     d = c * 2
+    ...
+    >>> type(d)
+    <class 'numpy.ndarray'>
     """
 
-    def __init__(self, data: npt.ArrayLike, dtype: npt.DTypeLike = None):
+    # Graphs of many small operations retain many variables.
+    __slots__ = ('_data', '_requires_grad', '_compute_dtype', '__weakref__')
+
+    def __init__(
+        self,
+        data: npt.ArrayLike,
+        dtype: npt.DTypeLike = None,
+        *,
+        copy: bool = None,
+        requires_grad: bool = True,
+    ):
         """Construct variable object to compute gradient with respect to.
 
         Parameters
@@ -58,6 +86,16 @@ class Variable(object):
         dtype : npt.DTypeLike, optional
             Data type which must be either np.float32 or np.float64,
             by default None.
+        copy : bool, optional
+            Copy input data always if True, never if False, and only if its
+            data type has to be converted, by default None. Arrays of the
+            data type, including memory-mapped arrays and read-only views,
+            are wrapped without copying them unless this is True.
+        requires_grad : bool, optional
+            Record computation with this variable into graphs, by default
+            True. Computation whose variables all do not require gradient
+            returns arrays without recording, e.g. with inputs, labels or
+            frozen parameters.
         """
         if dtype is None:
             dtype = config.dtype
@@ -68,17 +106,28 @@ class Variable(object):
                 f'not {dtype}')
         if np.isscalar(data):
             self._data = dtype(data)
+        elif isinstance(data, _BatchedArray):
+            self._data = data.astype(dtype, copy=False)
         else:
-            self._data = np.asarray(data, dtype=dtype)
+            self._data = _asarray(data, dtype, copy)
+        self._requires_grad = requires_grad
+        # Data type to compute in if the data is stored in lower precision.
+        self._compute_dtype: tp.Optional[np.dtype] = None
+
+    @property
+    def requires_grad(self) -> bool:
+        """Return whether computation with this variable is recorded.
+
+        Returns
+        -------
+        bool
+            True if computation with this variable is recorded into graphs.
+        """
+        return self._requires_grad
 
     def __array_ufunc__(  # noqa: D105
         self, ufunc, method, *inputs, out=None, **kwargs,
     ):
-        if config._verbosity > 1:
-            print(
-                'inputs of __array_ufunc__',
-                ufunc, method, inputs, out, kwargs,
-            )
         if ufunc.nout != 1:
             raise NotImplementedError
         if method not in ('__call__',):
@@ -86,25 +135,36 @@ class Variable(object):
 
         if out:
             kwargs['out'] = _ndarray_args(*out)[0]
+        if (recorded := _recorded_result(ufunc, inputs, kwargs)) is not None:
+            return recorded
+        start = time.perf_counter() if config._hooks else None
         result = getattr(ufunc, method)(
             *_ndarray_args(*inputs), **_ndarray_kwargs(**kwargs))
         if result is NotImplemented:
             return NotImplemented
-        return self._postprocess(result, ufunc, *inputs, **kwargs)
+        return self._postprocess(
+            result, ufunc, *inputs, _start=start, **kwargs)
 
     def __array_function__(self, func, types, args, kwargs):  # noqa: D105
         # https://numpy.org/devdocs/user/basics.dispatch.html
-        if config._verbosity > 1:
-            print('inputs of __array_function__:', func, types, args, kwargs)
+        if (recorded := _recorded_result(func, args, kwargs)) is not None:
+            return recorded
+        start = time.perf_counter() if config._hooks else None
         if func in _JOIN_FUNCS:
             result = func(_ndarray_args(*args[0]), *args[1:], **kwargs)
         else:
             result = func(*_ndarray_args(*args), **_ndarray_kwargs(**kwargs))
-        return self._postprocess(result, func, *args, **kwargs)
+        return self._postprocess(result, func, *args, _start=start, **kwargs)
 
     @staticmethod
-    def _postprocess(result, func, *args, **kwargs):
-        if config._graph is not None and func in config._func2vjps:
+    def _postprocess(result, func, *args, _start: float = None, **kwargs):
+        if (
+            config._graph is not None
+            and func in config._func2vjps
+            and _requires_grad(args + tuple(kwargs.values()))
+        ):
+            if _start is not None:
+                config._call_hooks('forward', func, args, _start)
             if func.__name__ == 'slogdet':
                 SlogdetResults = namedtuple(
                     'SlogdetResults', ['sign', 'logabsdet'])
@@ -126,8 +186,38 @@ class Variable(object):
         return result
 
 
+def _asarray(data, dtype, copy: bool) -> np.ndarray:
+    try:
+        return np.asarray(data, dtype=dtype, copy=copy)
+    except ValueError as e:
+        if copy is not False:
+            raise
+        raise ValueError(
+            f'Cannot wrap {type(data).__name__} into `Variable` of '
+            f'{np.dtype(dtype)} without copying it, pass `dtype` of the data '
+            'or `copy=None` to copy it') from e
+
+
+def _requires_grad(x) -> bool:
+    # Whether any of variables in arguments requires gradient.
+    if isinstance(x, Variable):
+        return x._requires_grad
+    if isinstance(x, (tuple, list)):
+        return any(_requires_grad(a) for a in x)
+    return False
+
+
+def _recorded_result(func, args: tuple, kwargs: dict):
+    # Result of the same call recorded in the graph eliminating common
+    # subexpressions, if any.
+    graph = config._graph
+    if graph is None or not graph._cse:
+        return None
+    return graph._find_result(func, args, kwargs)
+
+
 def _to_array(a):
-    if not isinstance(a, (Variable, np.ndarray)):
+    if not isinstance(a, (Variable, np.ndarray, _BatchedArray)):
         return np.asarray(a, config.dtype)
     return a
 
@@ -152,7 +242,8 @@ def _inplace(self, inplace_op, *other):
 for method, func in (
     (
         '__array__',
-        lambda self, dtype=None: np.asarray(self._data, dtype=dtype),
+        lambda self, dtype=None, copy=None: np.asarray(
+            self._data, dtype=dtype, copy=copy),
     ),
     ('__contains__', lambda self, other: other in self._data),
     ('__float__', lambda self: float(self._data)),
@@ -267,6 +358,6 @@ for method, func in (
         getattr(Variable, method), '__doc__',
         '\n'.join(
             (line + ' # doctest: +SKIP' if '>>>' in line else line) for line in
-            eval(f'np.ndarray.{method}').__doc__.split('\n')
+            getattr(np.ndarray, method).__doc__.split('\n')
         ),
     )
@@ -1,27 +1,92 @@
 from collections.abc import Iterable
 import functools
+import importlib
 import inspect
 import itertools
+import sys
+import threading
+import time
 
 import numpy as np
 
+from numgrad._batching import _apply_batch_rule, _batch_size, _Unbatchable
 from numgrad._config import config
-from numgrad._variable import _ndarray_args, _ndarray_kwargs, Variable
+from numgrad._variable import (
+    _ndarray_args, _ndarray_kwargs, _recorded_result, _requires_grad,
+    Variable,
+)
+
+
+# Registered functions which do not dispatch to `Variable` are replaced by
+# patched ones in their modules while graphs are under construction in any
+# thread, and the original ones are restored after the last one.
+_patch_lock = threading.Lock()
+_num_patching_graphs = 0
+_modules = {}
+
+
+def _patch_functions():
+    global _num_patching_graphs
+    with _patch_lock:
+        if _num_patching_graphs == 0:
+            for module, func, patched in config._patched_function.values():
+                setattr(_modules[module], func, patched)
+        _num_patching_graphs += 1
+
+
+def _restore_functions():
+    global _num_patching_graphs
+    with _patch_lock:
+        _num_patching_graphs -= 1
+        if _num_patching_graphs == 0:
+            for original, (module, func, _) in (
+                config._patched_function.items()
+            ):
+                setattr(_modules[module], func, original)
+
+
+def _dispatches_array_function(forward: callable) -> bool:
+    # Functions of numpy calling `Variable.__array_function__` by themselves.
+    if hasattr(forward, '__code__'):
+        return '__array_function__' in repr(forward.__code__)
+    return isinstance(forward, type(np.concatenate))
+
+
+# Packages of modules registering VJPs, which are imported on first use to
+# keep `import numgrad` fast, with modules required to be imported before.
+_lazy_vjp_packages = [
+    ('numgrad._numpy', 'numpy'),
+    ('numgrad._scipy', 'scipy.special'),
+]
+_register_lock = threading.Lock()
+
+
+def _register_vjps():
+    if not any(m in sys.modules for _, m in tuple(_lazy_vjp_packages)):
+        return
+    with _register_lock:
+        for package, required in tuple(_lazy_vjp_packages):
+            if required in sys.modules:
+                for module in importlib.import_module(package)._vjp_modules:
+                    importlib.import_module(module)
+                _lazy_vjp_packages.remove((package, required))
 
 
 def _wrap_vjp(vjp: callable) -> callable:
     vjp_args = inspect.getfullargspec(vjp).args
-    if 'g' not in vjp_args:
-        vjp = functools.partial(
-            lambda vjp, g, *args, **kwargs: g * vjp(*args, **kwargs),
-            vjp,
-        )
-    if 'r' not in vjp_args:
-        vjp = functools.partial(
-            lambda vjp, g, r, *args, **kwargs: vjp(g, *args, **kwargs),
-            vjp,
-        )
-    return vjp
+    if 'g' in vjp_args and 'r' in vjp_args:
+        return vjp
+    if 'g' in vjp_args:
+        return lambda g, r, *args, **kwargs: vjp(g, *args, **kwargs)
+    # Derivatives multiplied to `g` are kept for backward computation to
+    # multiply them in-place.
+    if 'r' in vjp_args:
+        wrapped = lambda g, *args, **kwargs: g * vjp(*args, **kwargs)
+        wrapped._derivative = vjp
+    else:
+        wrapped = lambda g, r, *args, **kwargs: g * vjp(*args, **kwargs)
+        wrapped._derivative = lambda r, *args, **kwargs: vjp(*args, **kwargs)
+    return wrapped
 
 
 class _VJPIterator:
@@ -55,31 +120,49 @@ def _bind_vjp(
         config._func2vjps[forward] = tuple(_wrap_vjp(vjp) for vjp in vjps)
 
     if isinstance(forward, np.ufunc):
+        if forward.signature is None:
+            # Jacobians of element-wise functions are diagonal, so that their
+            # VJPs push tangents forward as well.
+            config._func2jvps.setdefault(forward, config._func2vjps[forward])
         return
-    if (
-        hasattr(forward, '__code__')
-        and '__array_function__' in repr(forward.__code__)
-    ):
+    if _dispatches_array_function(forward):
         return
 
+    @functools.wraps(forward)
     def patched(*args, **kwargs):
-        result = forward(
-            *_ndarray_args(*args), **_ndarray_kwargs(**kwargs))
+        if config._graph is None:
+            return forward(*args, **kwargs)
+        if (recorded := _recorded_result(forward, args, kwargs)) is not None:
+            return recorded
+        start = time.perf_counter() if config._hooks else None
+        arrays, array_kwargs = _ndarray_args(*args), _ndarray_kwargs(**kwargs)
+        # Batched arrays are not dispatched to by functions out of numpy.
+        if (
+            forward in config._func2batch_rules
+            and _batch_size((arrays, array_kwargs)) is not None
+        ):
+            result = _apply_batch_rule(forward, arrays, array_kwargs)
+        else:
+            try:
+                result = forward(*arrays, **array_kwargs)
+            except _Unbatchable:
+                result = _apply_batch_rule(forward, arrays, array_kwargs)
         if any(
             isinstance(a, Variable) for a
             in itertools.chain(args, kwargs.values())
         ):
-            result = Variable._postprocess(result, forward, *args, **kwargs)
+            result = Variable._postprocess(
+                result, forward, *args, _start=start, **kwargs)
         return result
 
-    config._patched_function[forward] = (
-        module_name if module_name is not None else '.'.join(
-            m for m in forward.__module__.split('.')
-            if not m.startswith('_')
-        ),
-        forward.__name__ if func_name is None else func_name,
-        patched,
-    )
+    module_name = module_name if module_name is not None else '.'.join(
+        m for m in forward.__module__.split('.') if not m.startswith('_'))
+    func_name = forward.__name__ if func_name is None else func_name
+    with _patch_lock:
+        _modules.setdefault(module_name, importlib.import_module(module_name))
+        config._patched_function[forward] = (module_name, func_name, patched)
+        if _num_patching_graphs > 0:
+            setattr(_modules[module_name], func_name, patched)
 
 
 def custom_vjp(*vjps: callable) -> callable:
@@ -122,15 +205,18 @@ def custom_vjp(*vjps: callable) -> callable:
 
         @functools.wraps(forward)
         def wrapped_forward(*args, **kwargs):
+            recorded = _recorded_result(forward, args, kwargs)
+            if recorded is not None:
+                return recorded
+            start = time.perf_counter() if config._hooks else None
             result = forward(
                 *_ndarray_args(*args), **_ndarray_kwargs(**kwargs))
             if (
                 config._graph is not None
-                and any(
-                    isinstance(a, Variable) for a
-                    in itertools.chain(args, kwargs.values())
-                )
+                and _requires_grad(args + tuple(kwargs.values()))
             ):
+                if start is not None:
+                    config._call_hooks('forward', forward, args, start)
                 result = Variable(result)
                 config._graph._add_node(result, forward, *args, **kwargs)
             return result
@@ -0,0 +1,89 @@
+import typing as tp
+
+import numpy as np
+
+from numgrad._batching import _BatchedArray, _loop, _Unbatchable
+from numgrad._utils._rebuild import _rebuild
+from numgrad._vjp import _register_vjps
+
+
+def _unstack(x, size: int):
+    if x is None:
+        return None
+    if isinstance(x, _BatchedArray):
+        return x._data
+    if isinstance(x, (tuple, list)):
+        return _rebuild(x, (_unstack(a, size) for a in x))
+    # Results independent of the mapped arguments are the same for all.
+    return np.broadcast_to(x, (size,) + np.shape(x))
+
+
+def vmap(
+    forward_func: callable,
+    in_axes: tp.Union[None, int, tp.Sequence[tp.Optional[int]]] = 0,
+) -> callable:
+    """Return a function mapping forward function over an axis of its args.
+
+    The forward function is traced once with the mapped arguments, where
+    numpy functions are computed for all the examples at once, rather than
+    called for each of the examples. Functions without such computation
+    registered are called for each of the examples instead.
+
+    Parameters
+    ----------
+    forward_func : callable
+        Input forward function.
+    in_axes : tp.Union[None, int, tp.Sequence[tp.Optional[int]]], optional
+        Axis to map over for each of positional args, or None not to map over
+        the arg, by default 0. Keyword args are passed as they are.
+
+    Returns
+    -------
+    callable
+        Function that returns results of the forward function for each of the
+        examples stacked along the leading axis.
+
+    Examples
+    --------
+    >>> vmap(np.dot)([[1, 2], [3, 4]], [[5, 6], [7, 8]])
+    array([17, 53])
+    >>> vmap(np.sum, in_axes=1)([[1, 2], [3, 4]])
+    array([4, 6])
+    >>>
+    >>> # gradients with respect to `w` for each of the examples
+    >>> w = np.array([1., 2.])
+    >>> vmap(lambda x: ng.grad(lambda w: np.sum(w * x) ** 2)(w))(
+    ...     [[1., 0.], [1., 1.]])
+    array([[2., 0.],
+           [6., 6.]])
+    """
+
+    def _vmap_func(*args, **kwargs):
+        axes = (
+            (in_axes,) * len(args)
+            if in_axes is None or isinstance(in_axes, int) else in_axes
+        )
+        if len(axes) != len(args):
+            raise ValueError(
+                f'Length of in_axes {len(axes)} must be the same as the '
+                f'number of positional args {len(args)}')
+        args = tuple(
+            a if axis is None
+            else _BatchedArray(np.moveaxis(np.asarray(a), axis, 0))
+            for a, axis in zip(args, axes)
+        )
+        sizes = {len(a._data) for a in args if isinstance(a, _BatchedArray)}
+        if len(sizes) != 1:
+            raise ValueError(
+                'Please map over axes of the same size of at least one '
+                f'positional arg, not {sizes}')
+        size = sizes.pop()
+        # Batching rules are registered along with VJPs.
+        _register_vjps()
+        try:
+            result = forward_func(*args, **kwargs)
+        except _Unbatchable:
+            result = _loop(forward_func, args, kwargs)
+        return _unstack(result, size)
+
+    return _vmap_func
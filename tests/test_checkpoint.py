@@ -0,0 +1,107 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import numgrad as ng
+
+
+def _block(h, w, *, scale=1.):
+    return h + np.tanh(h @ w) * scale
+
+
+def _chain(block, h, ws):
+    for w in ws:
+        h = block(h, w)
+    return np.sum(h ** 2)
+
+
+@pytest.mark.parametrize('num_args', [1, 2])
+def test_checkpoint(num_args):
+    h = np.random.normal(size=(3, 4))
+    ws = tuple(np.random.normal(size=(4, 4)) * 0.5 for _ in range(3))
+    checkpointed = ng.checkpoint(_block)
+    args = (h,) + ws
+    expected = ng.grad(lambda *a: _chain(_block, a[0], a[1:]))(*args)
+    if num_args == 1:
+        actual = ng.grad(lambda *w: _chain(checkpointed, h, w))(*ws)
+        expected = expected[1:]
+    else:
+        actual = ng.grad(lambda *a: _chain(checkpointed, a[0], a[1:]))(*args)
+    for a, e in zip(actual, expected):
+        assert np.allclose(a, e)
+
+
+def test_checkpoint_frees_gradients_of_skipped_inputs():
+    h = ng.Variable(np.random.normal(size=(1000, 100)))
+    w = ng.Variable(np.random.normal(size=(100, 100)))
+    with ng.Graph() as g:
+        y = np.sum(ng.checkpoint(_block)(h, w))
+    tracemalloc.start()
+    try:
+        dw = g.backward(y, w)
+        current = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert dw.shape == w.shape
+    # VJP with respect to `h` is skipped, whose gradient must not be kept.
+    assert current < h._data.nbytes / 2
+
+
+def test_checkpoint_records_single_node():
+    h = np.random.normal(size=(2, 4))
+    w = ng.Variable(np.random.normal(size=(4, 4)))
+    with ng.Graph() as g:
+        y = np.sum(ng.checkpoint(_block)(h, w, scale=2.))
+    assert len(g._node_list) == 2
+    expected = ng.grad(lambda w: np.sum(_block(h, w, scale=2.)))(w._data)
+    assert np.allclose(g.backward(y, w), expected)
+
+
+def test_checkpoint_higher_order():
+    f = ng.checkpoint(lambda x: np.sin(x) * x)
+    assert np.isclose(ng.grad(ng.grad(f))(1.), 2 * np.cos(1.) - np.sin(1.))
+
+
+def test_checkpoint_nested():
+    inner = ng.checkpoint(np.tanh)
+    outer = ng.checkpoint(lambda x: inner(x) * x)
+    assert np.isclose(
+        ng.grad(outer)(0.5),
+        ng.grad(lambda x: np.tanh(x) * x)(0.5),
+    )
+
+
+def test_checkpoint_static_grad():
+    df = ng.static_grad(lambda h, w: np.sum(ng.checkpoint(_block)(h, w)))
+    for _ in range(2):
+        h, w = np.random.normal(size=(2, 3)), np.random.normal(size=(3, 3))
+        expected = ng.grad(lambda h, w: np.sum(_block(h, w)))(h, w)
+        for a, e in zip(df(h, w), expected):
+            assert np.allclose(a, e)
+
+
+def test_checkpoint_frees_intermediate_results():
+    x = ng.Variable(np.random.normal(size=100_000))
+
+    def segment(h):
+        for _ in range(10):
+            h = np.tanh(h)
+        return h
+
+    peaks = []
+    for f in (segment, ng.checkpoint(segment)):
+        tracemalloc.start()
+        try:
+            with ng.Graph():
+                y = f(x)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del y
+        peaks.append(peak)
+    assert peaks[1] < 3 * x._data.nbytes < peaks[0]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
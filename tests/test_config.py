@@ -21,5 +21,40 @@ def test_set_dtype():
     assert ng.config.dtype == np.float64
 
 
+def test_hooks():
+    events = []
+    hook = ng.config.register_hook(
+        lambda kind, function, shapes, seconds: events.append(
+            (kind, function.__name__, shapes)) if seconds >= 0 else None)
+    try:
+        x = ng.Variable(np.ones((2, 3)))
+        with ng.Graph() as g:
+            y = np.sum(np.tanh(x) @ np.ones(3))
+        g.backward(y, x)
+    finally:
+        ng.config.remove_hook(hook)
+    assert events == [
+        ('forward', 'tanh', ((2, 3),)),
+        ('forward', 'matmul', ((2, 3), (3,))),
+        ('forward', 'sum', ((2,),)),
+        ('vjp', 'sum', ((2,),)),
+        ('vjp', 'matmul', ((2, 3), (3,))),
+        ('vjp', 'tanh', ((2, 3),)),
+    ]
+    assert ng.config._hooks == []
+
+
+def test_hooks_custom_vjp():
+    events = []
+    twice = ng.custom_vjp(lambda g, r, x: 2 * g)(lambda x: 2 * x)
+    hook = ng.config.register_hook(lambda *args: events.append(args[:2]))
+    try:
+        ng.grad(lambda x: twice(x))(1.)
+    finally:
+        ng.config.remove_hook(hook)
+    assert [kind for kind, _ in events] == ['forward', 'vjp']
+    assert events[0][1] is events[1][1]
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
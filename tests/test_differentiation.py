@@ -111,6 +111,10 @@ def test_grad(function, args, kwargs, expect):
             ng.elementwise_grad(lambda a: a ** 4))),
         ([0, -1, 2],), {}, [0, -24, 48],
     ),
+    (
+        ng.elementwise_grad(ng.elementwise_grad(lambda a: a[1:] ** 3)),
+        ([1, 2, 3],), {}, [0, 12, 18],
+    ),
 ])
 def test_higher_order_derivatives(dfunc, args, kwargs, expect):
     actual = dfunc(*args, **kwargs)
@@ -122,6 +126,175 @@ def test_higher_order_derivatives(dfunc, args, kwargs, expect):
         assert np.allclose(actual, expect)
 
 
+def _scalar_function(x, y, *, a):
+    return (
+        x @ a @ x + np.sum(np.sin(x)) * np.sum(y ** 2)
+        + np.log(np.sum(np.exp(x[:, None] * y))))
+
+
+def _numerical_hessian(f, *args):
+    return tuple(
+        tuple(
+            np.reshape(
+                [
+                    _numerical_grad(
+                        lambda *b: ng.grad(f)(*b)[i].ravel()[k], *args)[j]
+                    for k in range(np.size(a))
+                ],
+                np.shape(a) + np.shape(b),
+            )
+            for j, b in enumerate(args)
+        )
+        for i, a in enumerate(args)
+    )
+
+
+def test_hvp_and_hessian():
+    x = np.random.normal(size=3)
+    y = np.random.normal(size=2)
+    a = np.random.normal(size=(3, 3))
+    vx, vy = np.random.normal(size=3), np.random.normal(size=2)
+
+    def f(x, y):
+        return _scalar_function(x, y, a=a)
+
+    h = ng.hessian(f)(x, y)
+    expected = _numerical_hessian(f, x, y)
+    for i in range(2):
+        for j in range(2):
+            assert np.allclose(h[i][j], expected[i][j], atol=1e-5)
+    hvx, hvy = ng.hvp(f)(x, y, (vx, vy))
+    assert np.allclose(hvx, h[0][0] @ vx + h[0][1] @ vy)
+    assert np.allclose(hvy, h[1][0] @ vx + h[1][1] @ vy)
+    h_kwargs = ng.hessian(_scalar_function)(x, y, a=a)
+    assert np.allclose(h_kwargs[0][0], h[0][0])
+
+
+@pytest.mark.parametrize('function, args, expect', [
+    (lambda x: np.sum(x * 2), ([1., 2.],), np.zeros((2, 2))),
+    (lambda x: x ** 3, (2.,), 12.),
+    (
+        lambda x: np.sum(np.tanh(x)),
+        (np.zeros((2, 2)),),
+        np.zeros((2, 2, 2, 2)),
+    ),
+])
+def test_hessian(function, args, expect):
+    actual = ng.hessian(function)(*args)
+    assert np.shape(actual) == np.shape(expect)
+    assert np.allclose(actual, expect)
+    v = np.ones_like(args[0])
+    assert np.allclose(
+        ng.hvp(function)(*args, v),
+        np.tensordot(expect, v, np.ndim(v)),
+    )
+
+
+def test_hessian_single_backward_sweep():
+    calls = []
+    hook = ng.config.register_hook(
+        lambda kind, *_: kind == 'vjp' and calls.append(kind))
+    try:
+        num_calls = []
+        for size in (1, 5):
+            calls.clear()
+            actual = ng.hessian(lambda x: np.sum(np.exp(x) * x))(np.ones(size))
+            assert np.allclose(actual, np.diag(np.full(size, 3 * np.e)))
+            num_calls.append(len(calls))
+    finally:
+        ng.config.remove_hook(hook)
+    # All the unit vectors are propagated backward at once.
+    assert num_calls[0] == num_calls[1]
+
+
+def test_higher_order_hvp():
+    # third derivative of x ** 4 is 24 * x
+    d3f = ng.grad(lambda x: ng.hvp(lambda x: x ** 4)(x, 1.))
+    assert np.isclose(d3f(2.), 48.)
+
+
+def _backward_jacobian(f, *args):
+    args = tuple(ng.Variable(a) for a in args)
+    with ng.Graph() as g:
+        y = f(*args)
+    rows = [
+        g.backward(y, args, target_grad=e.reshape(y.shape))
+        for e in np.eye(y.size)
+    ]
+    return tuple(
+        np.reshape([r[i] for r in rows], y.shape + a.shape)
+        for i, a in enumerate(args)
+    )
+
+
+@pytest.mark.parametrize('function, args', [
+    (lambda x: np.tanh(x @ np.ones((3, 4))) ** 2, (np.random.rand(2, 3),)),
+    (
+        lambda w, x: np.tanh(x @ w).sum(0) + np.linalg.det(w[:2, :2]),
+        (np.random.rand(3, 2), np.random.rand(5, 3)),
+    ),
+    (lambda x: np.cumprod(np.sort(x)[::-1]), (np.random.rand(4),)),
+    (
+        lambda x: np.diff(x, axis=0) * np.flip(x[1:], 1),
+        (np.random.rand(3, 2),),
+    ),
+    (
+        lambda a, b: np.linalg.solve(a @ a.T + np.eye(3), b),
+        (np.random.rand(3, 3), np.random.rand(3)),
+    ),
+    (
+        lambda x, y: np.stack([x * y, np.roll(x, 1) / y]),
+        (np.random.rand(4), 2.),
+    ),
+])
+def test_jacobian(function, args):
+    actual = ng.jacobian(function)(*args)
+    expect = _backward_jacobian(function, *args)
+    if len(args) == 1:
+        actual = (actual,)
+    for a, e in zip(actual, expect):
+        assert np.shape(a) == np.shape(e)
+        assert np.allclose(a, e)
+
+
+def _relu_norm(x):
+    # `np.where` is not recorded into graphs.
+    return np.sum(np.where(x > 0, x, 0) ** 2)
+
+
+@pytest.mark.parametrize('transform, function', [
+    (ng.jacobian, lambda x: np.ones(3)),
+    (ng.jacobian, lambda x: np.where(x > 0, x, 0)),
+    (ng.hessian, _relu_norm),
+    (lambda f: lambda x: ng.hvp(f)(x, np.ones(2)), _relu_norm),
+])
+def test_derivative_of_output_not_recorded_error(transform, function):
+    # Same as `ng.grad`, rather than returning zeros.
+    with pytest.raises(TypeError):
+        ng.grad(lambda x: np.sum(function(x)))(np.ones(2))
+    with pytest.raises(TypeError):
+        transform(function)(np.ones(2))
+
+
+@pytest.mark.parametrize('transform, expect', [
+    (ng.grad, (6., 6.)),
+    (lambda f: lambda a, b: ng.value_and_grad(f)(a, b)[1], (6., 6.)),
+    (ng.jacobian, (6., 6.)),
+    (ng.hessian, ((0., 2.), (2., 0.))),
+    (lambda f: lambda a, b: ng.hvp(f)(a, b, (1., 0.)), (0., 2.)),
+])
+def test_same_variable_passed_twice(transform, expect):
+    # Partial derivatives with respect to each of the arguments.
+    v = ng.Variable(3.)
+    actual = transform(lambda a, b: a * 2 * b)(v, v)
+    assert np.allclose(actual, expect)
+
+
+def test_grad_of_jacobian():
+    f = lambda x: np.sum(ng.jacobian(lambda x: x ** 3)(x))
+    assert np.allclose(ng.grad(f)([1., 2.]), [6., 12.])
+
+
 @pytest.mark.parametrize('function, args, kwargs, expect', [
     (lambda a=3, b=-4: np.sqrt(a * a + b * b), (), {}, ValueError),
     (lambda a, b=-4: np.sqrt(a * a + b * b), (), dict(a=3), ValueError),
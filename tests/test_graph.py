@@ -1,7 +1,14 @@
+import subprocess
+import sys
+import threading
+import tracemalloc
+
 import numpy as np
 import pytest
+import scipy.special as sp
 
 import numgrad as ng
+from numgrad._utils._numerical_grad import _numerical_grad
 
 
 def test_enter_exit():
@@ -41,6 +48,493 @@ def test_multiple_graphs():
     assert g1._node_list[1].inputs[0] is b
 
 
+def test_node_index():
+    a = ng.Variable([1, 2])
+    with ng.Graph() as g:
+        b = np.square(a)
+        c = np.concatenate([a, b])
+        d = np.sum(c)
+    assert g._get_producer(a) is None
+    assert g._get_producer(b) == 0
+    assert g._get_producer(c) == 1
+    assert g._get_producer(d) == 2
+    assert g._get_consumers(a) == [0, 1]
+    assert g._get_consumers(b) == [1]
+    assert g._get_consumers(d) == []
+
+
+def test_node_index_of_input_used_twice():
+    a = ng.Variable([1, 2])
+    with ng.Graph() as g:
+        b = a * a
+        c = np.stack([a, b, a])
+    assert g._get_consumers(a) == [0, 1]
+    assert g._get_consumers(b) == [1]
+    assert g._get_consumers(c) == []
+
+
+def test_node_index_of_multiple_results():
+    a = ng.Variable([1, 2, 3, 4])
+    with ng.Graph() as g:
+        b, c = np.split(a, 2)
+        np.sin(b)
+        np.cos(c)
+        np.multiply(b, c)
+    assert g._get_producer(b) == g._get_producer(c) == 0
+    assert g._get_consumers(b) == [1, 3]
+    assert g._get_consumers(c) == [2, 3]
+
+
+def test_nodes_share_keyword_arguments():
+    a = ng.Variable(np.ones((2, 3)))
+    w = np.zeros((2, 1))
+    with ng.Graph() as g:
+        b = np.sum(a, axis=1)
+        c = np.sum(a, axis=1)
+        d = np.sum(a, axis=0)
+        e = np.diff(a, axis=1, prepend=w)
+        f = np.diff(a, axis=1, prepend=w)
+    nodes = list(g._node_list)
+    assert all(n.result is r for n, r in zip(nodes, (b, c, d, e, f)))
+    assert nodes[0].function is nodes[2].function
+    assert nodes[0].inputs == (a,)
+    assert nodes[0].kwargs is nodes[1].kwargs
+    assert nodes[0].kwargs is not nodes[2].kwargs
+    assert nodes[3].kwargs is not nodes[4].kwargs
+    assert nodes[4].kwargs['prepend'] is w
+    assert not hasattr(a, '__dict__')
+
+
+@pytest.mark.parametrize('value, other', [
+    (0., -0.),
+    (np.float32(0), np.float32(-0.)),
+    (complex(1, 0.), complex(1, -0.)),
+    ((1, 0.), (1, -0.)),
+])
+def test_nodes_do_not_share_keyword_arguments_of_signed_zeros(value, other):
+    tape = ng.Graph()._node_list
+    kwargs_id = tape._intern({'x': value})
+    assert tape._intern({'x': value}) == kwargs_id
+    assert tape._intern({'x': other}) != kwargs_id
+    assert tape._kwargs[tape._intern({'x': other})]['x'] is other
+
+
+def test_add_existing_result_error():
+    a = ng.Variable(-1)
+    with ng.Graph() as g:
+        b = np.square(a)
+        with pytest.raises(ValueError):
+            g._add_node(b, np.square, a)
+
+
+def test_multiple_graphs_node_index():
+    a = ng.Variable(-1)
+    with ng.Graph(_allow_multiple_graphs=True) as g1:
+        b = np.square(a)
+        with ng.Graph(_allow_multiple_graphs=True) as g2:
+            c = np.square(b)
+    assert g1._get_producer(c) == 1
+    assert g1._get_consumers(b) == [1]
+    assert g2._get_producer(c) == 0
+    assert g2._get_producer(b) is None
+
+
+def test_backward_skips_unreachable_nodes():
+    x = ng.Variable([1, 2])
+    w = ng.Variable([3, 4])
+    with ng.Graph() as g:
+        frozen = np.tanh(w)
+        y = np.sum(np.sin(x) * frozen)
+        metric = np.mean(np.cos(x))  # does not feed y
+    assert len(g._node_list) == 6
+    dx = g.backward(y, x)
+    assert np.allclose(dx, np.cos([1, 2]) * np.tanh([3, 4]))
+    # np.tanh(w), np.cos(x) and np.mean are not visited
+    assert g._num_skipped_nodes == 3
+
+    dw = g.backward(y, w)
+    assert np.allclose(dw, np.sin([1, 2]) * (1 - np.tanh([3, 4]) ** 2))
+    # np.sin(x), np.cos(x) and np.mean are not visited
+    assert g._num_skipped_nodes == 3
+    assert metric is not None
+
+
+def test_backward_skips_vjp_of_unreachable_input():
+    called = []
+
+    @ng.custom_vjp(
+        lambda g, r, a, b: called.append('a') or g * b,
+        lambda g, r, a, b: called.append('b') or g * a,
+    )
+    def multiply(a, b):
+        return a * b
+
+    a = ng.Variable(2)
+    b = ng.Variable(3)
+    with ng.Graph() as g:
+        c = multiply(a, b)
+    assert g.backward(c, a) == 3
+    assert called == ['a']
+
+
+@pytest.mark.parametrize('function, depth', [
+    (np.tanh, 20),
+    (lambda h: np.tanh(h @ np.eye(100)), 10),
+])
+def test_backward_frees_intermediate_cotangents(function, depth):
+    x = ng.Variable(np.random.uniform(-1, 1, (500, 100)))
+    with ng.Graph() as g:
+        h = x
+        for _ in range(depth):
+            h = function(h)
+        y = np.sum(h)
+    tracemalloc.start()
+    try:
+        dx = g.backward(y, x)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert dx.shape == x.shape
+    # Keeping every cotangent alive would take at least `depth` arrays.
+    assert peak < 6 * x._data.nbytes
+
+
+def test_backward_reuses_plan():
+    a = ng.Variable([[1., 2.], [3., 4.]])
+    b = ng.Variable([1., -1.])
+    with ng.Graph() as g:
+        y = np.tanh(a @ b)
+    da, db = g.backward(y, (a, b))
+    plan = g._get_plan(y, (a, b))
+    da2, db2 = g.backward(y, (a, b), target_grad=[2., 3.])
+    assert g._get_plan(y, (a, b)) is plan
+    dy = 1 - np.tanh(a._data @ b._data) ** 2
+    assert np.allclose(da, np.outer(dy, b._data))
+    assert np.allclose(db, dy @ a._data)
+    assert np.allclose(da2, np.outer(dy * [2., 3.], b._data))
+    assert np.allclose(db2, (dy * [2., 3.]) @ a._data)
+
+
+@pytest.mark.parametrize('a, b', [
+    (np.ones(3), np.ones(3)),
+    (np.ones(3), np.ones((3, 2))),
+    (np.ones((2, 3)), np.ones(3)),
+    (np.ones((2, 3)), np.ones((3, 2))),
+])
+@pytest.mark.parametrize('function', [np.dot, np.matmul])
+def test_backward_plan_rank_specialized(function, a, b):
+    a, b = ng.Variable(a), ng.Variable(b)
+    with ng.Graph() as g:
+        y = function(a, b)
+    da, db = g.backward(y, (a, b))
+    assert da.shape == a.shape
+    assert db.shape == b.shape
+
+
+@pytest.mark.parametrize('out', [None, np.empty(3)])
+def test_backward_accumulates_shared_variable(out):
+    w = ng.Variable([1., 2., 3.])
+    with ng.Graph() as g:
+        h = w
+        for _ in range(4):
+            h = h * w
+        y = np.sum(h)
+    for _ in range(2):
+        dw = g.backward(y, w, out=out)
+        assert np.allclose(dw, 5 * w._data ** 4)
+    assert out is None or dw is out
+
+
+def test_backward_out():
+    a = ng.Variable([1., 2.])
+    b = ng.Variable(3.)
+    c = ng.Variable([4., 5.])
+    with ng.Graph() as g:
+        y = np.sum(a * b)
+    da, dc = np.full(2, np.nan), np.full(2, np.nan)
+    for _ in range(2):
+        grads = g.backward(y, (a, b, c), out=(da, None, dc))
+        assert grads[0] is da
+        assert grads[2] is dc
+        assert np.allclose(da, [3., 3.])
+        assert np.allclose(grads[1], 3.)
+        assert np.allclose(dc, 0.)
+
+
+@pytest.mark.parametrize('out, error', [
+    ((np.empty(2),), ValueError),
+    ((np.empty(3), None), ValueError),
+    (([1., 2.], None), TypeError),
+])
+def test_backward_out_error(out, error):
+    a = ng.Variable([1., 2.])
+    b = ng.Variable([3., 4.])
+    with ng.Graph() as g:
+        y = np.sum(a * b)
+    with pytest.raises(error):
+        g.backward(y, (a, b), out=out)
+
+
+def test_backward_reuses_cotangent_buffers():
+    x = ng.Variable(np.random.rand(3, 4))
+    b = ng.Variable(np.random.rand(4))
+    with ng.Graph() as g:
+        h = np.tanh(x * 2 + b)
+        e = np.exp(-h)
+        y = np.sum(np.sin(e) * e * h)
+    forward = [v._data.copy() for v in (h, e, y)]
+    dx, db = g.backward(y, [x, b])
+    assert g._num_reused_buffers > 0
+    # Forward results are left as they are.
+    for v, expect in zip((h, e, y), forward):
+        assert np.array_equal(v._data, expect)
+
+    def f(x, b):
+        h = np.tanh(x * 2 + b)
+        e = np.exp(-h)
+        return np.sum(np.sin(e) * e * h)
+
+    expect = _numerical_grad(f, x._data, b._data)
+    assert np.allclose(dx, expect[0])
+    assert np.allclose(db, expect[1])
+    dx_again, db_again = g.backward(y, [x, b])
+    assert np.array_equal(dx, dx_again)
+    assert np.array_equal(db, db_again)
+
+
+def test_cse():
+    x = ng.Variable(np.random.rand(3))
+    with ng.Graph(cse=True) as g:
+        a = np.exp(x) * 2
+        b = np.exp(x) * 2
+        c = np.exp(x) * 3
+        y = np.sum(a * b[::2][0] + c[::2][0])
+    assert a is b
+    assert len(g._node_list) == 10
+    assert g._num_eliminated_calls == 3
+    expect = _numerical_grad(
+        lambda x: np.sum(4 * np.exp(x) * np.exp(x[0]) + 3 * np.exp(x[0])),
+        x._data,
+    )[0]
+    assert np.allclose(g.backward(y, x), expect)
+
+
+@pytest.mark.parametrize('function', [
+    lambda x: np.random.normal(x, 1.),
+    lambda x: np.exp(x, out=np.empty(3)),
+    lambda x: x * np.ones(3),
+    lambda x: np.sum(x[np.array([0, 1])]),
+])
+def test_cse_excluded(function):
+    x = ng.Variable(np.random.rand(3))
+    with ng.Graph(cse=True) as g:
+        a = function(x)
+        b = function(x)
+    assert a is not b
+    assert g._num_eliminated_calls == 0
+
+
+@pytest.mark.parametrize('zero', [0., np.float32(0)])
+def test_cse_of_signed_zeros(zero):
+    x = ng.Variable([1., -2.])
+    with ng.Graph(cse=True) as g:
+        a = x * zero
+        b = x * -zero
+    assert a is not b
+    assert g._num_eliminated_calls == 0
+    assert np.signbit(a._data).tolist() == [False, True]
+    assert np.signbit(b._data).tolist() == [True, False]
+
+
+def test_cse_disabled_by_default():
+    x = ng.Variable(np.random.rand(3))
+    with ng.Graph():
+        a = np.exp(x)
+        b = np.exp(x)
+    assert a is not b
+
+
+def test_no_grad():
+    x = ng.Variable([1., 2.])
+    with ng.Graph() as g:
+        with ng.no_grad():
+            a = np.tanh(x) * x
+            assert ng.config._graph is None
+        y = np.sum(a * x)
+    assert type(a) is np.ndarray
+    assert ng.config._graph is None
+    assert len(g._node_list) == 2
+    assert np.allclose(g.backward(y, x), np.tanh([1., 2.]) * [1., 2.])
+
+
+def test_no_grad_decorator_and_inner_graph():
+
+    @ng.no_grad()
+    def f(x):
+        with ng.Graph() as inner:
+            y = np.sin(x)
+        return y, inner
+
+    x = ng.Variable(1.)
+    with ng.Graph() as g:
+        y, inner = f(x)
+    assert isinstance(y, ng.Variable)
+    assert len(g._node_list) == 0
+    assert np.isclose(inner.backward(y, x), np.cos(1.))
+
+
+@pytest.mark.parametrize('function', [
+    lambda a: np.sum(a[1:, ::2] * a[[0, 1], 0][:, None]),
+    lambda a: np.sum(a[..., np.array([True, False, True])]),
+    lambda a: np.sum(np.concatenate([a, a * 2], axis=0) ** 2),
+    lambda a: np.sum(np.linalg.inv(a + 3 * np.eye(3)) @ np.ones(3)),
+    lambda a: np.linalg.slogdet(a + 3 * np.eye(3))[1],
+    lambda a: np.max(np.tanh(a), axis=(0, 1)) * np.float64(2),
+    lambda a: np.sum(np.random.normal(a, 0.1)),
+])
+def test_save_and_load(tmp_path, function):
+    a = ng.Variable(np.random.rand(3, 3))
+    with ng.Graph() as g:
+        y = function(a)
+    g.save(tmp_path / 'graph.npz', y, a)
+    loaded, (y_, a_) = ng.Graph.load(tmp_path / 'graph.npz')
+    assert len(loaded._node_list) == len(g._node_list)
+    assert np.array_equal(y_, y)
+    assert np.allclose(loaded.backward(y_, a_), g.backward(y, a))
+
+
+def test_save_and_load_mlp_loss(tmp_path):
+    # Loss of examples/mlp.py, which indexes with a range.
+    x = np.random.rand(5, 4)
+    labels = np.random.randint(0, 3, size=5)
+    w1, b1 = ng.Variable(np.random.rand(4, 6)), ng.Variable(np.zeros(6))
+    w2, b2 = ng.Variable(np.random.rand(6, 3)), ng.Variable(np.zeros(3))
+    with ng.Graph() as g:
+        logits = np.tanh(x @ w1 + b1) @ w2 + b2
+        log_probas = sp.log_softmax(logits, axis=-1)
+        y = np.mean(-log_probas[range(len(log_probas)), labels])
+    g.save(tmp_path / 'graph.npz', y, w1, b1, w2, b2)
+    loaded, (y_, *theta) = ng.Graph.load(tmp_path / 'graph.npz')
+    assert np.array_equal(y_, y)
+    for actual, expect in zip(
+        loaded.backward(y_, theta), g.backward(y, (w1, b1, w2, b2)),
+    ):
+        assert np.allclose(actual, expect)
+
+
+def test_save_and_load_shared_variables(tmp_path):
+    a = ng.Variable(2., dtype=np.float32)
+    b = ng.Variable([1., 2.], requires_grad=False)
+    with ng.Graph() as g:
+        y = np.sum(a * b * a)
+    g.save(tmp_path / 'graph.npz', y, a, b)
+    loaded, (y_, a_, b_) = ng.Graph.load(tmp_path / 'graph.npz')
+    assert loaded._node_list[0].inputs[0] is a_
+    assert loaded._node_list[1].inputs[1] is a_
+    assert type(a_._data) is np.float32
+    assert not b_.requires_grad
+    assert loaded.backward(y_, a_) == g.backward(y, a)
+
+
+def test_load_memory_mapped(tmp_path):
+    a = ng.Variable(np.random.rand(3, 4))
+    with ng.Graph() as g:
+        y = np.sum(np.tanh(a.T @ np.ones((3, 2))))
+    g.save(tmp_path / 'graph.npz', y, a)
+    loaded, (y_, a_) = ng.Graph.load(tmp_path / 'graph.npz', mmap_mode='r')
+    assert isinstance(a_._data.base, np.memmap)
+    assert not a_._data.flags.writeable
+    assert np.allclose(loaded.backward(y_, a_), g.backward(y, a))
+
+
+def test_load_in_another_process(tmp_path):
+    a = ng.Variable([1., 2.])
+    with ng.Graph() as g:
+        y = np.sum(np.exp(a[::-1]) * [3., 4.])
+    g.save(tmp_path / 'graph.npz', y, a)
+    code = '\n'.join((
+        'import sys',
+        'import numpy',
+        'import numgrad as ng',
+        'g, (y, a) = ng.Graph.load(sys.argv[1])',
+        'print(*g.backward(y, a))',
+    ))
+    stdout = subprocess.run(
+        [sys.executable, '-c', code, str(tmp_path / 'graph.npz')],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    assert np.allclose(
+        [float(v) for v in stdout.split()], g.backward(y, a))
+
+
+def test_save_error(tmp_path):
+    a = ng.Variable([1., 2.])
+    with ng.Graph() as g:
+        y = ng.custom_vjp(lambda g, r, x: g)(lambda x: x)(a)
+    with pytest.raises(ValueError):
+        g.save(tmp_path / 'graph.npz', y, a)
+
+
+def test_memory_report():
+    x = ng.Variable(np.ones((10, 10)))
+    w = np.ones((10, 10))
+    with ng.Graph() as g:
+        h = x.T
+        h = np.tanh(h @ w)
+        h = np.tanh(h @ w)
+        y = np.sum(h.reshape(-1))
+    report = g.memory_report()
+    # `x.T` and `h.reshape(-1)` are views of arrays already counted.
+    assert report.nodes == (800, 1600, 800, 800, 800, 0, 8)
+    assert report.total == 4808
+    assert {f.__name__: n for f, n in report.functions.items()} == {
+        'matmul': 2400, 'tanh': 1600, 'transpose': 800, 'reshape': 0,
+        'sum': 8,
+    }
+    assert next(iter(report.functions)) is np.matmul
+    assert report.backward_peak == 0
+    g.backward(y, x)
+    assert 800 <= g.memory_report().backward_peak < 4808
+
+
+def test_patched_functions_outside_graph():
+    asarray, normal, sum_ = np.asarray, np.random.normal, np.sum
+    with ng.Graph():
+        # Functions dispatching to `Variable` by themselves are not patched.
+        assert np.sum is sum_
+        assert np.asarray is not asarray
+        assert np.asarray.__wrapped__ is asarray
+        assert ng.has_vjp(np.random.normal)
+    # Original functions are restored after the graph.
+    assert np.asarray is asarray
+    assert np.random.normal is normal
+    assert ng.has_vjp(np.sum)
+    assert ng.has_vjp(np.random.normal)
+    assert type(np.sum(ng.Variable([1, 2]))) is np.float64
+    assert np.sum([[1, 2]], axis=1).tolist() == [3]
+
+
+def test_patched_functions_restored_after_last_graph():
+    asarray = np.asarray
+    entered, exit_ = threading.Event(), threading.Event()
+
+    def construct_graph():
+        with ng.Graph():
+            entered.set()
+            exit_.wait()
+
+    thread = threading.Thread(target=construct_graph)
+    thread.start()
+    entered.wait()
+    with ng.Graph():
+        pass
+    # Still patched while the other thread constructs its graph.
+    assert np.asarray is not asarray
+    exit_.set()
+    thread.join()
+    assert np.asarray is asarray
+
+
 @pytest.mark.parametrize('function, args, expect_type', [
     (lambda a, b: a + b, (1, 1), int),
     (lambda a, b: a + b, (ng.Variable(1), 1), ng.Variable),
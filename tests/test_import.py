@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+import pytest
+
+
+# Budget of cumulative time to import numgrad after numpy in microseconds.
+IMPORT_TIME_BUDGET = 150_000
+
+
+def _run(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, '-c', code],
+        capture_output=True, text=True, check=True,
+    )
+
+
+def test_import_time():
+    microseconds = []
+    for _ in range(3):
+        stderr = _run(
+            'import numpy; import numgrad', '-X', 'importtime').stderr
+        line = next(
+            line for line in stderr.splitlines()
+            if line.split('|')[-1].strip() == 'numgrad'
+        )
+        microseconds.append(int(line.split('|')[1]))
+    assert min(microseconds) < IMPORT_TIME_BUDGET
+
+
+def test_import_is_lazy():
+    stdout = _run(
+        'import sys; import numgrad; print('
+        '"scipy" in sys.modules, "numgrad._numpy._linalg" in sys.modules)',
+    ).stdout
+    assert stdout.split() == ['False', 'False']
+
+
+def test_docstrings_of_ndarray():
+    stdout = _run('\n'.join((
+        'import numgrad as ng',
+        'print("doctest: +SKIP" in ng.Variable.tolist.__doc__)',
+        'print(type(ng.Variable) is type)',
+    ))).stdout
+    assert stdout.split() == ['True', 'True']
+
+
+def test_scipy_imported_after_graph():
+    _run('\n'.join((
+        'import numpy as np',
+        'import numgrad as ng',
+        'assert ng.grad(np.tanh)(0.) == 1',
+        'assert not ng.has_vjp(np.argsort)',
+        'import scipy.special as sp',
+        'assert ng.has_vjp(sp.softmax)',
+        'assert ng.grad(lambda x: sp.softmax(x)[0])([0., 0.]).tolist() '
+        '== [0.25, -0.25]',
+        'assert ng.grad(sp.expit)(0.) == 0.25',
+    )))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+import scipy.special as sp
+
+import numgrad as ng
+
+
+def _numerical_jvp(f, primals, tangents, epsilon=1e-6):
+    plus = f(*(p + epsilon * t for p, t in zip(primals, tangents)))
+    minus = f(*(p - epsilon * t for p, t in zip(primals, tangents)))
+    return (np.asarray(plus) - np.asarray(minus)) / (2 * epsilon)
+
+
+def _positive_definite(n):
+    a = np.random.rand(n, n)
+    return a @ a.T + n * np.eye(n)
+
+
+@pytest.mark.parametrize('f, primals', [
+    (np.tanh, (np.random.normal(size=(2, 3)),)),
+    (np.hypot, (np.random.normal(size=(3,)), np.random.normal(size=(4, 1)))),
+    (lambda a: a ** 3 / (1 + a), (np.random.uniform(1, 2, (5,)),)),
+    (lambda a: np.maximum(a, 0.1), (np.random.normal(size=(4,)),)),
+    (lambda a: np.prod(a, 1, keepdims=True), (np.random.rand(2, 3),)),
+    (lambda a: np.cumprod(a, 0), (np.random.rand(3, 2),)),
+    (lambda a: np.max(a, 0), (np.random.rand(3, 4),)),
+    (lambda a: np.var(a, 1, ddof=1), (np.random.rand(2, 5),)),
+    (lambda a: np.diff(a, 2, prepend=0), (np.random.rand(6),)),
+    (lambda a, b: a @ b, (np.random.rand(2, 3), np.random.rand(3, 4))),
+    (np.dot, (np.random.rand(3), np.random.rand(3, 2))),
+    (np.outer, (np.random.rand(2), np.random.rand(3))),
+    (np.linalg.inv, (_positive_definite(3),)),
+    (np.linalg.det, (np.random.rand(2, 3, 3),)),
+    (lambda a: np.linalg.slogdet(a)[1], (_positive_definite(3),)),
+    (
+        lambda a: np.linalg.cholesky((a + a.T) / 2),
+        (_positive_definite(4),),
+    ),
+    (np.linalg.solve, (_positive_definite(3), np.random.rand(3))),
+    (np.linalg.solve, (_positive_definite(3), np.random.rand(3, 2))),
+    (lambda a: np.reshape(a, (3, -1)).T[1:], (np.random.rand(2, 3),)),
+    (
+        lambda a, b: np.concatenate([a, b, np.ones((1, 2))]),
+        (np.random.rand(2, 2), np.random.rand(3, 2)),
+    ),
+    (lambda a: np.split(a, 2)[1] * 2, (np.random.rand(4, 2),)),
+    (
+        lambda a: np.broadcast_arrays(a, np.ones((3, 2)))[0],
+        (np.random.rand(2),),
+    ),
+    (lambda a: np.rot90(np.tril(a))[::2, [0, 1]], (np.random.rand(3, 3),)),
+    (lambda a: sp.expit(a) * sp.gamma(a), (np.random.uniform(1, 2, (3,)),)),
+    (lambda a: np.random.normal(a, 0.), (np.random.rand(3),)),
+])
+def test_jvp(f, primals):
+    tangents = tuple(np.random.normal(size=np.shape(p)) for p in primals)
+    value, tangent = ng.jvp(f, primals, tangents)
+    assert np.allclose(value, f(*primals))
+    assert np.allclose(tangent, _numerical_jvp(f, primals, tangents))
+
+
+def test_jvp_scalar():
+    value, tangent = ng.jvp(np.sin, (0.5,), (2.,))
+    assert value == np.sin(0.5)
+    assert np.isclose(tangent, 2 * np.cos(0.5))
+
+
+def test_jvp_constant_output():
+    c = ng.Variable(np.ones(3))
+    f = lambda a: c * 2
+    value, tangent = ng.jvp(f, (np.zeros(2),), (np.ones(2),))
+    assert np.array_equal(value, np.full(3, 2.))
+    assert np.array_equal(tangent, np.zeros(3))
+
+
+def test_jvp_does_not_record():
+    x = np.random.rand(100)
+    f = lambda a: np.sum(np.exp(np.sin(a)))
+    _, tangent = ng.jvp(f, (x,), (np.ones(100),))
+    assert np.isclose(tangent, np.sum(np.exp(np.sin(x)) * np.cos(x)))
+    assert ng.config._graph is None
+
+
+def test_jvp_of_grad():
+    f = lambda a: np.sum(np.sin(a) * a ** 2)
+    x = np.random.normal(size=3)
+    v = np.random.normal(size=3)
+    assert np.allclose(ng.jvp(ng.grad(f), (x,), (v,))[1], ng.hvp(f)(x, v))
+
+
+def test_grad_of_jvp():
+    f = lambda a: np.sum(np.sin(a) * a ** 2)
+    x = np.random.normal(size=3)
+    v = np.random.normal(size=3)
+    actual = ng.grad(lambda a: ng.jvp(f, (a,), (v,))[1])(x)
+    assert np.allclose(actual, ng.hvp(f)(x, v))
+
+
+def test_jvp_of_jvp():
+    x = np.random.normal(size=3)
+    _, actual = ng.jvp(
+        lambda a: ng.jvp(np.sin, (a,), (np.ones(3),))[1],
+        (x,), (np.ones(3),),
+    )
+    assert np.allclose(actual, -np.sin(x))
+
+
+@pytest.mark.parametrize('f, primals, tangents, error', [
+    (np.sin, (1., 2.), (1.,), ValueError),
+    (np.sin, (np.zeros(2),), (np.zeros(3),), ValueError),
+    (lambda a: np.ones(3), (np.zeros(2),), (np.ones(2),), TypeError),
+    (np.linalg.pinv, (2 * np.eye(2),), (np.eye(2),), TypeError),
+    (np.linalg.eigh, (2 * np.eye(2),), (np.eye(2),), TypeError),
+    (
+        ng.custom_vjp(lambda g, r, x: g)(lambda x: x),
+        (np.zeros(2),), (np.ones(2),), NotImplementedError,
+    ),
+    (
+        lambda a: np.diff(np.ones(2), 1, -1, a),
+        (np.zeros(1),), (np.ones(1),), NotImplementedError,
+    ),
+    (
+        lambda a: np.diff(np.ones(2), prepend=a),
+        (np.zeros(1),), (np.ones(1),), NotImplementedError,
+    ),
+])
+def test_jvp_error(f, primals, tangents, error):
+    with pytest.raises(error):
+        ng.jvp(f, primals, tangents)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+import numgrad as ng
+
+
+def _mlp(w1, w2, x):
+    return np.mean(np.tanh(np.tanh(x @ w1) @ w2) ** 2)
+
+
+def _parameters():
+    return (
+        np.random.normal(scale=0.3, size=(8, 16)),
+        np.random.normal(scale=0.3, size=(16, 4)),
+        np.random.normal(size=(32, 8)),
+    )
+
+
+def test_mixed_precision():
+    w1, w2, x = _parameters()
+    expect = ng.grad(_mlp)(w1, w2, x)
+    w1, w2 = ng.Variable(w1), ng.Variable(w2)
+    policy = ng.MixedPrecision()
+    with ng.Graph(precision=policy) as g:
+        y = _mlp(w1, w2, x)
+    assert all(
+        node.result.dtype == np.float16 for node in g._node_list)
+    assert w1.dtype == np.float64
+    actual = g.backward(y, [w1, w2])
+    for a, e in zip(actual, expect):
+        assert a.dtype == np.float32
+        assert np.allclose(a, e, rtol=1e-2, atol=1e-3)
+    assert policy.loss_scale == 2. ** 15
+
+
+@pytest.mark.parametrize('mmap_mode', [None, 'r'])
+def test_save_and_load(tmp_path, mmap_mode):
+    w1, w2, x = _parameters()
+    w1, w2 = ng.Variable(w1), ng.Variable(w2)
+    policy = ng.MixedPrecision(loss_scale=2. ** 10, growth_interval=10)
+    with ng.Graph(precision=policy) as g:
+        y = _mlp(w1, w2, x)
+    g.save(tmp_path / 'graph.npz', y, w1, w2)
+    loaded, (y_, w1_, w2_) = ng.Graph.load(
+        tmp_path / 'graph.npz', mmap_mode=mmap_mode)
+    for node, node_ in zip(g._node_list, loaded._node_list):
+        assert node_.result.dtype == np.float16
+        assert node_.result._compute_dtype == np.float32
+        assert np.array_equal(node_.result._data, node.result._data)
+    assert w1_.dtype == np.float64 and w1_._compute_dtype is None
+    assert loaded._precision.storage_dtype == np.float16
+    assert loaded._precision.accumulation_dtype == np.float32
+    assert loaded._precision.loss_scale == 2. ** 10
+    assert loaded._precision.growth_interval == 10
+    for a, e in zip(
+        loaded.backward(y_, [w1_, w2_]), g.backward(y, [w1, w2]),
+    ):
+        assert a.dtype == np.float32
+        assert np.allclose(a, e)
+
+
+def test_mixed_precision_memory():
+    w1, w2, x = _parameters()
+    reports = []
+    for precision in (None, ng.MixedPrecision()):
+        with ng.Graph(precision=precision) as g:
+            y = _mlp(ng.Variable(w1), ng.Variable(w2), x)
+        g.backward(y, g._node_list[0].inputs[1])
+        reports.append(g.memory_report())
+    assert reports[1].total < reports[0].total
+    assert reports[1].backward_peak < reports[0].backward_peak
+
+
+def test_mixed_precision_forward_overflow():
+    x = ng.Variable([10., 20.])
+    with ng.Graph(precision=ng.MixedPrecision()) as g:
+        h = np.exp(x)
+        y = np.sum(np.log(h))
+    assert h.dtype == np.float64
+    assert np.allclose(g.backward(y, x), 1, rtol=1e-2)
+
+
+@pytest.mark.parametrize('loss_scale, min_loss_scale, expect_scale', [
+    (2. ** 40, 1., 2. ** 7),
+    (2. ** 12, 2. ** 10, 2. ** 10),
+])
+def test_mixed_precision_loss_scale_backoff(
+    loss_scale, min_loss_scale, expect_scale,
+):
+    x = ng.Variable(np.linspace(1, 2, 5))
+    policy = ng.MixedPrecision(
+        loss_scale=loss_scale, min_loss_scale=min_loss_scale)
+    with ng.Graph(precision=policy) as g:
+        y = np.sum(np.square(x * 100))
+    assert np.allclose(g.backward(y, x), 2e4 * np.linspace(1, 2, 5))
+    assert policy.loss_scale == expect_scale
+
+
+def test_mixed_precision_loss_scale_growth():
+    policy = ng.MixedPrecision(loss_scale=4., growth_interval=2)
+    f = ng.grad(lambda a: np.sum(np.sin(a) * 2), precision=policy)
+    scales = []
+    for _ in range(4):
+        assert np.allclose(f(np.zeros(3)), 2)
+        scales.append(policy.loss_scale)
+    assert scales == [4., 8., 8., 16.]
+
+
+def test_mixed_precision_out():
+    dx = np.empty(3, dtype=np.float32)
+    f = ng.value_and_grad(
+        lambda a: np.sum(np.exp(a)), out=dx, precision=ng.MixedPrecision())
+    value, grad = f(np.zeros(3))
+    assert grad is dx
+    assert value == 3
+    assert np.allclose(dx, 1)
+
+
+@pytest.mark.parametrize('args', [
+    (np.int32,),
+    (np.float32, np.float16),
+])
+def test_mixed_precision_error(args):
+    with pytest.raises(ValueError):
+        ng.MixedPrecision(*args)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
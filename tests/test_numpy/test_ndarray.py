@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
 
+import numgrad as ng
 from tests.test_differentiation import (  # noqa:I202
     _test_egrad,
     _test_graph_backward,
@@ -12,6 +13,8 @@ from tests.test_differentiation import (  # noqa:I202
     (lambda a: a[0], np.array([3, 1, 9])),
     (lambda a: a[::2], np.array([3, 1, 9])),
     (lambda a: a[np.array([0])], np.random.rand(4, 2, 3)),
+    (lambda a: a[[2, 0, 2]] * a[..., 1:], np.random.rand(3, 2)),
+    (lambda a: a[None, [1, 1]] + a[a > 0.5].sum(), np.random.rand(3, 2)),
 ])
 def parameters(request):
     return request.param
@@ -26,5 +29,25 @@ def test_differentiation(parameters):
     _test_graph_backward_custom_grad(f, *args)
 
 
+def test_getitem_repeated_indices():
+    a = ng.Variable(np.random.rand(4, 3))
+    with ng.Graph() as g:
+        y = np.sum(a[[0, 2, 0, 0]]) + np.sum(np.tanh(a[1:3]))
+    expected = np.zeros((4, 3))
+    expected[0] = 3
+    expected[2] = 1
+    expected[1:3] += 1 - np.tanh(a._data[1:3]) ** 2
+    assert np.allclose(g.backward(y, a), expected)
+    out = np.full((4, 3), np.nan)
+    assert g.backward(y, a, out=out) is out
+    assert np.allclose(out, expected)
+
+
+def test_getitem_higher_order_repeated_indices():
+    dfunc = ng.grad(lambda a: np.sum(a[[0, 0, 1]] ** 3))
+    actual = ng.grad(lambda a: np.sum(dfunc(a)))([1., 2.])
+    assert np.allclose(actual, [12., 12.])
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+import scipy.special as sp
+
+import numgrad as ng
+
+
+def _mlp_loss(w1, b1, w2, b2, *, x, labels):
+    logits = np.tanh(x @ w1 + b1) @ w2 + b2
+    log_probas = sp.log_softmax(logits, axis=-1)
+    return np.mean(-log_probas[range(len(log_probas)), labels])
+
+
+@pytest.mark.parametrize('function, args_list', [
+    (lambda a: np.sum(np.square(a)), [([1, 2],), ([3, -1],)]),
+    (
+        lambda a, b: np.sum(np.tanh(a @ b)),
+        [
+            (np.random.rand(3, 2), np.random.rand(2, 4)),
+            (np.random.rand(3, 2), np.random.rand(2, 4)),
+        ],
+    ),
+    (
+        lambda a: np.sum(np.concatenate([a, np.exp(a)])[[0, 2, 2]]),
+        [([1, 2],), ([-1, 0.5],)],
+    ),
+    (
+        lambda a: np.linalg.slogdet(a)[1],
+        [(np.eye(2) + np.random.rand(2, 2),), (np.eye(2) * 3,)],
+    ),
+])
+def test_static_grad(function, args_list):
+    df = ng.static_grad(function)
+    for args in args_list:
+        actual = df(*args)
+        expected = ng.grad(function)(*args)
+        if not isinstance(expected, tuple):
+            actual, expected = (actual,), (expected,)
+        for a, e in zip(actual, expected):
+            assert np.allclose(a, e)
+    assert len(df._traces) == 1
+
+
+def test_static_grad_keyword_data():
+    df = ng.static_value_and_grad(_mlp_loss)
+    theta = (
+        np.random.normal(size=(4, 3)), np.zeros(3),
+        np.random.normal(size=(3, 2)), np.zeros(2),
+    )
+    for _ in range(3):
+        kwargs = dict(
+            x=np.random.normal(size=(5, 4)),
+            labels=np.random.randint(0, 2, 5),
+        )
+        value, grads = df(*theta, **kwargs)
+        expected_value, expected_grads = ng.value_and_grad(_mlp_loss)(
+            *theta, **kwargs)
+        assert np.allclose(value, expected_value)
+        for a, e in zip(grads, expected_grads):
+            assert np.allclose(a, e)
+    assert len(df._traces) == 1
+
+
+def test_static_grad_out():
+    theta = (
+        np.random.normal(size=(4, 3)), np.zeros(3),
+        np.random.normal(size=(3, 2)), np.zeros(2),
+    )
+    out = tuple(np.empty_like(p) for p in theta)
+    df = ng.static_grad(_mlp_loss, out=out)
+    for _ in range(3):
+        kwargs = dict(
+            x=np.random.normal(size=(5, 4)),
+            labels=np.random.randint(0, 2, 5),
+        )
+        grads = df(*theta, **kwargs)
+        expected = ng.grad(_mlp_loss)(*theta, **kwargs)
+        for a, e, buffer in zip(grads, expected, out):
+            assert a is buffer
+            assert np.allclose(a, e)
+
+
+def test_static_grad_retrace_on_shape_change():
+    df = ng.static_grad(lambda a, *, b: np.sum(a * b))
+    assert np.allclose(df([1, 2], b=np.array([3, 4])), [3, 4])
+    assert np.allclose(df([1, 2, 3], b=np.array([3, 4, 5])), [3, 4, 5])
+    assert np.allclose(df([1, 2], b=np.array([5, 6])), [5, 6])
+    assert len(df._traces) == 2
+
+
+def test_static_grad_in_graph():
+    ddf = ng.grad(ng.static_grad(lambda a: a ** 3))
+    assert np.allclose(ddf(-2), -12)
+
+
+def test_static_grad_error():
+    with pytest.raises(ValueError):
+        ng.static_grad(lambda a: a)([1, 2])
+    with pytest.raises(TypeError):
+        ng.static_grad(lambda a, b: a * b[0])(1, b={1})
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
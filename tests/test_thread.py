@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import numpy as np
+import pytest
+import scipy.special as sp
+
+import numgrad as ng
+
+
+def _loss(w, x):
+    h = np.tanh(x @ w)
+    return np.sum(sp.log_softmax(h, axis=-1)) + np.mean(np.square(w))
+
+
+def _checkpointed_loss(w, x):
+    return ng.checkpoint(_loss)(w, x)
+
+
+@pytest.mark.parametrize('grad', [
+    ng.grad(_loss),
+    ng.grad(_checkpointed_loss),
+    ng.static_grad(_loss),
+    ng.grad(lambda w, x: np.sum(ng.elementwise_grad(np.sin)(x @ w))),
+])
+def test_concurrent_grad(grad):
+    inputs = [
+        (np.random.normal(size=(3, 4)), np.random.normal(size=(5, 3)))
+        for _ in range(200)
+    ]
+    expected = [grad(*args) for args in inputs]
+    with ThreadPoolExecutor(8) as executor:
+        actual = list(executor.map(lambda args: grad(*args), inputs))
+    for a, e in zip(actual, expected):
+        for a_, e_ in zip(a, e):
+            assert np.allclose(a_, e_)
+
+
+def test_graph_per_thread():
+    entered, computed = threading.Event(), threading.Event()
+    normal = np.random.normal
+    a = ng.Variable([1., 2.])
+
+    def record():
+        with ng.Graph() as g:
+            entered.set()
+            computed.wait()
+            y = np.sum(a)
+        return g, y
+
+    with ThreadPoolExecutor(1) as executor:
+        future = executor.submit(record)
+        entered.wait()
+        # records into another graph in this thread, not the one in the other
+        with ng.Graph() as g:
+            b = np.random.normal(a)
+        computed.set()
+        g_other, y = future.result()
+    assert len(g._node_list) == 1
+    assert len(g_other._node_list) == 1
+    assert np.allclose(g_other.backward(y, a), 1)
+    assert ng.config._graph is None
+    assert np.random.normal is normal
+    assert isinstance(b, ng.Variable)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -27,6 +27,59 @@ def test_non_default_dtype():
     ng.config.dtype = np.float64
 
 
+@pytest.fixture
+def memmap(tmp_path):
+    a = np.memmap(tmp_path / 'a.dat', np.float32, 'w+', shape=(4, 3))
+    a[:] = np.arange(12).reshape(4, 3)
+    a.flush()
+    return np.memmap(tmp_path / 'a.dat', np.float32, 'r', shape=(4, 3))
+
+
+@pytest.mark.parametrize('data, kwargs', [
+    (np.arange(4.), {}),
+    (np.arange(4.)[::2], {'copy': False}),
+    (np.arange(4, dtype=np.float32), {'dtype': np.float32}),
+])
+def test_init_without_copy(data, kwargs):
+    data.flags.writeable = False
+    a = ng.Variable(data, **kwargs)
+    assert np.shares_memory(a._data, data)
+
+
+def test_init_memmap_without_copy(memmap):
+    a = ng.Variable(memmap, dtype=np.float32, copy=False)
+    assert np.shares_memory(a._data, memmap)
+    assert not a._data.flags.writeable
+
+
+def test_grad_of_memmap_copy_warning(memmap):
+    with pytest.warns(RuntimeWarning):
+        dx = ng.grad(lambda a: np.sum(a ** 2))(memmap)
+    assert dx.dtype == np.float64
+
+
+@pytest.mark.parametrize('data, kwargs', [
+    (np.arange(4, dtype=np.float32), {}),
+    ([1., 2.], {}),
+    (np.arange(4.), {'dtype': np.float32}),
+])
+def test_init_copy_false_error(data, kwargs):
+    with pytest.raises(ValueError):
+        ng.Variable(data, copy=False, **kwargs)
+
+
+def test_init_copy_true():
+    data = np.arange(4.)
+    assert not np.shares_memory(ng.Variable(data, copy=True)._data, data)
+
+
+def test_grad_of_memmap(memmap):
+    x = ng.Variable(memmap, dtype=np.float32)
+    dx = ng.grad(lambda a: np.sum(a[1:] ** 2))(x)
+    assert np.shares_memory(x._data, memmap)
+    assert np.allclose(dx, np.vstack([np.zeros(3), 2 * memmap[1:]]))
+
+
 def test_ufunc():
     a = ng.Variable([0, 1])
     assert isinstance(a + 0, np.ndarray)
@@ -94,5 +147,32 @@ def test_inplace(self, method, args):
             getattr(self, method)(*args)
 
 
+@pytest.mark.parametrize('function', [
+    lambda x, c: np.exp(c) * 2,
+    lambda x, c: np.concatenate([c, c]),
+    lambda x, c: np.sum(c[:1]),
+    lambda x, c: ng.custom_vjp(lambda g, r, a: g)(lambda a: a * 1)(c),
+    lambda x, c: ng.checkpoint(np.tanh)(c),
+])
+def test_requires_grad_false(function):
+    x = ng.Variable([1., 2.])
+    c = ng.Variable([3., 4.], requires_grad=False)
+    assert x.requires_grad and not c.requires_grad
+    with ng.Graph() as g:
+        y = function(x, c)
+    assert not isinstance(y, ng.Variable)
+    assert len(g._node_list) == 0
+
+
+def test_requires_grad_false_mixed():
+    x = ng.Variable([1., 2.])
+    c = ng.Variable([3., 4.], requires_grad=False)
+    with ng.Graph() as g:
+        h = np.log(c)
+        y = np.sum(x * h)
+    assert len(g._node_list) == 2
+    assert np.allclose(g.backward(y, x), np.log([3., 4.]))
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+import scipy.special as sp
+
+import numgrad as ng
+
+
+def _loop(f, *args, in_axes=0):
+    axes = (in_axes,) * len(args) if np.ndim(in_axes) == 0 else in_axes
+    size = max(np.shape(a)[ax] for a, ax in zip(args, axes) if ax is not None)
+    results = [
+        f(*(a if x is None else np.take(a, i, x) for a, x in zip(args, axes)))
+        for i in range(size)
+    ]
+    if isinstance(results[0], tuple):
+        return tuple(np.stack(r) for r in zip(*results))
+    return np.stack(results)
+
+
+def _mlp_loss(w1, b1, w2, x, y):
+    logits = np.tanh(x @ w1 + b1) @ w2
+    return -sp.log_softmax(logits)[y]
+
+
+@pytest.mark.parametrize('f, args, in_axes', [
+    (np.tanh, (np.random.rand(3, 2),), 0),
+    (
+        lambda a, b: a * b + 1,
+        (np.random.rand(3, 2), np.random.rand(2)),
+        (0, None),
+    ),
+    (lambda a: np.sum(a, 0), (np.random.rand(2, 4, 3),), 1),
+    (lambda a: np.max(a) - np.mean(a, -1), (np.random.rand(4, 2, 3),), 0),
+    (np.matmul, (np.random.rand(4, 2, 3), np.random.rand(4, 3)), 0),
+    (np.matmul, (np.random.rand(3, 2), np.random.rand(4, 2)), (None, 0)),
+    (lambda a: sp.logsumexp(a, 1), (np.random.rand(4, 2, 3),), 0),
+    (lambda a: sp.softmax(a) * sp.expit(a), (np.random.rand(3, 2),), 0),
+    (
+        lambda a: a[::-1, 0] + np.cumsum(a, 1)[-1],
+        (np.random.rand(3, 2, 2),),
+        0,
+    ),
+    (lambda a: np.diff(a), (np.random.rand(3, 4),), 0),
+])
+def test_vmap(f, args, in_axes):
+    actual = ng.vmap(f, in_axes=in_axes)(*args)
+    expect = _loop(f, *args, in_axes=in_axes)
+    assert np.shape(actual) == np.shape(expect)
+    assert np.allclose(actual, expect)
+
+
+def test_vmap_index_with_batched_array():
+    a = np.random.rand(5, 4)
+    i = np.array([0, 3, 1, 1, 2])
+    assert np.allclose(ng.vmap(lambda a, i: a[i])(a, i), a[range(5), i])
+    assert np.allclose(
+        ng.vmap(lambda a, i: a[[i, 0]])(a, i), a[range(5), [i, [0] * 5]].T)
+
+
+@pytest.mark.parametrize('f, args, in_axes', [
+    (
+        ng.grad(lambda w, x: np.sum(np.tanh(w @ x)) ** 2),
+        (np.random.rand(2, 3), np.random.rand(5, 3)),
+        (None, 0),
+    ),
+    (
+        ng.grad(lambda a, b: np.prod(a) * sp.gamma(b)),
+        (np.random.rand(4, 3), np.random.rand(4) + 1),
+        0,
+    ),
+    (
+        ng.grad(lambda a: np.sum(np.linalg.inv(a))),
+        (np.random.rand(3, 2, 2) + np.eye(2),),
+        0,
+    ),
+])
+def test_vmap_grad(f, args, in_axes):
+    actual = ng.vmap(f, in_axes=in_axes)(*args)
+    expect = _loop(f, *args, in_axes=in_axes)
+    for a, e in zip(actual, expect):
+        assert np.shape(a) == np.shape(e)
+        assert np.allclose(a, e)
+
+
+def test_vmap_per_example_grad():
+    w = (np.random.rand(4, 3), np.random.rand(3), np.random.rand(3, 2))
+    x, y = np.random.rand(5, 4), np.random.randint(0, 2, 5)
+    f = lambda x, y: ng.grad(lambda *w: _mlp_loss(*w, x, y))(*w)
+    actual = ng.vmap(f)(x, y)
+    expect = _loop(f, x, y)
+    for a, e in zip(actual, expect):
+        assert np.shape(a) == np.shape(e)
+        assert np.allclose(a, e)
+
+
+def test_vmap_constant_output():
+    actual = ng.vmap(lambda a: np.ones(2))(np.zeros((3, 4)))
+    assert np.array_equal(actual, np.ones((3, 2)))
+
+
+def test_vmap_falls_back_to_loop():
+    f = lambda a: float(np.sum(a)) * a
+    a = np.random.rand(3, 2)
+    assert np.allclose(ng.vmap(f)(a), _loop(f, a))
+
+
+@pytest.mark.parametrize('args, in_axes', [
+    ((np.zeros((2, 3)), np.zeros((3, 3))), 0),
+    ((np.zeros(2),), (0, 0)),
+    ((np.zeros(2),), None),
+])
+def test_vmap_error(args, in_axes):
+    with pytest.raises(ValueError):
+        ng.vmap(np.add, in_axes=in_axes)(*args)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])